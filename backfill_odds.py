@@ -0,0 +1,67 @@
+import os
+import sys
+import asyncio
+import argparse
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+# The backfill writes into the snapshot store shared with the environment package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'environments', 'vf_nfl_picker'))
+from nfl_data.backfill import Backfill, season_weeks
+from nfl_data.helpers import parse_list
+from nfl_data.odds_client import OddsApiClient, QuotaScheduler
+
+load_dotenv()
+
+BASE_URL = os.getenv('ODDS_API_BASE_URL', 'https://api.the-odds-api.com/v4')
+
+async def backfill(args):
+    # No pacing toward a season end here; the scheduler only guards the reserve
+    scheduler = QuotaScheduler(season_end=datetime.now(timezone.utc), reserve=args.reserve)
+    remaining_credits = args.max_credits
+
+    async with OddsApiClient(base_url=BASE_URL, max_concurrency=args.concurrency, scheduler=scheduler) as client:
+        for season in parse_list(args.seasons):
+            weeks = parse_list(args.weeks) if args.weeks else range(1, season_weeks(season) + 1)
+            job = Backfill(client, season, args.points.split(','), args.data_dir,
+                           markets=args.markets, max_credits=remaining_credits)
+            print(f"\nSeason {season}: weeks {weeks[0]}-{weeks[-1]}, points {args.points}")
+            result = await job.run(weeks)
+
+            for error in result['errors']:
+                print(f"  {error}")
+            print(f"  {result['requests']} request(s), {result['stored']} snapshot(s) stored, "
+                  f"{result['duplicates']} already stored, {result['failed']} failed, "
+                  f"{result['credits']} credits")
+            if result['deferred']:
+                print(f"  {result['deferred']} request(s) deferred by --max-credits; run again to continue")
+            if remaining_credits is not None:
+                remaining_credits -= result['credits']
+
+    if scheduler.remaining is not None:
+        print(f"\nAPI Usage - Remaining: {scheduler.remaining:g}, Used: {scheduler.used:g}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill historical odds snapshots into the season stores (resumable)')
+    parser.add_argument('--seasons', type=str, required=True,
+                       help="Seasons to backfill, e.g. '2023' or '2021-2024'")
+    parser.add_argument('--weeks', type=str,
+                       help="Weeks to backfill, e.g. '1-4' (default: whole regular season)")
+    parser.add_argument('--points', type=str, default='open,t-24h,close',
+                       help="Snapshot times per slate: open, close, t-<N>h, t-<N>m (default: open,t-24h,close)")
+    parser.add_argument('--markets', type=str, default='spreads,totals',
+                       help='Markets to request (default: spreads,totals)')
+    parser.add_argument('--max-credits', type=int,
+                       help='Stop after committing this many credits (historical odds cost 10 per market)')
+    parser.add_argument('--reserve', type=int, default=int(os.getenv('ODDS_API_RESERVE', '50')),
+                       help='Credits to leave untouched in the account (default: ODDS_API_RESERVE or 50)')
+    parser.add_argument('--concurrency', type=int, default=4,
+                       help='Parallel requests (default: 4)')
+    parser.add_argument('--data-dir', type=str, default='data',
+                       help='Directory containing season_N stores (default: data)')
+    args = parser.parse_args()
+
+    asyncio.run(backfill(args))
+
+if __name__ == "__main__":
+    main()
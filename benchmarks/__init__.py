@@ -0,0 +1 @@
+"""Benchmarks for the pigskin-prophet data, tool and environment hot paths"""
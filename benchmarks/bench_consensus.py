@@ -0,0 +1,73 @@
+"""
+Benchmark: consensus_lines (plain and with the weighted/no-vig extras) vs the
+per-game process_game_lines loop pull_lines uses, with an output parity check.
+
+Flattening the nested /odds dicts dominates consensus_lines, so it runs at
+roughly the loop's speed; the interesting number is what the extras cost.
+
+Usage:
+    python benchmarks/bench_consensus.py --games 10000 --books 9
+"""
+
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'environments', 'vf_nfl_picker'))
+
+from pull_lines import process_game_lines
+from nfl_data.consensus import consensus_lines
+from benchmarks.synthetic import make_odds_payload
+
+
+def best_of(fn, repeat):
+    """Best wall time in seconds over `repeat` runs, plus the last result."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(n_games=10000, n_books=9, repeat=3):
+    payload = make_odds_payload(n_games, n_books)
+
+    loop_time, loop_result = best_of(lambda: [process_game_lines(game) for game in payload], repeat)
+    vector_time, vector_result = best_of(lambda: consensus_lines(payload), repeat)
+    extended_time, _ = best_of(lambda: consensus_lines(payload, extended=True), repeat)
+
+    assert vector_result == [game.to_dict() for game in loop_result], "consensus_lines output differs from process_game_lines"
+
+    return {
+        'games': n_games,
+        'books': n_books,
+        'loop_s': loop_time,
+        'vectorized_s': vector_time,
+        'vectorized_extended_s': extended_time,
+        'relative': loop_time / vector_time,
+        'extras_overhead': extended_time / vector_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark consensus line computation')
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--books', type=int, default=9)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    result = run(args.games, args.books, args.repeat)
+    print(f"{result['games']} games x {result['books']} books")
+    print(f"  process_game_lines loop: {result['loop_s'] * 1000:8.1f} ms")
+    print(f"  consensus_lines:         {result['vectorized_s'] * 1000:8.1f} ms")
+    print(f"  consensus_lines (ext):   {result['vectorized_extended_s'] * 1000:8.1f} ms")
+    print(f"  loop / consensus_lines:  {result['relative']:8.2f}x")
+    print(f"  extras overhead:         {result['extras_overhead']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
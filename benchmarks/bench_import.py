@@ -0,0 +1,121 @@
+"""
+Benchmark: cold import time of the vf_nfl_picker entry point.
+
+Every run imports the environment module in a fresh interpreter (as a
+worker spawn or vf-eval startup does) and reports the import wall time and
+which heavy dependencies were loaded by the import alone. --profile adds
+the slowest modules from `python -X importtime`. --baseline REV measures the
+same import from a git revision (e.g. the commit before lazy imports) for a
+before/after comparison.
+
+Usage:
+    python benchmarks/bench_import.py --runs 10
+    python benchmarks/bench_import.py --profile 15
+    python benchmarks/bench_import.py --baseline 403eb8b~1
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_DIR = os.path.join(ROOT, 'environments', 'vf_nfl_picker')
+
+# Dependencies that should only load when a run actually needs them
+HEAVY = ['exa_py', 'tiktoken', 'dotenv', 'aiohttp', 'numpy', 'pyarrow']
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _python(args, env_dir):
+    """Run the interpreter in env_dir; a failed import raises with its stderr."""
+    process = subprocess.run([sys.executable] + args, cwd=env_dir, capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"{' '.join(args[-2:])} failed in {env_dir}:\n{process.stderr.strip()}")
+    return process
+
+
+def probe(module='vf_nfl_picker', env_dir=ENV_DIR):
+    """Import wall time (ms) and heavy modules loaded, in a fresh interpreter."""
+    output = _python(['-c', PROBE.format(module=module, heavy=HEAVY)], env_dir).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def importtime(module='vf_nfl_picker', top=15, env_dir=ENV_DIR):
+    """Slowest modules by cumulative import time (ms), from -X importtime."""
+    stderr = _python(['-X', 'importtime', '-c', f'import {module}'], env_dir).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time:  <self us> | <cumulative us> |   <module>"
+        _, cumulative, name = line.split('|')
+        rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def checkout(revision, dest):
+    """Export the environment package as of a git revision into dest; returns its env dir."""
+    archive = subprocess.run(['git', 'archive', revision, 'environments/vf_nfl_picker'],
+                             cwd=ROOT, capture_output=True, check=False)
+    if archive.returncode != 0:
+        raise RuntimeError(f"git archive {revision} failed:\n{archive.stderr.decode().strip()}")
+    subprocess.run(['tar', '-x', '-C', dest], input=archive.stdout, check=True)
+    return os.path.join(dest, 'environments', 'vf_nfl_picker')
+
+
+def run(runs=10, module='vf_nfl_picker', env_dir=ENV_DIR):
+    results = [probe(module, env_dir) for _ in range(runs)]
+    times = [r['ms'] for r in results]
+    return {
+        'module': module,
+        'runs': runs,
+        'median_ms': median(times),
+        'min_ms': min(times),
+        'loaded': results[-1]['loaded']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold import time of the environment')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--module', type=str, default='vf_nfl_picker')
+    parser.add_argument('--profile', type=int, default=0,
+                       help='Also list the N slowest imports (python -X importtime)')
+    parser.add_argument('--baseline', type=str,
+                       help='Git revision to measure as "before" (e.g. the commit before a change)')
+    args = parser.parse_args()
+
+    result = run(args.runs, args.module)
+    print(f"import {result['module']} ({result['runs']} fresh interpreters)")
+    print(f"  median: {result['median_ms']:8.1f} ms")
+    print(f"  min:    {result['min_ms']:8.1f} ms")
+    print(f"  heavy modules loaded: {', '.join(result['loaded']) or 'none'}")
+
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            before = run(args.runs, args.module, checkout(args.baseline, tmp))
+        print(f"\nbaseline {args.baseline}")
+        print(f"  median: {before['median_ms']:8.1f} ms")
+        print(f"  min:    {before['min_ms']:8.1f} ms")
+        print(f"  heavy modules loaded: {', '.join(before['loaded']) or 'none'}")
+        print(f"  speedup (median): {before['median_ms'] / result['median_ms']:.2f}x")
+
+    if args.profile:
+        print(f"\nSlowest imports (cumulative):")
+        for ms, name in importtime(args.module, args.profile):
+            print(f"  {ms:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
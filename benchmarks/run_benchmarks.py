@@ -0,0 +1,334 @@
+"""
+Benchmark suite for the data, tool and environment hot paths.
+
+Every case runs against synthetic data in a scratch directory, so results
+do not depend on (or touch) local data/, scratchpads/ or predictions/.
+Results are written as JSON; pass a previous results file as --baseline to
+fail on regressions beyond --tolerance.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/<commit>.json
+    python benchmarks/run_benchmarks.py --filter scratchpad --repeat 10
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timedelta, timezone
+from statistics import median, quantiles
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'environments', 'vf_nfl_picker'))
+
+from pull_lines import process_game_lines, filter_current_week_games
+from nfl_data.snapshot_store import SnapshotStore, games_to_columns, columns_to_games
+from nfl_data.records import LineSnapshot
+from benchmarks.synthetic import SEASON_START, make_odds_payload, make_scratchpad_notes
+
+SEASON = 2025
+WEEKS = 18
+
+
+@contextmanager
+def scratch_dir():
+    """Run inside a temporary working directory (the tools use relative paths)."""
+    previous = os.getcwd()
+    path = tempfile.mkdtemp(prefix='nfl_bench_')
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def measure(fn, repeat, number=1):
+    """Per-call wall times in ms over `repeat` rounds of `number` calls."""
+    fn()  # warm-up (imports, caches, page cache)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) * 1000 / number)
+    return {
+        'median_ms': round(median(times), 4),
+        'min_ms': round(min(times), 4),
+        'p95_ms': round(quantiles(times, n=20)[-1], 4) if len(times) >= 2 else round(times[0], 4),
+        'repeat': repeat,
+        'number': number
+    }
+
+
+def fill_store(n_pulls, games_per_week=16, seed=0):
+    """Season store in ./data with n_pulls snapshots of every week's full slate."""
+    store = SnapshotStore(SEASON)
+    for week in range(1, WEEKS + 1):
+        games = [process_game_lines(g) for g in make_odds_payload(games_per_week, seed=seed + week)]
+        pulled = SEASON_START + timedelta(weeks=week - 1)
+        for pull in range(n_pulls):
+            meta = {'week': week, 'season': SEASON, 'day_filter': 'all',
+                    'pull_timestamp': (pulled + timedelta(minutes=15 * pull)).isoformat(),
+                    'games_count': len(games)}
+            store.append(meta, games)
+    return store
+
+
+def fill_scratchpad(pad, target_tokens, seed=0):
+    """Append synthetic sections until the scratchpad holds about target_tokens."""
+    sections = iter(make_scratchpad_notes(10000, seed))
+    tokens = pad.stats()['token_count']
+    while tokens < target_tokens - 150:
+        tokens = pad.write(next(sections), week=1)['token_count']
+    return tokens
+
+
+def bench_lines(args):
+    results = {}
+    for n_games, n_books in ((272, 9), (272, 16), (2720, 9)):
+        payload = make_odds_payload(n_games, n_books)
+        results[f'process_game_lines[games={n_games},books={n_books}]'] = measure(
+            lambda: [process_game_lines(game) for game in payload], args.repeat)
+
+    payload = make_odds_payload(2720, 1)
+    week_start = SEASON_START - timedelta(days=1)
+    week_end = week_start + timedelta(days=7)
+    results['filter_current_week_games[games=2720]'] = measure(
+        lambda: filter_current_week_games(payload, week_start, week_end), args.repeat, number=10)
+    return results
+
+
+def allocated_bytes(build):
+    """Bytes still allocated by what build() returns."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def bench_records(args):
+    """Game/LineSnapshot records vs the game dicts they replaced."""
+    games = [process_game_lines(game) for game in make_odds_payload(272)]
+    dicts = [game.to_dict() for game in games]
+    meta = {'week': 1, 'season': SEASON, 'day_filter': 'all', 'pull_timestamp': SEASON_START.isoformat()}
+    snapshot = LineSnapshot(meta, games)
+    line = snapshot.encode()
+
+    n = 272 * 20
+    results = {
+        'records.memory[games=272]': {
+            # Both decoded from the same stored line, so strings and floats are counted alike
+            'dict_bytes_per_game': round(allocated_bytes(
+                lambda: [columns_to_games(json.loads(line)['games']) for _ in range(20)]) / n, 1),
+            'record_bytes_per_game': round(allocated_bytes(
+                lambda: [LineSnapshot.decode(line).games for _ in range(20)]) / n, 1)
+        }
+    }
+
+    results['records.encode_dicts_indent[games=272]'] = measure(
+        lambda: json.dumps({'meta': meta, 'games': dicts}, indent=2), args.repeat)
+    results['records.encode_dicts_columns[games=272]'] = measure(
+        lambda: json.dumps({'meta': meta, 'games': games_to_columns(dicts)}, separators=(',', ':')), args.repeat)
+    results['records.encode[games=272]'] = measure(snapshot.encode, args.repeat)
+
+    indented = json.dumps({'meta': meta, 'games': dicts}, indent=2)
+    results['records.decode_dicts_indent[games=272]'] = measure(lambda: json.loads(indented), args.repeat)
+    results['records.decode_dicts_columns[games=272]'] = measure(
+        lambda: columns_to_games(json.loads(line)['games']), args.repeat)
+    results['records.decode[games=272]'] = measure(lambda: LineSnapshot.decode(line), args.repeat)
+    return results
+
+
+def bench_fetch_spreads(args):
+    # The store lookup fetch_spreads does, without importing the environment (and verifiers)
+    results = {}
+    for n_pulls in (1, 10, 100):
+        with scratch_dir():
+            fill_store(n_pulls)
+
+            def run():
+                if SnapshotStore(SEASON).latest_snapshot(WEEKS, None) is None:
+                    raise RuntimeError('No snapshot found for the benchmark week')
+
+            results[f'fetch_spreads.latest_snapshot[snapshots={n_pulls * WEEKS}]'] = measure(run, args.repeat, number=10)
+    return results
+
+
+def bench_scratchpad(args):
+    from tools.scratchpad_tool import ScratchpadTool
+
+    results = {}
+    with scratch_dir():
+        pad = ScratchpadTool('bench', SEASON, max_tokens=20000)
+        # Leave just enough room under the cap for the timed appends (~100 tokens each)
+        tokens = fill_scratchpad(pad, 20000 - 120 * (args.repeat + 1))
+        notes = iter(make_scratchpad_notes(args.repeat + 1, seed=1))
+
+        def write():
+            if not pad.write(next(notes), week=2)['success']:
+                raise RuntimeError('Scratchpad benchmark hit the token limit')
+
+        results['scratchpad.write[near_cap]'] = measure(write, args.repeat)
+        results['scratchpad.search[near_cap]'] = measure(
+            lambda: pad.search('Eagles injuries weather'), args.repeat, number=10)
+
+        def session_round():
+            session = pad.fork()
+            session.read()
+            session.search('Chiefs travel')
+            session.discard()
+
+        results['scratchpad.fork_read_search[near_cap]'] = measure(session_round, args.repeat)
+        for result in results.values():
+            result['tokens'] = tokens
+    return results
+
+
+def bench_env(args):
+    from vf_nfl_picker import NFLPickerEnvironment, observation_builder
+    from tools.scratchpad_tool import ScratchpadTool
+    from run_season import favorites_policy
+
+    results = {}
+    with scratch_dir():
+        fill_store(10)
+        fill_scratchpad(ScratchpadTool('bench', SEASON), 10000)
+        env = NFLPickerEnvironment(WEEKS, None, SEASON, model_name='bench')
+
+        with redirect_stdout(io.StringIO()):
+            observation = env.reset()
+            predictions = favorites_policy(env, observation, 'bench')
+
+            results['env.reset'] = measure(env.reset, args.repeat)
+
+            def cold_reset():
+                # First rollout of a slate: the prompt prefix is rendered and tokenized
+                observation_builder.clear()
+                env.reset()
+
+            results['env.reset[cold_prefix]'] = measure(cold_reset, args.repeat)
+
+            def step():
+                env.reset()
+                if not env.step(predictions)[2]:
+                    raise RuntimeError('Benchmark predictions were rejected')
+
+            reset_ms = results['env.reset']['median_ms']
+            results['env.reset+step'] = measure(step, args.repeat)
+            results['env.reset+step']['step_only_ms'] = round(results['env.reset+step']['median_ms'] - reset_ms, 4)
+    return results
+
+
+SUITES = {
+    'lines': bench_lines,
+    'records': bench_records,
+    'fetch_spreads': bench_fetch_spreads,
+    'scratchpad': bench_scratchpad,
+    'env': bench_env
+}
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Cases whose median got slower than the baseline by more than the tolerance."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before or 'median_ms' not in result or 'median_ms' not in before:
+            continue
+        delta = result['median_ms'] - before['median_ms']
+        # Sub-millisecond cases are noisy; require an absolute change as well
+        if delta > min_delta_ms and result['median_ms'] > before['median_ms'] * (1 + tolerance):
+            regressions.append((name, before['median_ms'], result['median_ms']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the data, tool and environment hot paths')
+    parser.add_argument('--filter', type=str, default='',
+                        help=f"Run only suites whose name contains this ({', '.join(SUITES)})")
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='Timed rounds per case (default: 20)')
+    parser.add_argument('--output', type=str,
+                        help='Results file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--baseline', type=str,
+                        help='Previous results file to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown vs the baseline median (default: 0.25 = 25%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.5,
+                        help='Ignore slowdowns smaller than this many ms (default: 0.5)')
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = {}
+    for suite, bench in SUITES.items():
+        if args.filter not in suite:
+            continue
+        print(f"Running {suite}...")
+        try:
+            results.update(bench(args))
+        except (ImportError, AttributeError) as e:
+            # e.g. the environment needs a verifiers version with ToolEnvironment
+            print(f"  skipped: {type(e).__name__}: {e}")
+            results[suite] = {'skipped': f"{type(e).__name__}: {e}"}
+
+    print(f"\n{'Case':<52} {'median ms':>10} {'p95 ms':>10}")
+    print("-" * 74)
+    for name, result in results.items():
+        if 'skipped' in result:
+            print(f"{name:<52} {'skipped':>10}")
+        elif 'median_ms' not in result:
+            print(f"{name:<52} {json.dumps(result)}")
+        else:
+            print(f"{name:<52} {result['median_ms']:>10.3f} {result['p95_ms']:>10.3f}")
+
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f"{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'meta': {
+                'commit': commit,
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'repeat': args.repeat
+            },
+            'results': results
+        }, f, indent=2)
+    print(f"\nSaved to {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.tolerance, args.min_delta_ms)
+        print(f"Compared with {baseline['meta'].get('commit') or args.baseline}: "
+              f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        for name, before, after in regressions:
+            print(f"  {name}: {before:.3f} -> {after:.3f} ms ({after / before:.2f}x)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Synthetic data generators for benchmarks.
+
+Payloads mimic the Odds API /odds response shape closely enough for
+pull_lines and nfl_data to process them, with deterministic seeds.
+"""
+
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+TEAMS = [
+    'Arizona Cardinals', 'Atlanta Falcons', 'Baltimore Ravens', 'Buffalo Bills',
+    'Carolina Panthers', 'Chicago Bears', 'Cincinnati Bengals', 'Cleveland Browns',
+    'Dallas Cowboys', 'Denver Broncos', 'Detroit Lions', 'Green Bay Packers',
+    'Houston Texans', 'Indianapolis Colts', 'Jacksonville Jaguars', 'Kansas City Chiefs',
+    'Las Vegas Raiders', 'Los Angeles Chargers', 'Los Angeles Rams', 'Miami Dolphins',
+    'Minnesota Vikings', 'New England Patriots', 'New Orleans Saints', 'New York Giants',
+    'New York Jets', 'Philadelphia Eagles', 'Pittsburgh Steelers', 'San Francisco 49ers',
+    'Seattle Seahawks', 'Tampa Bay Buccaneers', 'Tennessee Titans', 'Washington Commanders'
+]
+
+BOOKMAKERS = ['draftkings', 'fanduel', 'betmgm', 'caesars', 'pointsbetus', 'betrivers',
+              'bovada', 'mybookieag', 'betonlineag', 'lowvig', 'betus', 'unibet_us',
+              'williamhill_us', 'superbook', 'wynnbet', 'fliff']
+
+SEASON_START = datetime(2025, 9, 5, 0, 20, tzinfo=timezone.utc)
+
+
+def make_odds_payload(n_games: int, n_books: int = 9, seed: int = 0,
+                      start: datetime = SEASON_START) -> List[Dict]:
+    """Generate a raw /odds response with n_games games and n_books bookmakers each."""
+    rng = random.Random(seed)
+    books = (BOOKMAKERS * (n_books // len(BOOKMAKERS) + 1))[:n_books]
+    games = []
+
+    for i in range(n_games):
+        home, away = rng.sample(TEAMS, 2)
+        spread = rng.choice([x / 2 for x in range(-28, 29)])
+        total = rng.choice([x / 2 for x in range(70, 110)])
+        commence = start + timedelta(days=7 * (i // 16), hours=rng.choice([0, 65, 68, 72, 96]))
+
+        bookmakers = []
+        for j, book in enumerate(books):
+            book_spread = spread + rng.choice([-0.5, 0, 0, 0, 0.5])
+            book_total = total + rng.choice([-0.5, 0, 0, 0.5])
+            home_price = rng.choice([-115, -110, -110, -105, 100])
+            over_price = rng.choice([-115, -110, -110, -105])
+            bookmakers.append({
+                'key': f"{book}_{j}" if j >= len(BOOKMAKERS) else book,
+                'title': book.title(),
+                'last_update': commence.isoformat().replace('+00:00', 'Z'),
+                'markets': [
+                    {'key': 'spreads', 'outcomes': [
+                        {'name': home, 'price': home_price, 'point': book_spread},
+                        {'name': away, 'price': -220 - home_price, 'point': -book_spread},
+                    ]},
+                    {'key': 'totals', 'outcomes': [
+                        {'name': 'Over', 'price': over_price, 'point': book_total},
+                        {'name': 'Under', 'price': -220 - over_price, 'point': book_total},
+                    ]},
+                ]
+            })
+
+        games.append({
+            'id': uuid.UUID(int=rng.getrandbits(128)).hex,
+            'sport_key': 'americanfootball_nfl',
+            'commence_time': commence.isoformat().replace('+00:00', 'Z'),
+            'home_team': home,
+            'away_team': away,
+            'bookmakers': bookmakers
+        })
+
+    return games
+
+
+NOTE_TOPICS = ['injuries', 'weather', 'travel', 'rest', 'divisional', 'line movement',
+               'red zone', 'turnovers', 'pass rush', 'coaching', 'kicker', 'home field']
+
+
+def make_scratchpad_notes(n_sections: int, seed: int = 0) -> List[str]:
+    """Generate scratchpad sections in the style a model writes them (week headers, team notes)."""
+    rng = random.Random(seed)
+    sections = []
+    for i in range(n_sections):
+        team, opponent = rng.sample(TEAMS, 2)
+        topics = rng.sample(NOTE_TOPICS, 3)
+        lines = [f"Week {i // 12 + 1} - {team}"]
+        lines.extend(
+            f"- {topic.capitalize()}: {team.split()[-1]} {rng.choice(['covered', 'failed to cover', 'pushed'])} "
+            f"vs {opponent} ({rng.choice(['+', '-'])}{rng.randint(1, 14)}.5); "
+            f"{rng.choice(['fade', 'back', 'watch'])} next time {topic} matters."
+            for topic in topics
+        )
+        sections.append("\n".join(lines))
+    return sections
@@ -0,0 +1,59 @@
+import os
+import sys
+import argparse
+
+# The environment package lives under environments/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'environments', 'vf_nfl_picker'))
+from nfl_data.dataset import EvalDataset, build_dataset
+from nfl_data.helpers import parse_list
+from tools.observation import scratchpad_version
+from tools.scratchpad_tool import ScratchpadTool
+from vf_nfl_picker import observation_builder
+
+def make_renderer(model_name):
+    """Render each slate with the model's scratchpad as it stood entering that week (empty without a model)"""
+    snapshots = {}
+
+    def scratchpad_for(season, week):
+        if model_name is None:
+            return ""
+        if (season, week) not in snapshots:
+            snapshots[(season, week)] = ScratchpadTool(model_name, season, as_of_week=week - 1).read()
+        return snapshots[(season, week)]
+
+    def render(season, week, day, games):
+        scratchpad = scratchpad_for(season, week)
+        prefix, tokens, digest, _ = observation_builder.prefix(season, week, day, scratchpad, games)
+        return scratchpad_version(scratchpad), prefix, tokens, digest
+
+    return render
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the memory-mapped evaluation dataset (one row per season/week/slate)')
+    parser.add_argument('--seasons', type=str, required=True,
+                       help="Seasons to include, e.g. '2025' or '2021-2024'")
+    parser.add_argument('--weeks', type=str,
+                       help="Weeks to include, e.g. '1-6' (default: every week in the store)")
+    parser.add_argument('--model', type=str,
+                       help='Embed this model\'s scratchpad history in the prompts (default: empty scratchpad)')
+    parser.add_argument('--data-dir', type=str, default='data',
+                       help='Directory containing season_N stores (default: data)')
+    parser.add_argument('--output', type=str, default='data/eval_dataset.arrow',
+                       help='Dataset file (default: data/eval_dataset.arrow)')
+    args = parser.parse_args()
+
+    weeks = parse_list(args.weeks) if args.weeks else None
+    counts = build_dataset(args.output, parse_list(args.seasons), make_renderer(args.model),
+                           data_dir=args.data_dir, weeks=weeks)
+    for season, rows in counts.items():
+        print(f"Season {season}: {rows} slate(s)")
+
+    dataset = EvalDataset(args.output)
+    tokens = dataset.table.column('prompt_tokens').to_pylist()
+    print(f"\nWrote {len(dataset)} rows to {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB)")
+    if tokens:
+        print(f"Prompt prefix tokens: min {min(tokens)}, max {max(tokens)}")
+    print(f"Use it with NFLPickerEnvironment(..., dataset_path='{args.output}') or run_season.py --dataset")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Odds data layer shared by pull_lines.py and the vf_nfl_picker environment
+
+Submodules are imported on first attribute access, so importing one piece
+(e.g. `nfl_data.snapshot_store` from the environment) does not pull in
+aiohttp and numpy through odds_client and consensus.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'Game': 'records',
+    'LineSnapshot': 'records',
+    'SCHEMA_VERSION': 'records',
+    'SnapshotStore': 'snapshot_store',
+    'import_json_snapshots': 'snapshot_store',
+    'LineHistory': 'line_history',
+    'consensus_lines': 'consensus',
+    'flatten_odds': 'consensus',
+    'OddsApiClient': 'odds_client',
+    'OddsApiError': 'odds_client',
+    'QuotaScheduler': 'odds_client',
+    'ResultsTable': 'results',
+    'Grader': 'grading',
+    'build_leaderboard': 'leaderboard'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,266 @@
+"""
+Historical odds backfill into the season snapshot stores.
+
+For each week the plan is built from one cheap historical /events call
+(kickoff times only), then every snapshot time is requested once from the
+historical /odds endpoint and stored for each slate that wants it:
+
+- 'open': the week's lines shortly after they post (OPEN_LEAD before the
+  week starts), stored for the full-week slate and every day slate
+- 't-24h', 't-2h', 't-30m', ...: that long before a slate's first kickoff
+- 'close': CLOSE_LEAD before a slate's first kickoff
+
+Slates are the full week ('all') and each day with games, matching
+pull_lines --day. Snapshots land in SnapshotStore(season) with consensus
+lines, so fetch_spreads and the environment replay them offline.
+
+Progress is checkpointed to `data/season_<season>/backfill.json` after
+every request, so an interrupted run resumes where it stopped, and a
+snapshot already in the store (same week, slate and timestamp) is never
+appended twice. Requests run concurrently under a credit cap per run.
+"""
+
+import asyncio
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+from zoneinfo import ZoneInfo
+
+from .consensus import consensus_lines
+from .helpers import to_api_time
+from .odds_client import OddsApiClient, OddsApiError
+from .snapshot_store import SnapshotStore
+
+PACIFIC = ZoneInfo('America/Los_Angeles')
+
+# NFL weeks run Thursday to Wednesday (as in pull_lines)
+WEEK_DAYS = ['thursday', 'friday', 'saturday', 'sunday', 'monday', 'tuesday', 'wednesday']
+
+OPEN_LEAD = timedelta(days=3)  # Monday before the week's Thursday
+CLOSE_LEAD = timedelta(minutes=5)
+
+# Historical odds cost 10 credits per market per region
+HISTORICAL_COST = 10
+
+
+def _parse_time(timestamp: str) -> datetime:
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+
+def season_kickoff(season: int) -> datetime:
+    """Thursday after Labor Day (first Monday of September), midnight Pacific."""
+    september = datetime(season, 9, 1, tzinfo=PACIFIC)
+    labor_day = september + timedelta(days=(0 - september.weekday()) % 7)
+    return labor_day + timedelta(days=3)
+
+
+def season_weeks(season: int) -> int:
+    """Regular season length: 18 weeks since 2021, 17 before."""
+    return 18 if season >= 2021 else 17
+
+
+def week_window(season: int, week: int):
+    """(start, end) of an NFL week, Thursday 00:00 to Wednesday 23:59 Pacific."""
+    start = season_kickoff(season) + timedelta(weeks=week - 1)
+    return start, start + timedelta(days=6, hours=23, minutes=59)
+
+
+def day_slate(week_start: datetime, commence_time: str) -> str:
+    """Day slate ('thursday', 'sunday', ...) of a kickoff within the week."""
+    offset = (_parse_time(commence_time).astimezone(PACIFIC) - week_start).days
+    return WEEK_DAYS[min(max(offset, 0), 6)]
+
+
+def parse_point(point: str) -> Optional[timedelta]:
+    """'close' / 't-24h' / 't-30m' -> lead before kickoff; 'open' -> None (week-relative)."""
+    if point == 'open':
+        return None
+    if point == 'close':
+        return CLOSE_LEAD
+    match = re.fullmatch(r't-(\d+)([hm])', point)
+    if not match:
+        raise ValueError(f"Unknown snapshot point '{point}' (use open, close, t-<N>h or t-<N>m)")
+    amount = int(match.group(1))
+    return timedelta(hours=amount) if match.group(2) == 'h' else timedelta(minutes=amount)
+
+
+def plan_week(season: int, week: int, events: List[Dict], points: Sequence[str]) -> Dict[str, Dict]:
+    """Map each snapshot time to the slates (and point names) stored from it.
+
+    Returns:
+        {api timestamp: {slate: point}}
+    """
+    week_start, _ = week_window(season, week)
+    first_kickoff: Dict[str, datetime] = {}
+    for event in events:
+        kickoff = _parse_time(event['commence_time'])
+        for slate in ('all', day_slate(week_start, event['commence_time'])):
+            if slate not in first_kickoff or kickoff < first_kickoff[slate]:
+                first_kickoff[slate] = kickoff
+
+    plan: Dict[str, Dict] = {}
+    for point in points:
+        lead = parse_point(point)
+        for slate, kickoff in first_kickoff.items():
+            at = week_start - OPEN_LEAD if lead is None else kickoff - lead
+            plan.setdefault(to_api_time(at), {})[slate] = point
+    return plan
+
+
+class Backfill:
+    """Resumable historical backfill of one season."""
+
+    def __init__(self, client: OddsApiClient, season: int, points: Sequence[str] = ('open', 't-24h', 'close'),
+                 data_dir: str = "data", markets: str = 'spreads,totals', regions: str = 'us',
+                 max_credits: Optional[int] = None):
+        """
+        Args:
+            client: Open OddsApiClient (its max_concurrency bounds parallel requests)
+            season: Season to backfill (historical data starts mid-2020)
+            points: Snapshot times per slate (see module docstring)
+            max_credits: Stop issuing requests once this many credits are
+                committed in this run; the rest is left for the next run
+        """
+        for point in points:
+            parse_point(point)
+        self.client = client
+        self.season = season
+        self.points = list(points)
+        self.markets = markets
+        self.regions = regions
+        self.max_credits = max_credits
+        self.store = SnapshotStore(season, data_dir)
+        self.checkpoint_path = os.path.join(self.store.storage_dir, 'backfill.json')
+        self.checkpoint = self._load_checkpoint()
+        self.credits = 0
+        self.stats = {'requests': 0, 'stored': 0, 'duplicates': 0, 'deferred': 0, 'failed': 0}
+        self.errors: List[str] = []  # One message per failed request, for the caller to report
+
+    @property
+    def request_cost(self) -> int:
+        return HISTORICAL_COST * len(self.markets.split(',')) * len(self.regions.split(','))
+
+    def _load_checkpoint(self) -> Dict:
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, 'r') as f:
+                return json.load(f)
+        return {'events': {}, 'done': {}}
+
+    def _save_checkpoint(self):
+        os.makedirs(self.store.storage_dir, exist_ok=True)
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.checkpoint, f, separators=(',', ':'))
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _reserve(self, cost: int) -> bool:
+        """Commit credits for one request; False (deferred) if it would pass max_credits."""
+        if self.max_credits is not None and self.credits + cost > self.max_credits:
+            self.stats['deferred'] += 1
+            return False
+        self.credits += cost
+        return True
+
+    async def _events(self, week: int) -> Optional[List[Dict]]:
+        """Kickoffs of the week's games (cached in the checkpoint)."""
+        key = str(week)
+        if key not in self.checkpoint['events']:
+            if not self._reserve(1):
+                return None
+            week_start, week_end = week_window(self.season, week)
+            response = await self.client.get_historical_events(
+                to_api_time(week_start - OPEN_LEAD),
+                commenceTimeFrom=to_api_time(week_start), commenceTimeTo=to_api_time(week_end)
+            )
+            self.stats['requests'] += 1
+            self.checkpoint['events'][key] = [
+                {'id': e['id'], 'commence_time': e['commence_time']} for e in response.get('data', [])
+            ]
+            self._save_checkpoint()
+        return self.checkpoint['events'][key]
+
+    async def _snapshot(self, week: int, at: str, slates: Dict[str, str]):
+        """Fetch one historical snapshot and store it for each slate."""
+        if not self._reserve(self.request_cost):
+            return
+        week_start, week_end = week_window(self.season, week)
+        response = await self.client.get_historical_odds(
+            at, regions=self.regions, markets=self.markets,
+            commenceTimeFrom=to_api_time(week_start), commenceTimeTo=to_api_time(week_end)
+        )
+        self.stats['requests'] += 1
+        snapshot_time = response.get('timestamp') or at
+        games = consensus_lines(response.get('data', []))
+
+        for slate, point in sorted(slates.items()):
+            if slate != 'all':
+                slate_games = [g for g in games if day_slate(week_start, g['game_time']) == slate]
+            else:
+                slate_games = games
+            if not slate_games:
+                continue
+            if self.store.contains(week, slate, snapshot_time):
+                self.stats['duplicates'] += 1
+                continue
+            slate_games.sort(key=lambda g: g['game_time'])
+            self.store.append({
+                'pull_timestamp': snapshot_time,
+                'week': week,
+                'season': self.season,
+                'week_start': week_start.isoformat(),
+                'week_end': week_end.isoformat(),
+                'day_filter': slate,
+                'games_count': len(slate_games),
+                'source': 'historical',
+                'point': point,
+                'requested_at': at
+            }, slate_games)
+            self.stats['stored'] += 1
+
+        self.checkpoint['done'].setdefault(str(week), []).append(at)
+        self._save_checkpoint()
+
+    async def _run_week(self, week: int):
+        try:
+            events = await self._events(week)
+            if events is None:
+                return
+            done = set(self.checkpoint['done'].get(str(week), []))
+            plan = plan_week(self.season, week, events, self.points)
+            await asyncio.gather(*(self._guard(week, self._snapshot(week, at, slates))
+                                   for at, slates in sorted(plan.items()) if at not in done))
+        except OddsApiError as e:
+            self.stats['failed'] += 1
+            self.errors.append(f"Week {week}: {e}")
+
+    async def _guard(self, week: int, coroutine):
+        try:
+            await coroutine
+        except OddsApiError as e:
+            self.stats['failed'] += 1
+            self.errors.append(f"Week {week} snapshot: {e}")
+
+    async def run(self, weeks: Optional[Sequence[int]] = None) -> Dict:
+        """Backfill the given weeks (default: the whole regular season) concurrently.
+
+        Returns:
+            Counts of requests, stored snapshots, duplicates skipped, requests
+            deferred by the credit cap and failures, plus credits committed
+            and the failed requests' error messages ('errors')
+        """
+        weeks = list(weeks or range(1, season_weeks(self.season) + 1))
+        await asyncio.gather(*(self._run_week(week) for week in weeks))
+        return {**self.stats, 'credits': self.credits, 'errors': list(self.errors)}
+
+    def pending(self, weeks: Optional[Sequence[int]] = None) -> int:
+        """Snapshot requests still to make for weeks whose kickoffs are known."""
+        count = 0
+        for week in weeks or range(1, season_weeks(self.season) + 1):
+            events = self.checkpoint['events'].get(str(week))
+            if events is None:
+                continue
+            done = set(self.checkpoint['done'].get(str(week), []))
+            count += sum(1 for at in plan_week(self.season, week, events, self.points) if at not in done)
+        return count
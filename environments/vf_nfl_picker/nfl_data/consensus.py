@@ -0,0 +1,223 @@
+"""
+Consensus lines with book-weighted medians and vig-removed probabilities.
+
+The nested bookmaker/market/outcome dicts are flattened once into NumPy arrays
+with one row per (game, bookmaker, market, outcome), and the medians,
+book-weighted medians and vig-removed implied probabilities of every game
+are computed from them in grouped passes.
+
+This is not a faster process_game_lines: walking the nested dicts costs as
+much as the per-game loop (benchmarks/bench_consensus.py measures ~0.7-0.8x),
+so pull_lines keeps the loop. Use consensus_lines for the extras
+(extended=True) or where the flattened arrays are wanted anyway (backfill).
+"""
+
+from array import array
+from operator import itemgetter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+SPREADS, TOTALS = 0, 1
+MARKET_CODES = {'spreads': SPREADS, 'totals': TOTALS}
+
+# Side codes: spreads use home/away, totals use over/under
+HOME, AWAY = 0, 1
+OVER, UNDER = 0, 1
+
+
+def _column(rows: List[Dict], key: str) -> np.ndarray:
+    """Float column from a list of dicts, NaN where the key is missing."""
+    try:
+        return np.fromiter(map(itemgetter(key), rows), dtype=np.float64, count=len(rows))
+    except KeyError:
+        return np.array([row.get(key) for row in rows], dtype=np.float64)
+
+
+def flatten_odds(games: List[Dict]) -> Dict[str, np.ndarray]:
+    """Flatten raw /odds games into parallel arrays.
+
+    Python only loops down to market level; outcome dicts are collected with
+    list.extend and their fields pulled out with C-level map/itemgetter, so
+    there is no bytecode or tuple allocation per row.
+
+    Returns:
+        Dict with 'game', 'book', 'market', 'side', 'point', 'price' row
+        arrays, plus 'books' (bookmaker keys by index) and 'bookmaker_count'
+        (bookmakers listed per game)
+    """
+    outcomes = []
+    market_game, market_book, market_code, market_size = array('q'), array('q'), array('b'), array('q')
+    home_teams, bookmaker_count = [], array('q')
+    books = {}
+
+    for g, game in enumerate(games):
+        home_teams.append(game['home_team'])
+        bookmakers = game.get('bookmakers', [])
+        bookmaker_count.append(len(bookmakers))
+        for bookmaker in bookmakers:
+            b = books.setdefault(bookmaker['key'], len(books))
+            for market in bookmaker.get('markets', []):
+                m = MARKET_CODES.get(market['key'])
+                if m is None:
+                    continue
+                market_game.append(g)
+                market_book.append(b)
+                market_code.append(m)
+                market_size.append(len(market['outcomes']))
+                outcomes.extend(market['outcomes'])
+
+    sizes = np.frombuffer(market_size, dtype=np.int64)
+    game = np.repeat(np.frombuffer(market_game, dtype=np.int64), sizes)
+    market = np.repeat(np.frombuffer(market_code, dtype=np.int8), sizes)
+
+    # Side: spreads compare against the home team, totals against 'Over'
+    names = np.array(list(map(itemgetter('name'), outcomes)), dtype=object)
+    reference = np.where(market == SPREADS, np.array(home_teams, dtype=object)[game], 'Over')
+
+    return {
+        'game': game,
+        'book': np.repeat(np.frombuffer(market_book, dtype=np.int64), sizes),
+        'market': market,
+        'side': (names != reference).astype(np.int8),
+        'point': _column(outcomes, 'point'),
+        'price': _column(outcomes, 'price'),
+        'books': list(books),
+        'bookmaker_count': np.frombuffer(bookmaker_count, dtype=np.int64),
+    }
+
+
+def american_to_implied(price: np.ndarray) -> np.ndarray:
+    """Convert American odds to implied probability (vig included)."""
+    price = np.asarray(price, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(price > 0, 100.0 / (price + 100.0), -price / (100.0 - price))
+
+
+def group_median(groups: np.ndarray, values: np.ndarray, n_groups: int,
+                 weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """Median of values per group id, NaN for empty groups.
+
+    Unweighted results match `statistics.median` (mean of the two middle
+    values for even counts). With weights, the weighted median is returned;
+    when the cumulative weight lands exactly on half the two neighbours are
+    averaged, so equal weights reduce to the plain median.
+    """
+    mask = ~np.isnan(values)
+    groups, values = groups[mask], values[mask]
+    result = np.full(n_groups, np.nan)
+    if len(values) == 0:
+        return result
+
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    present = counts > 0
+
+    if weights is None:
+        lo = starts[present] + (counts[present] - 1) // 2
+        hi = starts[present] + counts[present] // 2
+        result[present] = (values[lo] + values[hi]) / 2
+        return result
+
+    weights = weights[mask][order]
+    cumulative = np.cumsum(weights)
+    # Cumulative weight within each group
+    group_offset = np.concatenate(([0.0], cumulative))[starts]
+    within = cumulative - group_offset[groups]
+    half = (np.bincount(groups, weights=weights, minlength=n_groups) / 2)[groups]
+
+    # Rows are sorted within each group, so the first row reaching half the
+    # group weight sits after every row that has not reached it yet
+    reached = within >= half - 1e-12
+    first = starts + np.bincount(groups[~reached], minlength=n_groups)
+    first = first[present]
+    on_half = np.isclose(within[first], half[first])
+    second = np.where(on_half & (first + 1 < ends[present]), first + 1, first)
+    result[present] = (values[first] + values[second]) / 2
+    return result
+
+
+def no_vig_probabilities(frame: Dict[str, np.ndarray]) -> np.ndarray:
+    """Vig-removed implied probability for every row.
+
+    Each (game, book, market) pair of outcomes is normalised to sum to 1.
+    Rows whose market does not have exactly two priced outcomes get NaN.
+    """
+    implied = american_to_implied(frame['price'])
+    n_books = max(len(frame['books']), 1)
+    pair = (frame['game'] * n_books + frame['book']) * 2 + frame['market']
+    n_pairs = int(pair.max()) + 1 if len(pair) else 0
+
+    valid = ~np.isnan(implied)
+    totals = np.bincount(pair[valid], weights=implied[valid], minlength=n_pairs)
+    counts = np.bincount(pair[valid], minlength=n_pairs)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        probs = implied / totals[pair]
+    probs[counts[pair] != 2] = np.nan
+    return probs
+
+
+def consensus_lines(games: List[Dict], book_weights: Optional[Dict[str, float]] = None,
+                    extended: bool = False) -> List[Dict]:
+    """Compute consensus lines, and optionally the weighted/no-vig extras, for every game.
+
+    Args:
+        games: Raw games from the Odds API /odds endpoint
+        book_weights: Optional {bookmaker_key: weight} for weighted medians
+            (books not listed get weight 1.0)
+        extended: Also include weighted medians and no-vig probabilities
+
+    Returns:
+        List of game dicts with the same fields as records.Game.to_dict()
+        (home_spread/away_spread/total are plain medians across books). With
+        extended=True each game also has weighted_home_spread,
+        weighted_away_spread, weighted_total, home_cover_prob and over_prob.
+    """
+    frame = flatten_odds(games)
+    n_games = len(games)
+    game, market, side, point = frame['game'], frame['market'], frame['side'], frame['point']
+
+    home_rows = (market == SPREADS) & (side == HOME)
+    away_rows = (market == SPREADS) & (side == AWAY)
+    over_rows = (market == TOTALS) & (side == OVER)
+
+    columns = {
+        'home_spread': group_median(game[home_rows], point[home_rows], n_games),
+        'away_spread': group_median(game[away_rows], point[away_rows], n_games),
+        'total': group_median(game[over_rows], point[over_rows], n_games),
+    }
+
+    if extended:
+        weight_by_book = np.array([(book_weights or {}).get(book, 1.0) for book in frame['books']], dtype=np.float64)
+        weights = weight_by_book[frame['book']]
+        probs = no_vig_probabilities(frame)
+        columns.update({
+            'weighted_home_spread': group_median(game[home_rows], point[home_rows], n_games, weights[home_rows]),
+            'weighted_away_spread': group_median(game[away_rows], point[away_rows], n_games, weights[away_rows]),
+            'weighted_total': group_median(game[over_rows], point[over_rows], n_games, weights[over_rows]),
+            'home_cover_prob': group_median(game[home_rows], probs[home_rows], n_games),
+            'over_prob': group_median(game[over_rows], probs[over_rows], n_games),
+        })
+
+    # NaN -> None so the JSON output matches the per-game loop (NaN != NaN)
+    names = list(columns)
+    rows = zip(*([None if v != v else v for v in values.tolist()] for values in columns.values()))
+    bookmaker_count = frame['bookmaker_count'].tolist()
+
+    results = []
+    for game_data, count, row in zip(games, bookmaker_count, rows):
+        game_info = {
+            'game_id': game_data['id'],
+            'home_team': game_data['home_team'],
+            'away_team': game_data['away_team'],
+            'game_time': game_data['commence_time'],
+            'bookmaker_count': count,
+        }
+        game_info.update(zip(names, row))
+        results.append(game_info)
+
+    return results
@@ -0,0 +1,201 @@
+"""
+Prebuilt evaluation dataset: one row per (season, week, day slate).
+
+Built once from the season snapshot stores (latest pull of each slate) with
+the rendered prompt precomputed, and written as an uncompressed Arrow IPC
+stream, the format HF `datasets` keeps its cache files in
+(`datasets.Dataset.from_file` opens it as is). Opening it memory-maps the
+file, so every vf-eval / run_season worker on a machine shares the same
+pages and reading a row copies nothing but the values asked for.
+Shards are contiguous slices (zero-copy) and samples only copy the rows
+they take.
+
+Columns:
+- season, week, day ('all' for the full-week slate), pull_timestamp
+- games: list of structs with the records.GAME_COLUMNS fields, kickoff order
+- scratchpad_version, prompt, prompt_tokens, prompt_hash: the rendered
+  prompt prefix (see tools.observation) and the scratchpad snapshot it embeds
+
+pyarrow is only needed to build or open a dataset:
+    pip install "vf-nfl-picker[dataset]"
+"""
+
+import os
+import random
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from .records import GAME_COLUMNS, Game
+from .snapshot_store import DAY_CODES, SnapshotStore, _to_epoch
+
+# render(season, week, day, games) -> (scratchpad_version, prompt, prompt_tokens, prompt_hash)
+Renderer = Callable[[int, int, str, List[Game]], Tuple[str, str, int, str]]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("The evaluation dataset needs pyarrow: pip install 'vf-nfl-picker[dataset]'")
+
+
+def dataset_schema():
+    _require_pyarrow()
+    game = pa.struct([
+        ('game_id', pa.string()),
+        ('home_team', pa.string()),
+        ('away_team', pa.string()),
+        ('game_time', pa.string()),
+        ('bookmaker_count', pa.int16()),
+        ('home_spread', pa.float64()),
+        ('away_spread', pa.float64()),
+        ('total', pa.float64())
+    ])
+    return pa.schema([
+        ('season', pa.int16()),
+        ('week', pa.int16()),
+        ('day', pa.string()),
+        ('pull_timestamp', pa.string()),
+        ('games', pa.list_(game)),
+        ('scratchpad_version', pa.string()),
+        ('prompt', pa.large_string()),
+        ('prompt_tokens', pa.int32()),
+        ('prompt_hash', pa.string())
+    ])
+
+
+def build_dataset(path: str, seasons: Iterable[int], render: Renderer, data_dir: str = "data",
+                  weeks: Optional[Sequence[int]] = None) -> Dict:
+    """Write the dataset for the given seasons (one record batch per season).
+
+    Args:
+        path: Output file (written to a temp file, then renamed)
+        seasons: Seasons whose snapshot stores to read
+        render: Renders each slate's prompt (see Renderer)
+        weeks: Only these weeks (default: every week in the store)
+
+    Returns:
+        Counts of rows per season
+    """
+    schema = dataset_schema()
+    counts = {}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_stream(sink, schema) as writer:
+        for season in seasons:
+            store = SnapshotStore(season, data_dir)
+            rows = {name: [] for name in schema.names}
+            for week, day in store.slates():
+                if weeks is not None and week not in weeks:
+                    continue
+                snapshot = store.latest_snapshot(week, day)
+                # Kickoff order, as the prompt lists them (tools.observation.canonical_games)
+                games = sorted(snapshot.games, key=lambda g: (g.game_time or "", g.game_id))
+                version, prompt, tokens, digest = render(season, week, day, games)
+                row = {
+                    'season': season,
+                    'week': week,
+                    'day': day,
+                    'pull_timestamp': snapshot.pull_timestamp,
+                    'games': [{column: getattr(game, column) for column in GAME_COLUMNS} for game in games],
+                    'scratchpad_version': version,
+                    'prompt': prompt,
+                    'prompt_tokens': tokens,
+                    'prompt_hash': digest
+                }
+                for name in schema.names:
+                    rows[name].append(row[name])
+            counts[season] = len(rows['season'])
+            if rows['season']:
+                writer.write_batch(pa.record_batch([rows[name] for name in schema.names], schema=schema))
+    os.replace(tmp_path, path)
+    return counts
+
+
+class EvalDataset:
+    """Memory-mapped view of a dataset written by build_dataset."""
+
+    def __init__(self, path: str, table=None):
+        _require_pyarrow()
+        self.path = path
+        if table is None:
+            # Zero-copy: the table's buffers point into the mapped file
+            table = pa.ipc.open_stream(pa.memory_map(path, 'r')).read_all()
+        self.table = table
+        self._keys = None
+        self._latest = None
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def _view(self, table) -> "EvalDataset":
+        return EvalDataset(self.path, table)
+
+    def row(self, i: int, columns: Optional[Sequence[str]] = None) -> Dict:
+        """Row i as a dict (games as plain dicts), optionally only some columns."""
+        return {name: self.table.column(name)[i].as_py() for name in columns or self.table.column_names}
+
+    def games(self, i: int) -> List[Game]:
+        """Game records of row i, in kickoff order."""
+        return [Game(**game) for game in self.table.column('games')[i].as_py()]
+
+    def lookup(self, season: int, week: int, day: Optional[str] = None) -> Optional[int]:
+        """Row index of a slate, or None if it is not in the dataset.
+
+        day=None picks the week's most recent pull from any slate, as
+        SnapshotStore.latest_snapshot does; 'all' is the full-week slate only.
+        """
+        if self._keys is None:
+            self._index()
+        if day is None:
+            return self._latest.get((season, week))
+        return self._keys.get((season, week, day.lower()))
+
+    def _index(self):
+        slates = self.slates()
+        pulls = self.table.column('pull_timestamp').to_pylist()
+        self._keys = {key: i for i, key in enumerate(slates)}
+        latest = {}
+        for i, (season, week, day) in enumerate(slates):
+            # Ties go to the earlier day code (the full-week slate), like the store
+            rank = (_to_epoch(pulls[i]), -DAY_CODES[day])
+            if (season, week) not in latest or rank > latest[(season, week)][0]:
+                latest[(season, week)] = (rank, i)
+        self._latest = {key: i for key, (_, i) in latest.items()}
+
+    def slates(self) -> List[Tuple[int, int, str]]:
+        """(season, week, day) of every row, in row order."""
+        return list(zip(*(self.table.column(name).to_pylist() for name in ('season', 'week', 'day'))))
+
+    def shard(self, index: int, count: int) -> "EvalDataset":
+        """Contiguous shard `index` of `count` (zero-copy slice)."""
+        if not 0 <= index < count:
+            raise ValueError(f"Shard index {index} out of range for {count} shards")
+        size, extra = divmod(len(self), count)
+        start = index * size + min(index, extra)
+        return self._view(self.table.slice(start, size + (index < extra)))
+
+    def sample(self, n: int, seed: int = 0) -> "EvalDataset":
+        """n rows drawn without replacement (copies only those rows)."""
+        indices = sorted(random.Random(seed).sample(range(len(self)), min(n, len(self))))
+        return self._view(self.table.take(indices))
+
+    def filter(self, season: Optional[int] = None, weeks: Optional[Sequence[int]] = None,
+               days: Optional[Sequence[str]] = None) -> "EvalDataset":
+        """Rows matching all given conditions."""
+        indices = [i for i, (row_season, week, day) in enumerate(self.slates())
+                   if (season is None or row_season == season)
+                   and (weeks is None or week in weeks)
+                   and (days is None or day in days)]
+        return self._view(self.table.take(indices))
+
+    def to_hf(self):
+        """The same table as a HF datasets.Dataset (no copy)."""
+        try:
+            from datasets import Dataset
+        except ImportError as e:
+            raise ImportError("to_hf() needs the datasets package: pip install datasets") from e
+        return Dataset(self.table)
+
@@ -0,0 +1,263 @@
+"""
+Incremental grading of prediction files against final scores.
+
+Each `predictions/week_N/predictions_*.json` written by
+NFLPickerEnvironment.step is graded against the spread the model saw at
+pick time: the `lines` saved with the predictions, or for older files the
+latest snapshot pulled before the file's timestamp.
+
+Grades are kept in `predictions/grades.json`, keyed by season and then by
+file path with the file's (mtime, size). A file is only re-graded when it
+changed, or when it still has pending games and new results have been
+ingested since. Files of other seasons share the predictions directory;
+they are skipped, and remembered by (mtime, size) so they are not re-read.
+"""
+
+import json
+import os
+from datetime import datetime
+from glob import glob
+from typing import Dict, List, Optional, Tuple
+
+from .locking import file_lock
+from .results import ResultsTable
+from .snapshot_store import SnapshotStore
+from .teams import names_team
+
+STANDARD_PRICE = -110
+LEGACY_SEASON = 2025  # Season of prediction files written before the season was recorded
+
+
+def payout(units: float, price: float = STANDARD_PRICE) -> float:
+    """Profit on a winning bet of `units` at American odds `price`."""
+    return units * (100 / abs(price)) if price < 0 else units * price / 100
+
+
+def resolve_side(pick, game: Dict) -> Optional[str]:
+    """Map a pick ('home'/'away', full team name, nickname or abbreviation) to 'home' or 'away'.
+
+    Team names must appear as whole words (see teams.names_team); a pick
+    that names both teams, or neither, is ambiguous and gives None.
+    """
+    if pick is None:
+        return None
+    choice = str(pick).strip()
+    if choice.lower() in ('home', 'away'):
+        return choice.lower()
+    if not choice:
+        return None
+
+    home_match = names_team(choice, game['home_team'])
+    away_match = names_team(choice, game['away_team'])
+    if home_match and not away_match:
+        return 'home'
+    if away_match and not home_match:
+        return 'away'
+    return None
+
+
+def find_game(key: str, prediction: Dict, games: Dict[str, Dict]) -> Optional[Dict]:
+    """Find the game a prediction refers to: by game id, by both teams named in the key, or by the picked team."""
+    if key in games:
+        return games[key]
+    key_lower = key.lower()
+    for game in games.values():
+        if game['home_team'].lower() in key_lower and game['away_team'].lower() in key_lower:
+            return game
+
+    # Each team plays once a week, so the picked team identifies the game
+    matches = [game for game in games.values() if resolve_side(_pick_of(prediction), game)]
+    return matches[0] if len(matches) == 1 else None
+
+
+def _pick_of(prediction: Dict):
+    return prediction.get('pick', prediction.get('team')) if isinstance(prediction, dict) else prediction
+
+
+def grade_pick(side: str, spread: Optional[float], units: float, result: Optional[Dict],
+               price: float = STANDARD_PRICE) -> Tuple[str, float]:
+    """Grade one pick against the spread.
+
+    Returns:
+        (outcome, profit in units) where outcome is 'win', 'loss', 'push',
+        'pending' (no final score yet) or 'ungraded' (no line)
+    """
+    if spread is None:
+        return 'ungraded', 0.0
+    if result is None:
+        return 'pending', 0.0
+
+    if side == 'home':
+        margin = result['home_score'] - result['away_score'] + spread
+    else:
+        margin = result['away_score'] - result['home_score'] + spread
+
+    if margin > 0:
+        return 'win', payout(units, price)
+    if margin < 0:
+        return 'loss', -float(units)
+    return 'push', 0.0
+
+
+def _file_epoch(timestamp: Optional[str], path: str) -> float:
+    """Pick time of a predictions file (step() writes local '%Y%m%d_%H%M%S')."""
+    try:
+        return datetime.strptime(timestamp, "%Y%m%d_%H%M%S").timestamp()
+    except (TypeError, ValueError):
+        return os.path.getmtime(path)
+
+
+class Grader:
+    """Grades prediction files incrementally and keeps the grades on disk."""
+
+    def __init__(self, season: int = 2025, data_dir: str = "data", predictions_dir: str = "predictions",
+                 price: float = STANDARD_PRICE):
+        self.season = season
+        self.predictions_dir = predictions_dir
+        self.price = price
+        self.results = ResultsTable(season, data_dir)
+        self.store = SnapshotStore(season, data_dir)
+        self.manifest_path = os.path.join(predictions_dir, "grades.json")
+        grades = self._load_manifest().get(str(season), {})
+        self.manifest: Dict[str, Dict] = grades.get('files', {})
+        self.other_seasons: Dict[str, List[int]] = grades.get('other', {})  # path -> [mtime_ns, size]
+
+    def _load_manifest(self) -> Dict:
+        """Every season's grades: {season: {'files': {path: entry}, 'other': {path: [mtime_ns, size]}}}."""
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, 'r') as f:
+            manifest = json.load(f)
+        # The old layout ({path: entry}) did not record seasons; its files are graded again
+        if any('mtime_ns' in value for value in manifest.values()):
+            return {}
+        return manifest
+
+    def _save_manifest(self):
+        """Write this season's grades, keeping the other seasons' as they are on disk."""
+        os.makedirs(self.predictions_dir, exist_ok=True)
+        with file_lock(self.manifest_path):
+            manifest = self._load_manifest()
+            manifest[str(self.season)] = {'files': self.manifest, 'other': self.other_seasons}
+            tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f, separators=(',', ':'))
+            os.replace(tmp_path, self.manifest_path)
+
+    def _lines_at_pick_time(self, data: Dict, path: str) -> Dict[str, Dict]:
+        """Games and spreads the model saw, keyed by game id."""
+        if data.get('lines'):
+            return data['lines']
+        snapshot = self.store.latest(data['week'], data.get('day'), as_of=_file_epoch(data.get('timestamp'), path))
+        if snapshot is None:
+            return {}
+        return {game['game_id']: game for game in snapshot['games']}
+
+    def grade_file(self, path: str) -> Dict:
+        """Grade one predictions file."""
+        with open(path, 'r') as f:
+            return self._grade(path, json.load(f))
+
+    def _grade(self, path: str, data: Dict) -> Dict:
+        games = self._lines_at_pick_time(data, path)
+        picks = []
+        for key, prediction in data.get('predictions', {}).items():
+            units = prediction.get('units', 0) if isinstance(prediction, dict) else 0
+            game = find_game(key, prediction, games)
+            side = resolve_side(_pick_of(prediction), game) if game else None
+            if side is None:
+                picks.append({'key': key, 'units': units, 'outcome': 'ungraded', 'pnl': 0.0})
+                continue
+
+            spread = game.get(f'{side}_spread')
+            result = self.results.get(game.get('game_id'), game['home_team'], game['away_team'], game.get('game_time'))
+            outcome, pnl = grade_pick(side, spread, units, result, self.price)
+            picks.append({
+                'key': key,
+                'game_id': game.get('game_id'),
+                'team': game[f'{side}_team'],
+                'side': side,
+                'spread': spread,
+                'units': units,
+                'outcome': outcome,
+                'pnl': round(pnl, 4)
+            })
+
+        summary = {outcome: 0 for outcome in ('win', 'loss', 'push', 'pending', 'ungraded')}
+        for pick in picks:
+            summary[pick['outcome']] += 1
+        risked = sum(p['units'] for p in picks if p['outcome'] in ('win', 'loss', 'push'))
+        pnl = sum(p['pnl'] for p in picks)
+        summary.update({
+            'units_risked': risked,
+            'pnl': round(pnl, 4),
+            'roi': round(pnl / risked, 4) if risked else None
+        })
+
+        return {
+            'model': data.get('model', 'default'),
+            'season': data.get('season', LEGACY_SEASON),
+            'week': data.get('week'),
+            'day': data.get('day'),
+            'timestamp': data.get('timestamp'),
+            'picks': picks,
+            'summary': summary
+        }
+
+    def _is_current(self, entry: Optional[Dict], st: os.stat_result) -> bool:
+        if entry is None or entry['mtime_ns'] != st.st_mtime_ns or entry['size'] != st.st_size:
+            return False
+        # Unchanged file: only pending games can change, and only if new results arrived
+        return entry['summary']['pending'] == 0 or entry['results_version'] == self.results.version
+
+    def run(self, force: bool = False) -> Dict[str, int]:
+        """Grade new/changed files (or everything with force) and save the grades.
+
+        Only files of this grader's season are graded.
+
+        Returns:
+            Counts of files graded, skipped as up to date, and removed
+        """
+        self.results.refresh()
+        paths = sorted(glob(os.path.join(self.predictions_dir, 'week_*', 'predictions_*.json')))
+        graded = skipped = 0
+        changed = False
+
+        for path in paths:
+            st = os.stat(path)
+            stamp = [st.st_mtime_ns, st.st_size]
+            if self.other_seasons.get(path) == stamp:
+                continue
+            if not force and self._is_current(self.manifest.get(path), st):
+                skipped += 1
+                continue
+
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get('season', LEGACY_SEASON) != self.season:
+                self.other_seasons[path] = stamp
+                self.manifest.pop(path, None)
+                changed = True
+                continue
+            self.other_seasons.pop(path, None)
+
+            entry = self._grade(path, data)
+            entry.update({'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'results_version': self.results.version})
+            self.manifest[path] = entry
+            graded += 1
+
+        present = set(paths)
+        removed = [path for path in self.manifest if path not in present]
+        for path in removed:
+            del self.manifest[path]
+        gone = [path for path in self.other_seasons if path not in present]
+        for path in gone:
+            del self.other_seasons[path]
+
+        if graded or removed or gone or changed:
+            self._save_manifest()
+        return {'graded': graded, 'skipped': skipped, 'removed': len(removed)}
+
+    def grades(self) -> List[Dict]:
+        """All graded files, each with its path."""
+        return [{'path': path, **entry} for path, entry in sorted(self.manifest.items())]
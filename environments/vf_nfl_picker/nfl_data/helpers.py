@@ -0,0 +1,23 @@
+"""
+Small helpers shared by the odds data layer and the command-line scripts.
+"""
+
+from datetime import datetime, timezone
+from typing import List
+
+
+def to_api_time(dt: datetime) -> str:
+    """Format a datetime as the UTC 'YYYY-MM-DDTHH:MM:SSZ' string the Odds API expects."""
+    return dt.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def parse_list(spec: str) -> List[int]:
+    """Parse a list of numbers and ranges: '2023-2024,2021' -> [2021, 2023, 2024]."""
+    values = []
+    for part in spec.split(','):
+        if '-' in part:
+            lo, hi = part.split('-')
+            values.extend(range(int(lo), int(hi) + 1))
+        else:
+            values.append(int(part))
+    return sorted(set(values))
@@ -0,0 +1,197 @@
+"""
+Leaderboard with bootstrap confidence intervals.
+
+Graded picks (see grading.Grader) are loaded into flat arrays and summed
+per (model, game) into matrices. The bootstrap resamples games, not
+individual picks, so repeated rollouts of the same game are not counted
+as independent evidence. Every resample for every model is one matrix
+product: multinomial game counts (n_boot x games) times the per-game sums
+(games x models).
+
+Metrics:
+- ATS win rate: wins / (wins + losses), pushes excluded
+- ROI: profit / units risked (pushes count as risked, matching grading)
+- Paired differences between each pair of models, over the games both picked
+"""
+
+import warnings
+from itertools import combinations
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DECIDED = ('win', 'loss', 'push')
+
+
+def load_picks(grades: List[Dict]) -> Dict:
+    """Flatten graded files into arrays of decided picks.
+
+    Returns:
+        {'models': names, 'games': (season, week, game) keys, 'model': idx, 'game': idx,
+         'win', 'loss', 'units', 'pnl': arrays}
+    """
+    model_index: Dict[str, int] = {}
+    game_index: Dict[tuple, int] = {}
+    columns = {name: [] for name in ('model', 'game', 'win', 'loss', 'units', 'pnl')}
+
+    for entry in grades:
+        model = model_index.setdefault(entry['model'], len(model_index))
+        for pick in entry['picks']:
+            if pick['outcome'] not in DECIDED:
+                continue
+            key = (entry.get('season'), entry['week'], pick.get('game_id') or pick['key'])
+            game = game_index.setdefault(key, len(game_index))
+            columns['model'].append(model)
+            columns['game'].append(game)
+            columns['win'].append(pick['outcome'] == 'win')
+            columns['loss'].append(pick['outcome'] == 'loss')
+            columns['units'].append(pick['units'])
+            columns['pnl'].append(pick['pnl'])
+
+    arrays = {
+        'model': np.array(columns['model'], dtype=np.int64),
+        'game': np.array(columns['game'], dtype=np.int64),
+        'win': np.array(columns['win'], dtype=np.float64),
+        'loss': np.array(columns['loss'], dtype=np.float64),
+        'units': np.array(columns['units'], dtype=np.float64),
+        'pnl': np.array(columns['pnl'], dtype=np.float64)
+    }
+    arrays['models'] = sorted(model_index, key=model_index.get)
+    arrays['games'] = sorted(game_index, key=game_index.get)
+    return arrays
+
+
+def per_game_sums(picks: Dict) -> Dict[str, np.ndarray]:
+    """(models x games) matrices of wins, decided picks, profit and units risked."""
+    n_models, n_games = len(picks['models']), len(picks['games'])
+    cell = picks['model'] * n_games + picks['game']
+
+    def total(weights):
+        return np.bincount(cell, weights=weights, minlength=n_models * n_games).reshape(n_models, n_games)
+
+    return {
+        'wins': total(picks['win']),
+        'decided': total(picks['win'] + picks['loss']),
+        'pnl': total(picks['pnl']),
+        'risked': total(picks['units']),
+        'picked': total(np.ones_like(picks['units'])) > 0
+    }
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), np.nan)
+
+
+def _interval(samples: np.ndarray, ci: float) -> np.ndarray:
+    """Percentile interval along axis 0 -> (2, ...) array of lower/upper bounds."""
+    alpha = (1 - ci) / 2
+    with warnings.catch_warnings():
+        # Models/pairs with no decided picks give all-NaN columns
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanpercentile(samples, [100 * alpha, 100 * (1 - alpha)], axis=0)
+
+
+def _round(value) -> Optional[float]:
+    return None if value is None or np.isnan(value) else round(float(value), 4)
+
+
+def build_leaderboard(grades: List[Dict], n_boot: int = 10000, ci: float = 0.95,
+                      seed: int = 0, chunk: int = 2000) -> Dict:
+    """Leaderboard with bootstrap CIs for every model and every pair of models.
+
+    Args:
+        grades: Graded files (Grader.grades())
+        n_boot: Bootstrap resamples
+        ci: Confidence level of the percentile intervals
+        seed: RNG seed, so reruns give the same intervals
+        chunk: Resamples drawn per batch (bounds memory to chunk x games)
+
+    Returns:
+        {'models': [row per model, best ROI first], 'pairs': [row per model pair], 'n_boot', 'ci', 'games'}
+    """
+    picks = load_picks(grades)
+    names = picks['models']
+    n_games = len(picks['games'])
+    if not names or n_games == 0:
+        return {'models': [], 'pairs': [], 'n_boot': n_boot, 'ci': ci, 'games': 0}
+
+    sums = per_game_sums(picks)
+    pairs = list(combinations(range(len(names)), 2))
+
+    # Each pair is compared on the games both models picked; stack the masked
+    # per-game sums so all pairs resample with one product per chunk
+    if pairs:
+        a_idx, b_idx = np.array(pairs).T
+        shared = sums['picked'][a_idx] & sums['picked'][b_idx]
+        pair_rows = np.concatenate([
+            sums[key][side] * shared for side in (a_idx, b_idx) for key in ('wins', 'decided', 'pnl', 'risked')
+        ])
+    else:
+        pair_rows = np.zeros((0, n_games))
+    model_rows = np.concatenate([sums[key] for key in ('wins', 'decided', 'pnl', 'risked')])
+    rows = np.concatenate([model_rows, pair_rows]).T  # games x (4 * models + 8 * pairs)
+
+    rng = np.random.default_rng(seed)
+    resampled = []
+    uniform = np.full(n_games, 1.0 / n_games)
+    for start in range(0, n_boot, chunk):
+        counts = rng.multinomial(n_games, uniform, size=min(chunk, n_boot - start)).astype(np.float64)
+        resampled.append(counts @ rows)
+    resampled = np.concatenate(resampled)  # n_boot x columns
+
+    n_models, n_pairs = len(names), len(pairs)
+    boot_models = resampled[:, :4 * n_models].reshape(-1, 4, n_models)
+    boot_win_rate = _ratio(boot_models[:, 0], boot_models[:, 1])
+    boot_roi = _ratio(boot_models[:, 2], boot_models[:, 3])
+    win_rate_ci = _interval(boot_win_rate, ci)
+    roi_ci = _interval(boot_roi, ci)
+
+    models = []
+    for m, name in enumerate(names):
+        wins, decided = sums['wins'][m].sum(), sums['decided'][m].sum()
+        pnl, risked = sums['pnl'][m].sum(), sums['risked'][m].sum()
+        in_model = picks['model'] == m
+        models.append({
+            'model': name,
+            'picks': int(in_model.sum()),
+            'games': int(sums['picked'][m].sum()),
+            'wins': int(wins),
+            'losses': int(decided - wins),
+            'pushes': int(in_model.sum() - decided),
+            'win_rate': _round(wins / decided if decided else np.nan),
+            'win_rate_ci': [_round(v) for v in win_rate_ci[:, m]],
+            'units_risked': _round(risked),
+            'pnl': _round(pnl),
+            'roi': _round(pnl / risked if risked else np.nan),
+            'roi_ci': [_round(v) for v in roi_ci[:, m]]
+        })
+    models.sort(key=lambda row: np.inf if row['roi'] is None else -row['roi'])
+
+    pair_results = []
+    if pairs:
+        boot_pairs = resampled[:, 4 * n_models:].reshape(-1, 2, 4, n_pairs)
+        diff_win_rate = _ratio(boot_pairs[:, 0, 0], boot_pairs[:, 0, 1]) - _ratio(boot_pairs[:, 1, 0], boot_pairs[:, 1, 1])
+        diff_roi = _ratio(boot_pairs[:, 0, 2], boot_pairs[:, 0, 3]) - _ratio(boot_pairs[:, 1, 2], boot_pairs[:, 1, 3])
+        diff_win_rate_ci = _interval(diff_win_rate, ci)
+        diff_roi_ci = _interval(diff_roi, ci)
+
+        full = pair_rows.reshape(2, 4, n_pairs, n_games).sum(axis=-1)
+        point_win_rate = _ratio(full[0, 0], full[0, 1]) - _ratio(full[1, 0], full[1, 1])
+        point_roi = _ratio(full[0, 2], full[0, 3]) - _ratio(full[1, 2], full[1, 3])
+        valid = (~np.isnan(diff_roi)).sum(axis=0)
+        prob_better = _ratio((diff_roi > 0).sum(axis=0), valid)
+
+        for p, (a, b) in enumerate(pairs):
+            pair_results.append({
+                'model_a': names[a],
+                'model_b': names[b],
+                'shared_games': int(shared[p].sum()),
+                'win_rate_diff': _round(point_win_rate[p]),
+                'win_rate_diff_ci': [_round(v) for v in diff_win_rate_ci[:, p]],
+                'roi_diff': _round(point_roi[p]),
+                'roi_diff_ci': [_round(v) for v in diff_roi_ci[:, p]],
+                'prob_a_better_roi': _round(prob_better[p])
+            })
+
+    return {'models': models, 'pairs': pair_results, 'n_boot': n_boot, 'ci': ci, 'games': n_games}
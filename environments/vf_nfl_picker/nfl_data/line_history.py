@@ -0,0 +1,238 @@
+"""
+Per-bookmaker line movement history with delta-only storage.
+
+Every pull is diffed against the last known line for each
+(game, bookmaker, market, outcome); only the values that changed are written.
+Files live next to the snapshot store in `data/season_<season>/`:
+- `line_history.jsonl`: one compact line per (pull, game) with its changes
+- `line_history.idx`: fixed-width binary index of (game key, offset, length)
+- `line_state.json`: latest value of every line, used to compute the next diff
+
+A game's full history is rebuilt by seeking to its own delta lines only:
+the index is loaded once into a per-game hash of offsets (and extended as
+it grows), and each delta line's full game id is checked on read.
+
+A pull saves the new state before appending its deltas, under a file lock,
+so a crash can lose that pull's history lines but never records the same
+change twice.
+"""
+
+import hashlib
+import json
+import os
+import struct
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from .locking import file_lock
+from .snapshot_store import _to_epoch
+
+# game key (16 bytes), byte offset, byte length
+HISTORY_RECORD = struct.Struct('<16sQI')
+
+MARKETS = ('spreads', 'totals')
+
+
+def _game_key(game_id: str) -> bytes:
+    """Fixed-width index key: an Odds API id (32 hex chars) packed as is, any other id hashed."""
+    if len(game_id) == 32:
+        try:
+            return bytes.fromhex(game_id)
+        except ValueError:
+            pass
+    return hashlib.blake2b(game_id.encode(), digest_size=16).digest()
+
+
+def extract_lines(game: Dict) -> Dict[tuple, list]:
+    """Flatten one raw /odds game into {(bookmaker, market, outcome): [point, price]}.
+
+    Spread outcomes are labelled 'home'/'away', total outcomes 'over'/'under'.
+    """
+    lines = {}
+    for bookmaker in game.get('bookmakers', []):
+        for market in bookmaker.get('markets', []):
+            if market['key'] not in MARKETS:
+                continue
+            for outcome in market['outcomes']:
+                if market['key'] == 'spreads':
+                    side = 'home' if outcome['name'] == game['home_team'] else 'away'
+                else:
+                    side = outcome['name'].lower()
+                lines[(bookmaker['key'], market['key'], side)] = [outcome.get('point'), outcome.get('price')]
+    return lines
+
+
+class LineHistory:
+    """Append-only, delta-encoded line history for one season."""
+
+    def __init__(self, season: int = 2025, data_dir: str = "data"):
+        self.season = season
+        self.storage_dir = os.path.join(data_dir, f"season_{season}")
+        self.log_path = os.path.join(self.storage_dir, "line_history.jsonl")
+        self.index_path = os.path.join(self.storage_dir, "line_history.idx")
+        self.state_path = os.path.join(self.storage_dir, "line_state.json")
+        self._state = None
+        # game key -> [(offset, length)], covering the first _indexed bytes of the index
+        self._offsets: Dict[bytes, List[tuple]] = defaultdict(list)
+        self._indexed = 0
+
+    def _load_state(self) -> Dict[str, Dict]:
+        """Load the latest known lines, replaying the log if the state file is missing."""
+        if self._state is not None:
+            return self._state
+
+        if os.path.exists(self.state_path):
+            with open(self.state_path, 'r') as f:
+                self._state = json.load(f)
+            return self._state
+
+        self._state = {}
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'r') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    game_state = self._state.setdefault(entry['g'], {})
+                    for book, market, side, point, price in entry['d']:
+                        key = f"{book}|{market}|{side}"
+                        if point is None and price is None:
+                            game_state.pop(key, None)
+                        else:
+                            game_state[key] = [point, price]
+        return self._state
+
+    def _save_state(self):
+        """Atomically persist the latest known lines."""
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._state, f, separators=(',', ':'))
+        os.replace(tmp_path, self.state_path)
+
+    def record(self, games: List[Dict], pull_timestamp) -> int:
+        """Diff a pull of raw /odds games against the last known lines and store the changes.
+
+        Args:
+            games: Raw games from the Odds API (with bookmakers/markets)
+            pull_timestamp: When the pull happened (ISO string, datetime or epoch)
+
+        Returns:
+            Number of changed values written
+        """
+        os.makedirs(self.storage_dir, exist_ok=True)
+        epoch = _to_epoch(pull_timestamp)
+
+        with file_lock(self.log_path):
+            # Another process may have recorded a pull since the state was loaded
+            self._state = None
+            state = self._load_state()
+
+            lines = []
+            changes = 0
+            for game in games:
+                previous = state.get(game['id'], {})
+                current = {f"{book}|{market}|{side}": value
+                           for (book, market, side), value in extract_lines(game).items()}
+
+                deltas = [key.split('|') + value for key, value in current.items()
+                          if previous.get(key) != value]
+                # Lines a book pulled since the last poll are recorded as nulls
+                deltas += [key.split('|') + [None, None] for key in previous if key not in current]
+
+                if not deltas:
+                    continue
+
+                lines.append((game['id'], json.dumps({'t': epoch, 'g': game['id'], 'd': deltas},
+                                                     separators=(',', ':')).encode() + b'\n'))
+                state[game['id']] = current
+                changes += len(deltas)
+
+            if not lines:
+                return 0
+
+            self._save_state()
+            with open(self.log_path, 'ab') as log, open(self.index_path, 'ab') as index:
+                for game_id, line in lines:
+                    offset = log.tell()
+                    log.write(line)
+                    index.write(HISTORY_RECORD.pack(_game_key(game_id), offset, len(line)))
+
+        return changes
+
+    def _game_offsets(self, game_id: str) -> List[tuple]:
+        """The (offset, length) of every delta line indexed under the game's key.
+
+        Only index records appended since the last call are read.
+        """
+        if not os.path.exists(self.index_path):
+            return []
+        size = os.path.getsize(self.index_path)
+        if size < self._indexed:
+            # Index was replaced; start over
+            self._offsets.clear()
+            self._indexed = 0
+        if size > self._indexed:
+            with open(self.index_path, 'rb') as f:
+                f.seek(self._indexed)
+                raw = f.read(size - self._indexed)
+            whole = len(raw) - len(raw) % HISTORY_RECORD.size  # Skip a record still being written
+            for game_key, offset, length in HISTORY_RECORD.iter_unpack(raw[:whole]):
+                self._offsets[game_key].append((offset, length))
+            self._indexed += whole
+        return self._offsets.get(_game_key(game_id), [])
+
+    def history(self, game_id: str) -> List[Dict]:
+        """Rebuild the full line history of one game, oldest change first.
+
+        Returns:
+            List of change events with timestamp, bookmaker, market, outcome,
+            point and price (point/price are None when a line was pulled)
+        """
+        events = []
+        if not os.path.exists(self.log_path):
+            return events
+        with open(self.log_path, 'rb') as f:
+            for offset, length in self._game_offsets(game_id):
+                f.seek(offset)
+                entry = json.loads(f.read(length))
+                if entry['g'] != game_id:
+                    continue  # Another game with the same index key
+                for book, market, side, point, price in entry['d']:
+                    events.append({
+                        'timestamp': entry['t'],
+                        'bookmaker': book,
+                        'market': market,
+                        'outcome': side,
+                        'point': point,
+                        'price': price
+                    })
+        return events
+
+    def opening_closing(self, game_id: str, as_of=None) -> Dict[tuple, Dict]:
+        """Opening and latest (closing) line per (bookmaker, market, outcome).
+
+        Args:
+            game_id: Odds API game id
+            as_of: Optional cutoff; changes after this time are ignored
+
+        Returns:
+            {(bookmaker, market, outcome): {'open': [point, price], 'close': [point, price], 'moves': n}}
+        """
+        cutoff = _to_epoch(as_of)
+        lines = defaultdict(lambda: {'open': None, 'close': None, 'moves': 0})
+        for event in self.history(game_id):
+            if event['timestamp'] > cutoff:
+                break
+            if event['point'] is None and event['price'] is None:
+                # A pulled line keeps its last posted value as the close
+                continue
+            line = lines[(event['bookmaker'], event['market'], event['outcome'])]
+            value = [event['point'], event['price']]
+            if line['open'] is None:
+                line['open'] = value
+            else:
+                line['moves'] += 1
+            line['close'] = value
+        return dict(lines)
+
+    def current(self, game_id: str) -> Optional[Dict[str, list]]:
+        """Latest known lines for a game keyed 'bookmaker|market|outcome'."""
+        return self._load_state().get(game_id)
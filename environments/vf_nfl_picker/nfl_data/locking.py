@@ -0,0 +1,27 @@
+"""
+Cross-process advisory file locks for the append-only stores and the scratchpad.
+"""
+
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path: str):
+    """Exclusive advisory lock on `<path>.lock`.
+
+    flock locks belong to the open file, so this also serializes threads
+    of the same process.
+    """
+    with open(f"{path}.lock", 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
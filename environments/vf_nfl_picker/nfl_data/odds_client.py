@@ -0,0 +1,267 @@
+"""
+Quota-aware async client for The Odds API.
+
+- One pooled keep-alive aiohttp session per client
+- Bounded concurrency with a semaphore
+- Exponential backoff with jitter on 429 and 5xx (honours Retry-After)
+- QuotaScheduler spaces requests from the x-requests-* headers so a
+  season's request budget is not used up early
+
+`base_url` can point at a local stub server for testing (see odds_stub), and
+`record_dir` (or ODDS_API_RECORD_DIR) saves every successful response so
+the stub can replay it later.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from datetime import datetime
+from itertools import product
+from typing import Dict, List, Optional, Sequence
+
+import aiohttp
+
+BASE_URL = 'https://api.the-odds-api.com/v4'
+
+# Regular season ends early January; the budget should last until then
+SEASON_END = datetime.fromisoformat('2026-01-05T08:00:00+00:00')
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class OddsApiError(Exception):
+    """Raised when a request fails permanently (non-retryable status or retries exhausted)."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Odds API error {status}: {message}")
+        self.status = status
+
+
+class QuotaScheduler:
+    """Spaces requests so the remaining quota lasts until season_end.
+
+    The Odds API reports quota in response headers:
+    - x-requests-remaining: credits left this billing period
+    - x-requests-used: credits used so far
+    - x-requests-last: cost of the last request (markets x regions)
+    """
+
+    def __init__(self, season_end: datetime = SEASON_END, reserve: int = 0,
+                 min_interval: float = 0.0, clock=time.time, sleep=asyncio.sleep):
+        """
+        Args:
+            season_end: When the budget needs to last until
+            reserve: Credits to keep in hand (e.g. for manual pulls)
+            min_interval: Lower bound on seconds between requests
+            clock/sleep: Injected for testing
+        """
+        self.season_end = season_end.timestamp()
+        self.reserve = reserve
+        self.min_interval = min_interval
+        self.remaining = None
+        self.used = None
+        self.last_cost = 1
+        self._clock = clock
+        self._sleep = sleep
+        self._last_at = float('-inf')
+
+    def update(self, headers) -> None:
+        """Record quota headers from a response."""
+        remaining = headers.get('x-requests-remaining')
+        used = headers.get('x-requests-used')
+        last = headers.get('x-requests-last')
+        if remaining is not None:
+            self.remaining = float(remaining)
+        if used is not None:
+            self.used = float(used)
+        if last is not None and float(last) > 0:
+            self.last_cost = float(last)
+
+    def interval(self) -> float:
+        """Seconds to wait between requests at the current burn rate."""
+        if self.remaining is None:
+            return self.min_interval
+
+        seconds_left = max(self.season_end - self._clock(), 0.0)
+        requests_left = (self.remaining - self.reserve) / self.last_cost
+        if requests_left <= 0:
+            return float('inf')
+        return max(self.min_interval, seconds_left / requests_left)
+
+    async def wait(self) -> None:
+        """Block until the next request slot.
+
+        The slot is claimed before sleeping (no await in between), so
+        concurrent callers queue up one interval apart without a lock.
+
+        Raises:
+            OddsApiError: if the quota (minus reserve) is exhausted
+        """
+        interval = self.interval()
+        if interval == float('inf'):
+            raise OddsApiError(429, f"Quota exhausted ({self.remaining} remaining, reserve {self.reserve})")
+        now = self._clock()
+        start = max(now, self._last_at + interval)
+        self._last_at = start
+        if start > now:
+            await self._sleep(start - now)
+
+    def stats(self) -> Dict:
+        """Current quota view for logging."""
+        return {
+            'remaining': self.remaining,
+            'used': self.used,
+            'last_cost': self.last_cost,
+            'interval_s': self.interval()
+        }
+
+
+class OddsApiClient:
+    """Async Odds API client with pooled connections, retries and quota pacing.
+
+    Usage:
+        async with OddsApiClient(api_key) as client:
+            games = await client.get_odds('americanfootball_nfl', markets='spreads,totals')
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: str = BASE_URL,
+                 max_concurrency: int = 4, max_retries: int = 5, backoff_base: float = 0.5,
+                 backoff_max: float = 30.0, timeout: float = 20.0,
+                 scheduler: Optional[QuotaScheduler] = None, record_dir: Optional[str] = None):
+        self.api_key = api_key or os.getenv('ODDS_API_KEY')
+        self.record_dir = record_dir or os.getenv('ODDS_API_RECORD_DIR')
+        self.base_url = base_url.rstrip('/')
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.scheduler = scheduler
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+        self._session = None
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Delay before the next attempt: Retry-After if given, else capped exponential with jitter."""
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return min(self.backoff_max, self.backoff_base * (2 ** attempt)) * random.uniform(0.5, 1.0)
+
+    def _record(self, path: str, params: Dict, headers, body):
+        """Save a response for replay: <record_dir>/<path>/<time>_<params hash>.json
+
+        Values are stored as strings, as they reach the stub in the query
+        string, so a recorded daysFrom=3 matches the replayed "3".
+        """
+        params = {k: str(v) for k, v in params.items() if k != 'apiKey'}
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]
+        directory = os.path.join(self.record_dir, path.strip('/').replace('/', '_'))
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{int(time.time() * 1000)}_{digest}.json"), 'w') as f:
+            json.dump({
+                'path': path,
+                'params': params,
+                'recorded_at': time.time(),
+                'headers': {k: v for k, v in headers.items() if k.lower().startswith('x-requests-')},
+                'body': body
+            }, f)
+
+    async def request(self, path: str, params: Optional[Dict] = None):
+        """GET a path under base_url and return the decoded JSON.
+
+        Raises:
+            OddsApiError: on non-retryable errors or when retries run out
+        """
+        params = {'apiKey': self.api_key, **(params or {})}
+        url = f"{self.base_url}/{path.lstrip('/')}"
+
+        for attempt in range(self.max_retries + 1):
+            if self.scheduler is not None:
+                await self.scheduler.wait()
+
+            async with self._semaphore:
+                try:
+                    async with self._session.get(url, params=params) as response:
+                        if self.scheduler is not None:
+                            self.scheduler.update(response.headers)
+
+                        if response.status == 200:
+                            body = await response.json()
+                            if self.record_dir:
+                                self._record(path, params, response.headers, body)
+                            return body
+
+                        body = await response.text()
+                        if response.status not in RETRY_STATUSES or attempt == self.max_retries:
+                            raise OddsApiError(response.status, body)
+                        delay = self._backoff(attempt, response.headers.get('Retry-After'))
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    if attempt == self.max_retries:
+                        raise OddsApiError(0, f"{type(e).__name__}: {e}") from e
+                    delay = self._backoff(attempt, None)
+
+            # Sleep outside the semaphore so other requests can proceed
+            await asyncio.sleep(delay)
+
+    async def get_odds(self, sport: str = 'americanfootball_nfl', regions: str = 'us',
+                       markets: str = 'spreads,totals', odds_format: str = 'american', **params) -> List[Dict]:
+        """Fetch the /sports/{sport}/odds endpoint."""
+        return await self.request(f"sports/{sport}/odds", {
+            'regions': regions,
+            'markets': markets,
+            'oddsFormat': odds_format,
+            **params
+        })
+
+    async def get_scores(self, sport: str = 'americanfootball_nfl', days_from: Optional[int] = 3) -> List[Dict]:
+        """Fetch the /sports/{sport}/scores endpoint (completed games from the last days_from days)."""
+        params = {'daysFrom': days_from} if days_from else {}
+        return await self.request(f"sports/{sport}/scores", params)
+
+    async def get_historical_odds(self, date: str, sport: str = 'americanfootball_nfl', regions: str = 'us',
+                                  markets: str = 'spreads,totals', odds_format: str = 'american', **params) -> Dict:
+        """Fetch the /historical/sports/{sport}/odds snapshot at or before `date` (ISO, UTC).
+
+        Returns:
+            {'timestamp', 'previous_timestamp', 'next_timestamp', 'data': games}
+        """
+        return await self.request(f"historical/sports/{sport}/odds", {
+            'date': date,
+            'regions': regions,
+            'markets': markets,
+            'oddsFormat': odds_format,
+            **params
+        })
+
+    async def get_historical_events(self, date: str, sport: str = 'americanfootball_nfl', **params) -> Dict:
+        """Fetch the /historical/sports/{sport}/events list (ids and kickoffs, no odds) at `date`."""
+        return await self.request(f"historical/sports/{sport}/events", {'date': date, **params})
+
+    async def fan_out(self, sports: Sequence[str], regions: Sequence[str] = ('us',),
+                      market_groups: Sequence[str] = ('spreads,totals',), **params) -> Dict[tuple, object]:
+        """Fetch odds for every (sport, regions, markets) combination concurrently.
+
+        Returns:
+            {(sport, regions, markets): games list, or the OddsApiError raised}
+        """
+        keys = list(product(sports, regions, market_groups))
+        results = await asyncio.gather(
+            *(self.get_odds(sport, region, markets, **params) for sport, region, markets in keys),
+            return_exceptions=True
+        )
+        return dict(zip(keys, results))
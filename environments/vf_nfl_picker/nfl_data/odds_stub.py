@@ -0,0 +1,188 @@
+"""
+Local stub of The Odds API for offline, reproducible runs.
+
+Serves responses recorded by OddsApiClient (record_dir / ODDS_API_RECORD_DIR)
+or payloads passed in directly, with optional latency and error injection
+and simulated x-requests-* quota headers. Point the client (or
+ODDS_API_BASE_URL for pull_lines.py) at `server.base_url`.
+
+    async with OddsStubServer('recordings/odds', latency_ms=50, error_rate=0.05) as server:
+        async with OddsApiClient('stub', server.base_url) as client:
+            games = await client.get_odds()
+
+A request is answered with the recording whose parameters match exactly;
+with none, it gets a 404 rather than some other request's response.
+Payloads passed in directly have no parameters and answer any request to
+their endpoint, narrowed to commenceTimeFrom/commenceTimeTo when given.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+
+def _epoch(timestamp: str) -> float:
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+
+
+def _endpoint_key(path: str) -> str:
+    """'/v4/sports/americanfootball_nfl/odds' -> 'sports_americanfootball_nfl_odds' (the recording directory name)"""
+    path = path.strip('/')
+    if path.startswith('v4/'):
+        path = path[3:]
+    return path.replace('/', '_')
+
+
+def _params_digest(params: Dict) -> str:
+    # Query values are strings; older recordings may hold numbers
+    params = {k: str(v) for k, v in params.items()}
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]
+
+
+class OddsStubServer:
+    """aiohttp server replaying recorded Odds API responses."""
+
+    def __init__(self, recordings_dir: Optional[str] = None, payloads: Optional[Dict[str, List]] = None,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 retry_after: float = 1.0, quota: int = 20000, seed: int = 0,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Args:
+            recordings_dir: Directory written by OddsApiClient(record_dir=...)
+            payloads: Responses by endpoint path served for any parameters,
+                e.g. {'sports/americanfootball_nfl/odds': games}
+            latency_ms/jitter_ms: Added delay per request (uniform jitter on top)
+            error_rate: Fraction of requests answered with 429 (Retry-After) or 503
+            retry_after: Retry-After seconds sent with injected 429s
+            quota: Starting x-requests-remaining
+            seed: Seed for jitter and error injection
+            port: 0 picks a free port
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.remaining = quota
+        self.used = 0
+        self.host = host
+        self.port = port
+        self.stats = {'requests': 0, 'served': 0, 'errors_injected': 0, 'not_found': 0}
+        self._rng = random.Random(seed)
+        self._runner = None
+
+        # endpoint key -> recordings, oldest first
+        self.recordings: Dict[str, List[Dict]] = {}
+        if recordings_dir:
+            self._load(recordings_dir)
+        for path, body in (payloads or {}).items():
+            # params None: serves any request to the endpoint (see _select)
+            self.recordings.setdefault(_endpoint_key(path), []).append({'params': None, 'body': body})
+
+    def _load(self, recordings_dir: str):
+        for endpoint in sorted(os.listdir(recordings_dir)):
+            directory = os.path.join(recordings_dir, endpoint)
+            if not os.path.isdir(directory):
+                continue
+            for name in sorted(os.listdir(directory)):
+                if name.endswith('.json'):
+                    with open(os.path.join(directory, name), 'r') as f:
+                        self.recordings.setdefault(endpoint, []).append(json.load(f))
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v4"
+
+    def _select(self, endpoint: str, params: Dict):
+        recordings = self.recordings.get(endpoint)
+        if not recordings:
+            return None
+        digest = _params_digest(params)
+        for recording in reversed(recordings):
+            if recording['params'] is not None and _params_digest(recording['params']) == digest:
+                return recording['body']
+
+        payloads = [recording for recording in recordings if recording['params'] is None]
+        if not payloads:
+            return None
+        body = payloads[-1]['body']
+        start, end = params.get('commenceTimeFrom'), params.get('commenceTimeTo')
+        if start or end:
+            lo = _epoch(start) if start else float('-inf')
+            hi = _epoch(end) if end else float('inf')
+
+            def window(games):
+                return [game for game in games if lo <= _epoch(game['commence_time']) <= hi]
+
+            # Historical endpoints wrap the games: {'timestamp': ..., 'data': [...]}
+            if isinstance(body, list):
+                body = window(body)
+            elif isinstance(body, dict) and isinstance(body.get('data'), list):
+                body = {**body, 'data': window(body['data'])}
+        if isinstance(body, dict) and 'timestamp' in body and 'date' in params:
+            # Historical payload: serve the snapshot as if taken at the requested date
+            body = {**body, 'timestamp': params['date']}
+        return body
+
+    def _cost(self, endpoint: str, params: Dict) -> int:
+        """Odds API pricing: markets x regions for /odds (10x for historical), 1 otherwise."""
+        if 'markets' not in params:
+            return 1
+        cost = len(params['markets'].split(',')) * len(params.get('regions', 'us').split(','))
+        return 10 * cost if endpoint.startswith('historical_') else cost
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.stats['requests'] += 1
+        delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.stats['errors_injected'] += 1
+            if self._rng.random() < 0.5:
+                return web.Response(status=429, text='Injected rate limit',
+                                    headers={'Retry-After': str(self.retry_after)})
+            return web.Response(status=503, text='Injected server error')
+
+        params = {k: v for k, v in request.query.items() if k != 'apiKey'}
+        endpoint = _endpoint_key(request.path)
+        body = self._select(endpoint, params)
+        if body is None:
+            self.stats['not_found'] += 1
+            return web.Response(status=404, text=f'No recording for {request.path}')
+
+        cost = self._cost(endpoint, params)
+        self.remaining = max(self.remaining - cost, 0)
+        self.used += cost
+        self.stats['served'] += 1
+        return web.json_response(body, headers={
+            'x-requests-remaining': str(self.remaining),
+            'x-requests-used': str(self.used),
+            'x-requests-last': str(cost)
+        })
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
@@ -0,0 +1,130 @@
+"""
+Typed records for processed games and line snapshots.
+
+Game and LineSnapshot are slotted classes (no per-instance __dict__), so a
+week of games costs a fraction of the memory of the equivalent dicts, and
+fields are plain attribute reads. They are what process_game_lines,
+pull_lines, the snapshot store, fetch_spreads and the environment pass
+around; to_dict() gives the JSON layout existing readers expect.
+
+On disk a snapshot is one compact JSON line with the games stored
+column-wise and a schema version:
+
+    {"v": 1, "meta": {...}, "games": {"game_id": [...], "home_team": [...], ...}}
+
+Lines written before versioning (no "v") have the same column layout and
+decode as version 1.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Union
+
+SCHEMA_VERSION = 1
+
+GAME_COLUMNS = ['game_id', 'home_team', 'away_team', 'game_time', 'bookmaker_count',
+                'home_spread', 'away_spread', 'total']
+
+
+class Game:
+    """Consensus line for one game."""
+
+    __slots__ = tuple(GAME_COLUMNS) + ('extra',)
+
+    def __init__(self, game_id: str, home_team: str, away_team: str, game_time: str,
+                 bookmaker_count: int = 0, home_spread: Optional[float] = None,
+                 away_spread: Optional[float] = None, total: Optional[float] = None,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.game_id = game_id
+        self.home_team = home_team
+        self.away_team = away_team
+        self.game_time = game_time  # ISO UTC, as the Odds API commence_time
+        self.bookmaker_count = bookmaker_count
+        self.home_spread = home_spread
+        self.away_spread = away_spread
+        self.total = total
+        self.extra = extra  # Fields beyond the standard columns (e.g. extended consensus)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Game":
+        extra = {k: v for k, v in data.items() if k not in GAME_COLUMNS}
+        return cls(*(data.get(name) for name in GAME_COLUMNS), extra=extra or None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The game dict layout pull_lines has always written."""
+        data = {name: getattr(self, name) for name in GAME_COLUMNS}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Game):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Game({self.away_team} @ {self.home_team}, {self.game_time}, spread {self.home_spread}, total {self.total})"
+
+
+def as_game(game: Union[Game, Dict]) -> Game:
+    return game if isinstance(game, Game) else Game.from_dict(game)
+
+
+class LineSnapshot:
+    """One pull of a slate: metadata plus its games."""
+
+    __slots__ = ('meta', 'games', 'version')
+
+    def __init__(self, meta: Dict[str, Any], games: List[Game], version: int = SCHEMA_VERSION):
+        self.meta = meta
+        self.games = games
+        self.version = version
+
+    @property
+    def week(self) -> int:
+        return int(self.meta['week'])
+
+    @property
+    def day(self) -> str:
+        return self.meta.get('day_filter') or 'all'
+
+    @property
+    def pull_timestamp(self) -> str:
+        return self.meta['pull_timestamp']
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LineSnapshot":
+        return cls(data['meta'], [as_game(game) for game in data['games']])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """{'meta': ..., 'games': [game dicts]}, the legacy week_N/*.json layout."""
+        return {'meta': self.meta, 'games': [game.to_dict() for game in self.games]}
+
+    def encode(self) -> bytes:
+        """One compact, column-wise JSON line (with trailing newline)."""
+        columns = {name: [getattr(game, name) for game in self.games] for name in GAME_COLUMNS}
+        extra_names = []
+        for game in self.games:
+            if game.extra:
+                extra_names.extend(key for key in game.extra if key not in extra_names)
+        for name in extra_names:
+            columns[name] = [(game.extra or {}).get(name) for game in self.games]
+
+        return json.dumps({'v': SCHEMA_VERSION, 'meta': self.meta, 'games': columns},
+                          separators=(',', ':')).encode() + b'\n'
+
+    @classmethod
+    def decode(cls, line: Union[bytes, str]) -> "LineSnapshot":
+        data = json.loads(line)
+        version = data.get('v', SCHEMA_VERSION)
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"Snapshot schema version {version} is newer than supported ({SCHEMA_VERSION})")
+
+        columns = data['games']
+        standard = [columns.get(name) or [None] * len(columns['game_id']) for name in GAME_COLUMNS]
+        games = [Game(*row) for row in zip(*standard)]
+
+        extra_names = [name for name in columns if name not in GAME_COLUMNS]
+        if extra_names:
+            for game, values in zip(games, zip(*(columns[name] for name in extra_names))):
+                game.extra = dict(zip(extra_names, values))
+        return cls(data['meta'], games, version)
@@ -0,0 +1,145 @@
+"""
+Final scores table, one per season.
+
+Scores are appended to `data/season_<season>/results.jsonl` (later rows for
+the same game supersede earlier ones) and indexed in memory by game id and
+by (home team, away team, game date), so predictions can be matched whether
+or not they carry the Odds API id.
+
+Scores come from the Odds API /scores endpoint (see OddsApiClient.get_scores)
+or from local JSON/CSV files.
+"""
+
+import csv
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+RESULT_FIELDS = ['game_id', 'home_team', 'away_team', 'game_time', 'home_score', 'away_score', 'completed']
+
+
+def _matchup_key(home_team: str, away_team: str, game_time: Optional[str]) -> tuple:
+    """Secondary key for games without an id: teams plus UTC date."""
+    return (home_team, away_team, (game_time or '')[:10])
+
+
+def normalize_score_row(row: Dict) -> Optional[Dict]:
+    """Convert an Odds API /scores entry or a flat score row into a result record.
+
+    Returns None for games that have not finished or have no scores yet.
+    """
+    if 'scores' in row:
+        # Odds API format: {"id", "home_team", "away_team", "commence_time", "completed", "scores": [{"name", "score"}]}
+        if not row.get('completed') or not row.get('scores'):
+            return None
+        by_team = {s['name']: s['score'] for s in row['scores']}
+        home_score = by_team.get(row['home_team'])
+        away_score = by_team.get(row['away_team'])
+        record = {
+            'game_id': row.get('id'),
+            'home_team': row['home_team'],
+            'away_team': row['away_team'],
+            'game_time': row.get('commence_time'),
+            'home_score': home_score,
+            'away_score': away_score,
+            'completed': True
+        }
+    else:
+        record = {field: row.get(field) for field in RESULT_FIELDS}
+        record['game_id'] = record['game_id'] or row.get('id')
+        record['game_time'] = record['game_time'] or row.get('commence_time')
+        completed = record['completed']
+        record['completed'] = completed is None or str(completed).lower() in ('1', 'true', 'yes')
+
+    if record['home_score'] in (None, '') or record['away_score'] in (None, '') or not record['completed']:
+        return None
+    record['home_score'] = int(float(record['home_score']))
+    record['away_score'] = int(float(record['away_score']))
+    return record
+
+
+def load_score_file(path: str) -> List[Dict]:
+    """Read score rows from a JSON list (Odds API /scores format or flat rows) or a CSV file."""
+    with open(path, 'r', newline='') as f:
+        if path.endswith('.csv'):
+            return list(csv.DictReader(f))
+        data = json.load(f)
+    return data if isinstance(data, list) else data.get('games', data.get('results', []))
+
+
+class ResultsTable:
+    """Append-only final scores with in-memory indexes."""
+
+    def __init__(self, season: int = 2025, data_dir: str = "data"):
+        self.season = season
+        self.storage_dir = os.path.join(data_dir, f"season_{season}")
+        self.path = os.path.join(self.storage_dir, "results.jsonl")
+        self._by_id: Dict[str, Dict] = {}
+        self._by_matchup: Dict[tuple, Dict] = {}
+        self._loaded_size = 0
+        self.refresh()
+
+    @property
+    def version(self) -> int:
+        """Changes whenever results are added (size of the results file)."""
+        return self._loaded_size
+
+    def _index(self, record: Dict):
+        if record.get('game_id'):
+            self._by_id[record['game_id']] = record
+        self._by_matchup[_matchup_key(record['home_team'], record['away_team'], record['game_time'])] = record
+
+    def refresh(self):
+        """Read rows appended since the last load (by this or another process)."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self._loaded_size)
+            chunk = f.read()
+        # Only consume complete lines
+        end = chunk.rfind(b'\n') + 1
+        for line in chunk[:end].splitlines():
+            if line.strip():
+                self._index(json.loads(line))
+        self._loaded_size += end
+
+    def get(self, game_id: Optional[str] = None, home_team: Optional[str] = None,
+            away_team: Optional[str] = None, game_time: Optional[str] = None) -> Optional[Dict]:
+        """Look up a final score by game id, falling back to teams and date."""
+        if game_id and game_id in self._by_id:
+            return self._by_id[game_id]
+        if home_team and away_team:
+            return self._by_matchup.get(_matchup_key(home_team, away_team, game_time))
+        return None
+
+    def ingest(self, rows: Iterable[Dict]) -> int:
+        """Add finished games; rows identical to what is already stored are skipped.
+
+        Returns:
+            Number of new or corrected results written
+        """
+        self.refresh()
+        new = []
+        for row in rows:
+            record = normalize_score_row(row)
+            if record is None:
+                continue
+            existing = self.get(record['game_id'], record['home_team'], record['away_team'], record['game_time'])
+            if existing is not None and all(existing.get(k) == record[k] for k in RESULT_FIELDS if record[k] is not None):
+                continue
+            new.append(record)
+
+        if new:
+            os.makedirs(self.storage_dir, exist_ok=True)
+            with open(self.path, 'a') as f:
+                for record in new:
+                    f.write(json.dumps(record, separators=(',', ':')) + '\n')
+            self.refresh()
+        return len(new)
+
+    def ingest_file(self, path: str) -> int:
+        """Ingest a local JSON or CSV score file."""
+        return self.ingest(load_score_file(path))
+
+    def __len__(self) -> int:
+        return len(self._by_matchup)
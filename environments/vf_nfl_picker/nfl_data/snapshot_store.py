@@ -0,0 +1,249 @@
+"""
+Append-only odds snapshot store, one per season.
+
+Each season lives in `data/season_<season>/` as two files:
+- `snapshots.jsonl`: one compact JSON line per pull (see records.LineSnapshot), games stored column-wise
+- `snapshots.idx`: fixed-width binary index sorted by (week, day, pull_timestamp)
+
+Looking up "latest snapshot as of T" is a binary search over the memory-mapped
+index followed by a single seek into the data file, so it never lists a
+directory or parses snapshots it does not return. Appends hold a file lock,
+so concurrent pulls cannot interleave data or index records.
+"""
+
+import json
+import mmap
+import os
+import struct
+from datetime import datetime
+from glob import glob
+from typing import Dict, List, Optional, Tuple, Union
+
+from .locking import file_lock
+from .records import GAME_COLUMNS, Game, LineSnapshot, as_game
+
+DAYS = ['all', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+DAY_CODES = {day: code for code, day in enumerate(DAYS)}
+
+# week (uint16), day code (uint8), pull timestamp (epoch seconds), byte offset, byte length
+INDEX_RECORD = struct.Struct('<HBdQI')
+
+
+def _to_epoch(timestamp) -> float:
+    """Convert an ISO string, datetime or epoch number to epoch seconds."""
+    if timestamp is None:
+        return float('inf')
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    return timestamp.timestamp()
+
+
+def _day_code(day: Optional[str]) -> int:
+    """Map a day filter ('thursday', None, 'all', ...) to its index code."""
+    day = (day or 'all').lower()
+    if day not in DAY_CODES:
+        raise ValueError(f"Unknown day filter '{day}'")
+    return DAY_CODES[day]
+
+
+def games_to_columns(games: List[Dict]) -> Dict[str, List]:
+    """Pivot a list of game dicts into a dict of column lists.
+
+    The standard GAME_COLUMNS come first; any extra fields are kept after them.
+    """
+    names = list(GAME_COLUMNS)
+    for game in games:
+        names.extend(key for key in game if key not in names)
+    return {name: [game.get(name) for game in games] for name in names}
+
+
+def columns_to_games(columns: Dict[str, List]) -> List[Dict]:
+    """Inverse of games_to_columns."""
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*(columns[name] for name in names))]
+
+
+class SnapshotStore:
+    """Append-only columnar snapshot file plus a sorted binary index."""
+
+    def __init__(self, season: int = 2025, data_dir: str = "data"):
+        self.season = season
+        self.storage_dir = os.path.join(data_dir, f"season_{season}")
+        self.data_path = os.path.join(self.storage_dir, "snapshots.jsonl")
+        self.index_path = os.path.join(self.storage_dir, "snapshots.idx")
+
+    def _read_index(self) -> List[Tuple]:
+        """Read the full index (only needed when appending out of order)."""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, 'rb') as f:
+            raw = f.read()
+        return [INDEX_RECORD.unpack_from(raw, i) for i in range(0, len(raw), INDEX_RECORD.size)]
+
+    def _last_key(self) -> Optional[Tuple]:
+        """Return the largest (week, day, timestamp) key in the index."""
+        if not os.path.exists(self.index_path):
+            return None
+        size = os.path.getsize(self.index_path)
+        if size < INDEX_RECORD.size:
+            return None
+        with open(self.index_path, 'rb') as f:
+            f.seek(size - INDEX_RECORD.size)
+            return INDEX_RECORD.unpack(f.read(INDEX_RECORD.size))[:3]
+
+    @staticmethod
+    def _search(index, week: int, day_code: int, epoch: float) -> Optional[Tuple]:
+        """Last record of the (week, day) slate with timestamp <= epoch in a mapped index."""
+        lo, hi = 0, len(index) // INDEX_RECORD.size
+        target = (week, day_code, epoch)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if INDEX_RECORD.unpack_from(index, mid * INDEX_RECORD.size)[:3] <= target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+        record = INDEX_RECORD.unpack_from(index, (lo - 1) * INDEX_RECORD.size)
+
+        # The predecessor may belong to an earlier (week, day) slate
+        if record[0] != week or record[1] != day_code:
+            return None
+        return record
+
+    def _find(self, week: int, day_codes: List[int], epoch: float) -> Optional[Tuple]:
+        """Newest record with timestamp <= epoch among the week's slates for these day codes."""
+        if not os.path.exists(self.index_path) or os.path.getsize(self.index_path) == 0:
+            return None
+
+        with open(self.index_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as index:
+                records = [self._search(index, week, code, epoch) for code in day_codes]
+        records = [record for record in records if record is not None]
+        # Ties go to the earlier day code, i.e. the full-week slate
+        return max(records, key=lambda r: (r[2], -r[1]), default=None)
+
+    def append(self, meta: Dict, games: List[Union[Game, Dict]]) -> Dict:
+        """Append one pull to the store.
+
+        Args:
+            meta: Snapshot metadata as written by pull_lines (needs week,
+                day_filter and pull_timestamp)
+            games: Game records (or game dicts)
+
+        Returns:
+            Index entry for the stored snapshot
+        """
+        os.makedirs(self.storage_dir, exist_ok=True)
+
+        week = int(meta['week'])
+        day_code = _day_code(meta.get('day_filter'))
+        epoch = _to_epoch(meta['pull_timestamp'])
+
+        line = LineSnapshot(meta, [as_game(game) for game in games]).encode()
+
+        with file_lock(self.data_path):
+            with open(self.data_path, 'ab') as f:
+                offset = f.tell()
+                f.write(line)
+
+            record = (week, day_code, epoch, offset, len(line))
+            last_key = self._last_key()
+
+            if last_key is None or last_key <= record[:3]:
+                # Normal case: pulls arrive in key order, so the index stays sorted
+                with open(self.index_path, 'ab') as f:
+                    f.write(INDEX_RECORD.pack(*record))
+            else:
+                # Rare case (backfills, imports): rewrite the small index in sorted order
+                records = sorted(self._read_index() + [record])
+                tmp_path = self.index_path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    for entry in records:
+                        f.write(INDEX_RECORD.pack(*entry))
+                os.replace(tmp_path, self.index_path)
+
+        return {'week': week, 'day': DAYS[day_code], 'pull_timestamp': epoch,
+                'offset': offset, 'length': len(line)}
+
+    def slates(self) -> List[Tuple[int, str]]:
+        """(week, day) of every slate with at least one snapshot, in index order."""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, 'rb') as f:
+            raw = f.read()
+        keys = {INDEX_RECORD.unpack_from(raw, i)[:2] for i in range(0, len(raw), INDEX_RECORD.size)}
+        return [(week, DAYS[day_code]) for week, day_code in sorted(keys)]
+
+    def contains(self, week: int, day: Optional[str], pull_timestamp) -> bool:
+        """Check whether a snapshot with exactly this key is already stored."""
+        epoch = _to_epoch(pull_timestamp)
+        record = self._find(week, [_day_code(day)], epoch)
+        return record is not None and record[2] == epoch
+
+    def latest_snapshot(self, week: int, day: Optional[str] = None, as_of=None) -> Optional[LineSnapshot]:
+        """Get the most recent snapshot for a week/day slate pulled at or before as_of.
+
+        Args:
+            week: NFL week number
+            day: Day slate ('thursday', ...; 'all' for the full-week slate).
+                None means the newest pull of the week from any slate, as
+                the per-file layout this store replaced did.
+            as_of: ISO string, datetime or epoch seconds (default: no cutoff)
+
+        Returns:
+            LineSnapshot with Game records, or None
+        """
+        day_codes = list(range(len(DAYS))) if day is None else [_day_code(day)]
+        record = self._find(week, day_codes, _to_epoch(as_of))
+        if record is None:
+            return None
+
+        with open(self.data_path, 'rb') as f:
+            f.seek(record[3])
+            return LineSnapshot.decode(f.read(record[4]))
+
+    def latest(self, week: int, day: Optional[str] = None, as_of=None) -> Optional[Dict]:
+        """latest_snapshot() as a dict with 'meta' and 'games' (list of game dicts), or None."""
+        snapshot = self.latest_snapshot(week, day, as_of)
+        return snapshot.to_dict() if snapshot is not None else None
+
+
+def import_json_snapshots(data_dir: str = "data", store: Optional[SnapshotStore] = None) -> int:
+    """One-shot import of legacy data/week_N/nfl_lines_week_*.json files.
+
+    Files already present in the store (same week, day and pull timestamp)
+    are skipped, so the import can be re-run safely.
+
+    Returns:
+        Number of snapshots imported
+    """
+    stores = {}
+    imported = 0
+
+    # Import in pull order so the index is appended rather than rewritten
+    snapshots = []
+    for path in glob(os.path.join(data_dir, "week_*", "nfl_lines_week_*.json")):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        snapshots.append((_to_epoch(data['meta']['pull_timestamp']), path, data))
+    snapshots.sort(key=lambda s: s[0])
+
+    for _, path, data in snapshots:
+        meta = data['meta']
+        season = meta.get('season', 2025)
+        if store is not None:
+            target = store
+        else:
+            target = stores.setdefault(season, SnapshotStore(season, data_dir))
+
+        if target.contains(meta['week'], meta.get('day_filter'), meta['pull_timestamp']):
+            continue
+
+        target.append(meta, data['games'])
+        imported += 1
+        print(f"Imported {os.path.basename(path)}")
+
+    return imported
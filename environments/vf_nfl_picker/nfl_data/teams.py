@@ -0,0 +1,79 @@
+"""
+NFL team names, abbreviations and aliases for matching free-text picks
+(grading) and team names in scratchpad search (tools.scratchpad_index).
+
+Keys are the full names The Odds API uses. Aliases are lowercase
+nicknames and unambiguous city names; cities shared by two teams (New
+York, Los Angeles) and the bare "LA" are left out on purpose, so a pick
+naming them matches nothing rather than the wrong team.
+"""
+
+import re
+from typing import Dict, List
+
+TEAMS = {
+    "Arizona Cardinals": ("ARI", ["cardinals", "arizona", "cards"]),
+    "Atlanta Falcons": ("ATL", ["falcons", "atlanta"]),
+    "Baltimore Ravens": ("BAL", ["ravens", "baltimore"]),
+    "Buffalo Bills": ("BUF", ["bills", "buffalo"]),
+    "Carolina Panthers": ("CAR", ["panthers", "carolina"]),
+    "Chicago Bears": ("CHI", ["bears", "chicago"]),
+    "Cincinnati Bengals": ("CIN", ["bengals", "cincinnati"]),
+    "Cleveland Browns": ("CLE", ["browns", "cleveland"]),
+    "Dallas Cowboys": ("DAL", ["cowboys", "dallas"]),
+    "Denver Broncos": ("DEN", ["broncos", "denver"]),
+    "Detroit Lions": ("DET", ["lions", "detroit"]),
+    "Green Bay Packers": ("GB", ["packers", "green bay"]),
+    "Houston Texans": ("HOU", ["texans", "houston"]),
+    "Indianapolis Colts": ("IND", ["colts", "indianapolis", "indy"]),
+    "Jacksonville Jaguars": ("JAX", ["jaguars", "jacksonville", "jags"]),
+    "Kansas City Chiefs": ("KC", ["chiefs", "kansas city"]),
+    "Las Vegas Raiders": ("LV", ["raiders", "las vegas", "vegas"]),
+    "Los Angeles Chargers": ("LAC", ["chargers", "bolts"]),
+    "Los Angeles Rams": ("LAR", ["rams"]),
+    "Miami Dolphins": ("MIA", ["dolphins", "miami"]),
+    "Minnesota Vikings": ("MIN", ["vikings", "minnesota"]),
+    "New England Patriots": ("NE", ["patriots", "pats", "new england"]),
+    "New Orleans Saints": ("NO", ["saints", "new orleans"]),
+    "New York Giants": ("NYG", ["giants"]),
+    "New York Jets": ("NYJ", ["jets"]),
+    "Philadelphia Eagles": ("PHI", ["eagles", "philadelphia", "philly"]),
+    "Pittsburgh Steelers": ("PIT", ["steelers", "pittsburgh"]),
+    "San Francisco 49ers": ("SF", ["49ers", "niners", "san francisco"]),
+    "Seattle Seahawks": ("SEA", ["seahawks", "seattle"]),
+    "Tampa Bay Buccaneers": ("TB", ["buccaneers", "bucs", "tampa bay", "tampa"]),
+    "Tennessee Titans": ("TEN", ["titans", "tennessee"]),
+    "Washington Commanders": ("WAS", ["commanders", "washington"]),
+}
+
+# Alternate abbreviations seen in other feeds
+EXTRA_ABBREVIATIONS = {"WSH": "WAS", "JAC": "JAX", "LVR": "LV", "GNB": "GB", "KAN": "KC",
+                       "NOR": "NO", "NWE": "NE", "SFO": "SF", "TAM": "TB"}
+
+
+def team_names(team: str) -> Dict[str, List[str]]:
+    """Lowercase names (full, nickname, aliases) and capitalized abbreviations of a team."""
+    names = {team.lower(), team.split()[-1].lower()}
+    abbreviations = []
+    if team in TEAMS:
+        code, aliases = TEAMS[team]
+        names.update(aliases)
+        abbreviations = [code] + [alt for alt, canonical in EXTRA_ABBREVIATIONS.items() if canonical == code]
+    return {'names': sorted(names), 'abbreviations': abbreviations}
+
+
+def names_team(pick: str, team: str) -> bool:
+    """True if the pick names the team as a whole word or phrase.
+
+    Names match case-insensitively; abbreviations only in capitals ("NE",
+    "NO"), so ordinary words are not mistaken for teams.
+    """
+    names = team_names(team)
+    lowered = pick.lower()
+    for name in names['names']:
+        if re.search(rf"(?<!\w){re.escape(name)}(?!\w)", lowered):
+            return True
+    for abbreviation in names['abbreviations']:
+        if re.search(rf"(?<!\w){abbreviation}(?!\w)", pick):
+            return True
+    return False
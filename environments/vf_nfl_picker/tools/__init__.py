@@ -1,6 +1,6 @@
 """Tools for the vf_nfl_picker environment"""
 
-from .exa_tool import search_web_exa, search_web_exa_sync
+from .exa_tool import search_web_exa, search_web_exa_sync, search_web_exa_batch
 from .scratchpad_tool import (
     read_scratchpad,
     write_scratchpad,
@@ -11,6 +11,7 @@ from .scratchpad_tool import (
 __all__ = [
     'search_web_exa',
     'search_web_exa_sync', 
+    'search_web_exa_batch',
     'read_scratchpad',
     'write_scratchpad',
     'search_scratchpad',
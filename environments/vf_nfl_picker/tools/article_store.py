@@ -0,0 +1,192 @@
+"""
+Content-addressed article store and near-duplicate collapsing for Exa results.
+
+Syndicated copies of the same story (injury reports, AP recaps) come back
+from many queries across models and weeks. Article text is stored once,
+keyed by the sha256 of its normalized text and compressed with zstd when
+the optional `zstandard` package is installed (zlib otherwise). The search
+cache then only holds references.
+
+Within one search call, results whose MinHash signatures estimate a
+Jaccard similarity above the threshold are collapsed into the first
+(best-ranked) one, which lists the others' URLs under "duplicates".
+
+Blobs no search cache entry references any more are deleted by gc(), which
+the search tool runs after cache evictions (see exa_tool).
+
+Configuration (environment variables):
+- EXA_ARTICLE_STORE: directory for article blobs (default ./cache/articles)
+- EXA_DEDUP_THRESHOLD: estimated Jaccard similarity to collapse at (default 0.8)
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_ROOT = "./cache/articles"
+DEFAULT_THRESHOLD = 0.8
+# Unreferenced blobs younger than this survive gc(): their cache entry may not be written yet
+GC_GRACE = 10 * 60
+
+NUM_PERM = 64
+SHINGLE_WORDS = 5
+_PRIME = (1 << 61) - 1
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def content_digest(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode()).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _permutations():
+    """Fixed-seed MinHash permutation coefficients (numpy is imported on first use)."""
+    import numpy as np
+    rng = np.random.RandomState(2025)
+    a = rng.randint(1, 1 << 31, size=NUM_PERM).astype(np.uint64)
+    b = rng.randint(0, 1 << 31, size=NUM_PERM).astype(np.uint64)
+    return np, a, b
+
+
+def minhash_signature(text: str):
+    """MinHash over word 5-shingles of the normalized text (a uint64 array)."""
+    np, a, b = _permutations()
+    words = normalize_text(text).split()
+    if len(words) <= SHINGLE_WORDS:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((np.outer(a, hashes) + b[:, None]) % np.uint64(_PRIME)).min(axis=1)
+
+
+def collapse_near_duplicates(results: List[Dict], threshold: Optional[float] = None) -> List[Dict]:
+    """Keep the first of each group of near-identical results.
+
+    Kept results that absorbed others get a "duplicates" list of their URLs.
+    Error entries and results without text are never collapsed.
+    """
+    if threshold is None:
+        threshold = float(os.getenv("EXA_DEDUP_THRESHOLD", DEFAULT_THRESHOLD))
+
+    kept = []
+    signatures = []
+    for result in results:
+        text = result.get("text") if "error" not in result else None
+        if not text:
+            kept.append(result)
+            signatures.append(None)
+            continue
+
+        signature = minhash_signature(text)
+        for i, other in enumerate(signatures):
+            if other is not None and (signature == other).mean() >= threshold:
+                kept[i] = {**kept[i], "duplicates": kept[i].get("duplicates", []) + [result.get("url")]}
+                break
+        else:
+            kept.append(result)
+            signatures.append(signature)
+    return kept
+
+
+class ArticleStore:
+    """Compressed article blobs on disk, addressed by normalized-content hash."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.getenv("EXA_ARTICLE_STORE", DEFAULT_ROOT)
+        self.codec = "zst" if zstandard is not None else "zlib"
+        self._local = threading.local()
+
+    def _compressor(self):
+        # zstandard contexts are not thread-safe; keep one per thread
+        ctx = getattr(self._local, "ctx", None)
+        if ctx is None:
+            ctx = (zstandard.ZstdCompressor(level=10), zstandard.ZstdDecompressor())
+            self._local.ctx = ctx
+        return ctx
+
+    def _path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest[2:]}.{codec}")
+
+    def put(self, text: str) -> str:
+        """Store text (once) and return its digest."""
+        digest = content_digest(text)
+        path = self._path(digest, self.codec)
+        if os.path.exists(path):
+            return digest
+
+        raw = text.encode()
+        blob = self._compressor()[0].compress(raw) if self.codec == "zst" else zlib.compress(raw, 6)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str) -> Optional[str]:
+        """Text for a digest, or None if it is not stored."""
+        for codec in ("zst", "zlib"):
+            path = self._path(digest, codec)
+            try:
+                with open(path, 'rb') as f:
+                    blob = f.read()
+            except FileNotFoundError:
+                continue
+            if codec == "zlib":
+                return zlib.decompress(blob).decode()
+            if zstandard is None:
+                return None
+            return self._compressor()[1].decompress(blob).decode()
+        return None
+
+    def gc(self, live: Set[str], grace: float = GC_GRACE) -> Dict:
+        """Delete blobs whose digest is not in `live` (e.g. ExaCache.references()).
+
+        Returns:
+            Number of blobs removed and bytes freed
+        """
+        removed = freed = 0
+        cutoff = time.time() - grace
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                digest, _, codec = name.partition(".")
+                if codec not in ("zst", "zlib") or os.path.basename(dirpath) + digest in live:
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                    if st.st_mtime > cutoff:
+                        continue
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue  # Collected by another process
+                removed += 1
+                freed += st.st_size
+        return {"removed": removed, "bytes": freed}
+
+    def stats(self) -> Dict:
+        """Number of stored articles and bytes on disk."""
+        count = size = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith((".zst", ".zlib")):
+                    count += 1
+                    size += os.path.getsize(os.path.join(dirpath, name))
+        return {"articles": count, "bytes": size, "codec": self.codec}
@@ -0,0 +1,250 @@
+"""
+Persistent on-disk cache for Exa search results.
+
+Backed by SQLite in WAL mode so it can be shared by the sync and async
+search paths (each thread gets its own connection) and by concurrent
+processes running rollouts. Entries expire after a TTL and the cache is
+bounded in size with least-recently-used eviction. Hits only touch memory:
+their access times and the hit/miss counters are written in one
+transaction every FLUSH_EVERY lookups or FLUSH_SECONDS (and on put/stats),
+so a read-heavy run does not pay two SQLite writes per hit.
+
+Configuration (environment variables):
+- EXA_CACHE: set to 0/false/off to disable caching
+- EXA_CACHE_PATH: SQLite file (default ./cache/exa_cache.sqlite3)
+- EXA_CACHE_TTL: seconds before an entry expires (default 12 hours)
+- EXA_CACHE_MAX_MB: size bound before LRU eviction (default 256)
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+DEFAULT_PATH = "./cache/exa_cache.sqlite3"
+DEFAULT_TTL = 12 * 60 * 60
+DEFAULT_MAX_MB = 256
+FLUSH_EVERY = 64
+FLUSH_SECONDS = 5.0
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so trivially different queries share an entry."""
+    return " ".join(query.lower().split())
+
+
+def cache_key(query: str,
+              include_domains: Optional[List[str]] = None,
+              exclude_domains: Optional[List[str]] = None,
+              category: Optional[str] = None,
+              as_of_week: Optional[int] = None,
+              season: Optional[int] = None,
+              namespace: Optional[str] = None) -> str:
+    """Stable hash of everything that changes the search results.
+
+    namespace separates entries that must never be served to each other
+    (e.g. "replay" for offline runs vs live searches, which use None).
+    """
+    fields = {
+        "q": normalize_query(query),
+        "inc": sorted(d.lower() for d in include_domains or []),
+        "exc": sorted(d.lower() for d in exclude_domains or []),
+        "cat": category,
+        "week": as_of_week
+    }
+    # Added only when set, so keys without a season (replay recordings) are unchanged
+    if season is not None:
+        fields["season"] = season
+    if namespace:
+        fields["ns"] = namespace
+    payload = json.dumps(fields, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ExaCache:
+    """SQLite-backed TTL + LRU cache of formatted Exa results."""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None, enabled: Optional[bool] = None):
+        self.path = path or os.getenv("EXA_CACHE_PATH", DEFAULT_PATH)
+        self.ttl = ttl if ttl is not None else float(os.getenv("EXA_CACHE_TTL", DEFAULT_TTL))
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("EXA_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        if enabled is None:
+            enabled = os.getenv("EXA_CACHE", "1").lower() not in ("0", "false", "off", "no")
+        self.enabled = enabled
+
+        # Per-process counters; the persisted ones in the stats table are shared
+        self.hits = 0
+        self.misses = 0
+        self.removed = 0  # Entries dropped by expiry or eviction (article GC watches this)
+        self._local = threading.local()
+
+        # Access times and counter increments not yet written (see flush)
+        self._accessed: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self._pending = 0
+        self._flushed_at = time.time()
+        self._pending_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not thread-safe)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str, key: Optional[str] = None, accessed: Optional[float] = None):
+        """Queue a counter increment (and an access time), flushing when enough are pending."""
+        with self._pending_lock:
+            self._counts[name] = self._counts.get(name, 0) + 1
+            if key is not None:
+                self._accessed[key] = accessed
+            self._pending += 1
+            due = self._pending >= FLUSH_EVERY or time.time() - self._flushed_at >= FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def _take_pending(self):
+        with self._pending_lock:
+            accessed, counts = self._accessed, self._counts
+            self._accessed, self._counts, self._pending = {}, {}, 0
+            self._flushed_at = time.time()
+        return accessed, counts
+
+    def _write_pending(self, conn: sqlite3.Connection, accessed: Dict[str, float], counts: Dict[str, int]):
+        conn.executemany("UPDATE entries SET accessed = MAX(accessed, ?) WHERE key = ?",
+                         [(ts, key) for key, ts in accessed.items()])
+        conn.executemany(
+            "INSERT INTO stats (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", list(counts.items()))
+
+    def flush(self):
+        """Write queued access times and hit/miss counts in one transaction."""
+        accessed, counts = self._take_pending()
+        if not accessed and not counts:
+            return
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._write_pending(conn, accessed, counts)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Return cached results, or None on a miss/expired entry."""
+        if not self.enabled:
+            return None
+
+        conn = self._conn()
+        now = time.time()
+        row = conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+
+        if row is None or now - row[1] > self.ttl:
+            if row is not None:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.removed += 1
+            self.misses += 1
+            self._count("misses")
+            return None
+
+        self.hits += 1
+        self._count("hits", key, now)
+        return json.loads(row[0])
+
+    def put(self, key: str, results: List[Dict]):
+        """Store results and evict least-recently-used entries past the size bound."""
+        if not self.enabled:
+            return
+        # Never cache failures
+        if any("error" in r for r in results):
+            return
+
+        value = json.dumps(results)
+        now = time.time()
+        conn = self._conn()
+        accessed, counts = self._take_pending()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Queued access times go in first so eviction sees recent hits
+            self._write_pending(conn, accessed, counts)
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now))
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop expired entries, then the least recently used until under max_bytes."""
+        self.removed += conn.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.ttl,)).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evict = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            evict.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", evict)
+        self.removed += len(evict)
+        conn.execute(
+            "INSERT INTO stats (name, value) VALUES ('evictions', ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (len(evict),))
+
+    def references(self) -> Set[str]:
+        """Article digests (text_ref) referenced by any entry, across all processes."""
+        rows = self._conn().execute(
+            "SELECT DISTINCT json_extract(result.value, '$.text_ref') "
+            "FROM entries, json_each(entries.value) AS result").fetchall()
+        return {ref for (ref,) in rows if ref}
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for this process and across all processes sharing the file."""
+        self.flush()
+        conn = self._conn()
+        shared = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "total_hits": shared.get("hits", 0),
+            "total_misses": shared.get("misses", 0),
+            "evictions": shared.get("evictions", 0),
+            "entries": entries,
+            "bytes": size
+        }
+
+    def clear(self):
+        """Remove all entries and reset counters."""
+        self._take_pending()
+        conn = self._conn()
+        conn.execute("DELETE FROM entries")
+        conn.execute("DELETE FROM stats")
+        self.hits = self.misses = 0
@@ -0,0 +1,230 @@
+"""
+Token-budgeted compression of Exa result text.
+
+Full article text is often tens of thousands of tokens per search. Before
+results reach the model each one is:
+1. stripped of navigation/boilerplate lines (menus, share buttons, cookie
+   notices, link-only lines, repeated footers); short lines and table rows
+   are kept, since injury reports are made of them
+2. split into passages and scored by query-term density (team names are
+   aliased as in scratchpad search)
+3. cut down to the best passages that fit the per-result budget, kept in
+   their original order with "[...]" marking gaps
+
+Results are processed in rank order against a per-call budget, so later
+results get whatever the earlier ones left. Each result carries a
+"compression" dict with token counts before/after and what was dropped,
+and the process-wide totals are available from compression_totals().
+
+Configuration (environment variables):
+- EXA_COMPRESS: set to 0/false/off to return full text
+- EXA_RESULT_TOKENS: budget per result (default 800)
+- EXA_CALL_TOKENS: budget per search call (default 3000)
+"""
+
+import math
+import os
+import re
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .scratchpad_index import tokenize
+from .scratchpad_tool import get_tokenizer
+
+DEFAULT_RESULT_TOKENS = 800
+DEFAULT_CALL_TOKENS = 3000
+GAP = "\n[...]\n"
+
+BOILERPLATE = re.compile(
+    r"^(advertisement|sponsored|share( this)?( on \w+)?|tweet|email|print|comments?|"
+    r"skip to (main )?content|sign (in|up)|log ?in|subscribe( now)?|newsletter|menu|search|"
+    r"read more|related( articles| stories)?|recommended( for you)?|more from .{0,40}|"
+    r"follow us.*|click here.*|watch:?|listen:?|image:? .{0,80}|photo:? .{0,80}|"
+    r"getty images|associated press|ap photo.*|cookie.*|accept( all)?( cookies)?|"
+    r"privacy policy|terms of (use|service)|all rights reserved.*|©.*|copyright.*)$",
+    re.IGNORECASE
+)
+# Lines made only of markdown links or bare URLs, optionally between separators:
+# "[NFL](/nfl) | [NBA](/nba) | [Scores](/scores)"
+LINK_ONLY = re.compile(r"^(?:[\s|•·/,-]*(?:\[[^\]]*\]\([^)]*\)|https?://\S+))+[\s|•·/,-]*$")
+REPEAT_MIN_WORDS = 4
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'])")
+
+_totals = {"calls": 0, "results": 0, "tokens_before": 0, "tokens_after": 0}
+_totals_lock = threading.Lock()
+
+
+def _enabled() -> bool:
+    return os.getenv("EXA_COMPRESS", "1").lower() not in ("0", "false", "off", "no")
+
+
+def _is_boilerplate(line: str) -> bool:
+    """Menu, share/subscribe, cookie and footer lines, and lines that are only links.
+
+    Short lines and table rows are content ("Hurts: Questionable",
+    "Jalen Hurts | QB | Knee | Questionable") and are kept.
+    """
+    return bool(BOILERPLATE.match(line) or LINK_ONLY.match(line))
+
+
+def clean_lines(text: str, stats: Dict) -> Iterator[str]:
+    """Yield content lines, dropping boilerplate and repeated menu/footer lines.
+
+    Only lines of REPEAT_MIN_WORDS or more are dropped as repeats; short
+    ones ("Questionable", "Out") legitimately recur in injury tables.
+    """
+    seen = set()
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            yield ""
+            continue
+        repeated = line in seen and len(line.split()) >= REPEAT_MIN_WORDS
+        if repeated or _is_boilerplate(line):
+            stats["boilerplate_lines_removed"] += 1
+            continue
+        seen.add(line)
+        yield line
+
+
+def passages(lines: Iterator[str], max_tokens: int, encoder) -> Iterator[Tuple[str, int]]:
+    """Group lines into paragraphs, splitting any longer than max_tokens at sentence boundaries.
+
+    Yields:
+        (passage text, token count)
+    """
+    def emit(paragraph: List[str]):
+        text = " ".join(paragraph)
+        n_tokens = len(encoder.encode(text))
+        if n_tokens <= max_tokens:
+            yield text, n_tokens
+            return
+        chunk, chunk_tokens = [], 0
+        for sentence in SENTENCE_BREAK.split(text):
+            sentence_tokens = len(encoder.encode(sentence)) + 1
+            if chunk and chunk_tokens + sentence_tokens > max_tokens:
+                yield " ".join(chunk), chunk_tokens
+                chunk, chunk_tokens = [], 0
+            chunk.append(sentence)
+            chunk_tokens += sentence_tokens
+        if chunk:
+            yield " ".join(chunk), chunk_tokens
+
+    paragraph = []
+    for line in lines:
+        if line:
+            paragraph.append(line)
+        elif paragraph:
+            yield from emit(paragraph)
+            paragraph = []
+    if paragraph:
+        yield from emit(paragraph)
+
+
+def score_passage(text: str, query_terms: set) -> float:
+    """Query-term density, dampened so long passages do not win on length alone."""
+    terms = tokenize(text)
+    if not terms or not query_terms:
+        return 0.0
+    hits = sum(1 for term in terms if term in query_terms)
+    distinct = len(query_terms.intersection(terms))
+    return (hits / math.sqrt(len(terms))) * (1 + distinct / len(query_terms))
+
+
+def compress_text(text: str, query: str, max_tokens: int, encoder=None) -> Tuple[str, Dict]:
+    """Keep the passages of text most relevant to query within max_tokens.
+
+    Returns:
+        (compressed text, metadata with tokens_before/tokens_after and what was dropped)
+    """
+    encoder = encoder or get_tokenizer()
+    stats = {"tokens_before": len(encoder.encode(text)) if text else 0, "boilerplate_lines_removed": 0}
+    query_terms = set(tokenize(query))
+
+    candidates = []
+    for i, (passage, n_tokens) in enumerate(passages(clean_lines(text, stats), max_tokens, encoder)):
+        # The lead paragraph usually states the news; give it a small edge
+        lead = 0.25 if i == 0 else 0.0
+        candidates.append((score_passage(passage, query_terms) + lead, i, passage, n_tokens))
+
+    # Best passages first, then put the kept ones back in document order
+    kept, used = [], 0
+    for score, i, passage, n_tokens in sorted(candidates, key=lambda c: (-c[0], c[1])):
+        if used + n_tokens > max_tokens:
+            continue
+        kept.append((i, passage))
+        used += n_tokens
+
+    # Nothing fits (budget smaller than the best passage): truncate that passage
+    cut = False
+    if not kept and candidates and max_tokens > 0:
+        best = max(candidates, key=lambda c: (c[0], -c[1]))
+        kept.append((best[1], encoder.decode(encoder.encode(best[2])[:max_tokens])))
+        cut = True
+
+    parts, last = [], -1
+    for i, passage in sorted(kept):
+        if i != last + 1:
+            parts.append(GAP)
+        elif parts:
+            parts.append("\n\n")
+        parts.append(passage)
+        last = i
+    if kept and last != len(candidates) - 1:
+        parts.append(GAP)
+    compressed = "".join(parts).strip()
+
+    stats.update({
+        "tokens_after": len(encoder.encode(compressed)) if compressed else 0,
+        "passages_kept": len(kept),
+        "passages_dropped": len(candidates) - len(kept),
+        "truncated": cut or len(kept) < len(candidates)
+    })
+    return compressed, stats
+
+
+def compress_results(results: List[Dict], query: str,
+                     max_tokens_per_result: Optional[int] = None,
+                     max_tokens_per_call: Optional[int] = None) -> List[Dict]:
+    """Compress the text of each result to fit per-result and per-call token budgets.
+
+    Error entries and results without text pass through unchanged. The
+    input list is not modified.
+    """
+    if not _enabled():
+        return results
+    if max_tokens_per_result is None:
+        max_tokens_per_result = int(os.getenv("EXA_RESULT_TOKENS", DEFAULT_RESULT_TOKENS))
+    if max_tokens_per_call is None:
+        max_tokens_per_call = int(os.getenv("EXA_CALL_TOKENS", DEFAULT_CALL_TOKENS))
+
+    encoder = get_tokenizer()
+    remaining = max_tokens_per_call
+    before = after = 0
+    compressed_results = []
+    for result in results:
+        if "error" in result or not result.get("text"):
+            compressed_results.append(result)
+            continue
+
+        budget = max(0, min(max_tokens_per_result, remaining))
+        text, stats = compress_text(result["text"], query, budget, encoder)
+        remaining -= stats["tokens_after"]
+        before += stats["tokens_before"]
+        after += stats["tokens_after"]
+        compressed_results.append({**result, "text": text, "compression": stats})
+
+    with _totals_lock:
+        _totals["calls"] += 1
+        _totals["results"] += len(results)
+        _totals["tokens_before"] += before
+        _totals["tokens_after"] += after
+    return compressed_results
+
+
+def compression_totals() -> Dict:
+    """Token counts before/after compression for all calls in this process."""
+    with _totals_lock:
+        totals = dict(_totals)
+    totals["saved_fraction"] = 1 - totals["tokens_after"] / totals["tokens_before"] if totals["tokens_before"] else 0.0
+    return totals
@@ -0,0 +1,104 @@
+"""
+Record/replay transports for the Exa client.
+
+Both wrap the one call exa_tool makes (`search_and_contents`), so they
+drop in for `Exa(api_key)`:
+
+- RecordingExaClient forwards to a real client and saves each response
+  to `<record_dir>/<cache key>.json`
+- ReplayExaClient serves those files with optional latency and error
+  injection and never touches the network; a query without a recording
+  raises ReplayMiss (the search returns an error, nothing is made up)
+
+exa_tool picks them from the environment: EXA_REPLAY_DIR (no API key
+needed), EXA_RECORD_DIR, EXA_REPLAY_LATENCY_MS, EXA_REPLAY_ERROR_RATE.
+"""
+
+import json
+import os
+import random
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+from .exa_cache import cache_key
+
+
+class ReplayError(Exception):
+    """Injected transport failure."""
+
+
+class ReplayMiss(ReplayError):
+    """No recording for the query."""
+
+
+def _key(params: Dict) -> str:
+    return cache_key(params["query"], params.get("include_domains"),
+                     params.get("exclude_domains"), params.get("category"))
+
+
+def _response(results: List[Dict]) -> SimpleNamespace:
+    """Shape saved results like the SDK response (`.results` of objects with attributes)."""
+    return SimpleNamespace(results=[SimpleNamespace(**result) for result in results])
+
+
+class RecordingExaClient:
+    """Pass-through client that saves every response for later replay."""
+
+    def __init__(self, client, record_dir: str):
+        self.client = client
+        self.record_dir = record_dir
+        os.makedirs(record_dir, exist_ok=True)
+
+    def search_and_contents(self, **params):
+        response = self.client.search_and_contents(**params)
+        results = [{
+            "title": result.title,
+            "url": result.url,
+            "text": result.text or "",
+            "published_date": getattr(result, "published_date", None)
+        } for result in response.results]
+
+        path = os.path.join(self.record_dir, f"{_key(params)}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"params": params, "results": results}, f)
+        os.replace(tmp_path, path)
+        return response
+
+
+class ReplayExaClient:
+    """Offline client serving recorded responses."""
+
+    def __init__(self, replay_dir: str, latency_ms: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0):
+        """
+        Args:
+            replay_dir: Directory written by RecordingExaClient
+            latency_ms: Delay added to every call (blocks, like the SDK)
+            error_rate: Fraction of calls raising ReplayError
+            seed: Seed for error injection
+        """
+        self.replay_dir = replay_dir
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self.stats = {"calls": 0, "replayed": 0, "missing": 0, "errors_injected": 0}
+
+    def search_and_contents(self, **params):
+        self.stats["calls"] += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.stats["errors_injected"] += 1
+            raise ReplayError("Injected Exa failure")
+
+        key = _key(params)
+        path = os.path.join(self.replay_dir, f"{key}.json")
+        if not os.path.exists(path):
+            self.stats["missing"] += 1
+            raise ReplayMiss(f"No recorded Exa response for '{params['query']}'")
+        with open(path, "r") as f:
+            results = json.load(f)["results"]
+        self.stats["replayed"] += 1
+        return _response(results)
@@ -4,32 +4,264 @@ Optimized for cost-effective keyword search with full text retrieval.
 """
 
 import os
-from typing import List, Dict, Optional
-from exa_py import Exa
-from dotenv import load_dotenv
+import threading
+import time
+from contextvars import ContextVar
+from typing import List, Dict, Optional, Union
 import asyncio
-from concurrent.futures import TimeoutError
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 
-load_dotenv()
+from .article_store import ArticleStore, collapse_near_duplicates
+from .exa_cache import ExaCache, cache_key
+from .exa_compress import compress_results
+from .exa_replay import RecordingExaClient, ReplayExaClient
 
-# Initialize Exa client
+# Exa client, search pool, cache and article store are created on first
+# search (see _setup), so importing the environment stays cheap: exa_py
+# and dotenv load only in runs that actually search
 exa_client = None
+_exa_lock = threading.Lock()
+
+# Dedicated, bounded pool for the blocking Exa SDK so searches never starve
+# (or get starved by) other work on the event loop's default executor
+SEARCH_TIMEOUT = 10.0
+_executor = None
+
+# Shared across rollouts and processes (SQLite); EXA_CACHE=0 disables it
+search_cache = None
+
+# Article text is stored once by content hash; cache entries hold references.
+# After cache evictions, blobs nothing references are collected, at most once
+# per EXA_ARTICLE_GC_INTERVAL seconds per process
+article_store = None
+ARTICLE_GC_INTERVAL = 60 * 60
+_gc_lock = threading.Lock()
+_gc_mark = {"removed": 0, "at": 0.0}
+
+# Exa pricing used for cost estimates: keyword search per call, text per result
+SEARCH_COST_USD = 2.50 / 1000
+TEXT_COST_USD = 1.00 / 1000
+
+# Set to a dict by callers that want per-call accounting (see tools.tracing);
+# searches run under it add to "searches", "cache_hits" and "cost_usd"
+search_info: ContextVar[Optional[Dict]] = ContextVar("exa_search_info", default=None)
+
+def _setup():
+    """Load .env and create the search pool, cache and article store (once).
+    
+    Done on first search rather than at import so .env settings
+    (EXA_MAX_WORKERS, EXA_CACHE_*, EXA_ARTICLE_STORE, ...) still apply.
+    """
+    global _executor, search_cache, article_store
+    if _executor is None:
+        with _exa_lock:
+            if _executor is None:
+                from dotenv import load_dotenv
+                load_dotenv()
+                search_cache = ExaCache()
+                article_store = ArticleStore()
+                _executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv('EXA_MAX_WORKERS', '8')),
+                    thread_name_prefix='exa-search'
+                )
+    return _executor
 
 def _init_exa():
-    """Initialize Exa client if not already initialized."""
+    """Initialize Exa client if not already initialized (thread-safe).
+    
+    EXA_REPLAY_DIR swaps in an offline replay client (no API key needed);
+    EXA_RECORD_DIR saves live responses for it.
+    """
     global exa_client
+    _setup()
     if exa_client is None:
-        api_key = os.getenv('EXA_API_KEY')
-        if not api_key:
-            return None
-        exa_client = Exa(api_key)
+        with _exa_lock:
+            if exa_client is None:
+                replay_dir = os.getenv('EXA_REPLAY_DIR')
+                if replay_dir:
+                    exa_client = ReplayExaClient(
+                        replay_dir,
+                        latency_ms=float(os.getenv('EXA_REPLAY_LATENCY_MS', '0')),
+                        error_rate=float(os.getenv('EXA_REPLAY_ERROR_RATE', '0'))
+                    )
+                    return exa_client
+                api_key = os.getenv('EXA_API_KEY')
+                if not api_key:
+                    return None
+                from exa_py import Exa  # Heavy (pulls in openai); only needed for live searches
+                client = Exa(api_key)
+                record_dir = os.getenv('EXA_RECORD_DIR')
+                exa_client = RecordingExaClient(client, record_dir) if record_dir else client
     return exa_client
 
+def _search(
+    client,
+    query: str,
+    include_domains: Optional[List[str]] = None,
+    exclude_domains: Optional[List[str]] = None,
+    category: Optional[str] = None
+) -> List[Dict]:
+    """Run one Exa search and format the results for model consumption."""
+    # Use keyword search type for cost efficiency ($2.50/1k vs $5/1k for neural)
+    search_params = {
+        "query": query,
+        "type": "keyword",  # Cost-optimized choice
+        "num_results": 5,  # Hard-coded to prevent cheating
+        "text": True,  # Get full text ($1/1k)
+        "highlights": False,  # Skip highlights (save $1/1k)
+        "summary": False  # Skip summaries (save $1/1k)
+    }
+    
+    # Add optional filters
+    if include_domains:
+        search_params["include_domains"] = include_domains
+    if exclude_domains:
+        search_params["exclude_domains"] = exclude_domains
+    if category:
+        search_params["category"] = category
+    
+    # Execute search with content retrieval
+    results = client.search_and_contents(**search_params)
+    
+    # Format results for model consumption
+    formatted_results = []
+    for result in results.results:
+        formatted_results.append({
+            "title": result.title,
+            "url": result.url,
+            "text": result.text if result.text else "",
+            "published_date": result.published_date if hasattr(result, 'published_date') else None
+        })
+    
+    return formatted_results
+
+def _store_articles(results: List[Dict]) -> List[Dict]:
+    """Move result text into the article store, leaving a text_ref in its place."""
+    stored = []
+    for result in results:
+        if result.get("text"):
+            ref = article_store.put(result["text"])
+            result = {k: v for k, v in result.items() if k != "text"}
+            result["text_ref"] = ref
+        stored.append(result)
+    return stored
+
+def _load_articles(results: List[Dict]) -> Optional[List[Dict]]:
+    """Inverse of _store_articles; None if any referenced article is missing."""
+    loaded = []
+    for result in results:
+        if "text_ref" in result:
+            text = article_store.get(result["text_ref"])
+            if text is None:
+                return None
+            result = {k: v for k, v in result.items() if k != "text_ref"}
+            result["text"] = text
+        loaded.append(result)
+    return loaded
+
+def _collect_articles():
+    """Delete article blobs no cache entry references, if the cache dropped entries since the last run."""
+    if search_cache.removed == _gc_mark["removed"]:
+        return
+    interval = float(os.getenv('EXA_ARTICLE_GC_INTERVAL', ARTICLE_GC_INTERVAL))
+    if time.time() - _gc_mark["at"] < interval or not _gc_lock.acquire(blocking=False):
+        return
+    try:
+        _gc_mark.update(removed=search_cache.removed, at=time.time())
+        article_store.gc(search_cache.references())
+    finally:
+        _gc_lock.release()
+
+def _cached_search(
+    query: str,
+    include_domains: Optional[List[str]] = None,
+    exclude_domains: Optional[List[str]] = None,
+    category: Optional[str] = None,
+    as_of_week: Optional[int] = None,
+    season: Optional[int] = None,
+    info: Optional[Dict] = None
+) -> List[Dict]:
+    """Serve a search from the shared on-disk cache, falling back to Exa.
+    
+    Near-duplicate results are collapsed before caching. The cache holds
+    references into the article store, and compression to the token
+    budget happens on the way out so budgets can change without refetching.
+    If given, info gets "cache_hit" and the estimated "cost_usd".
+    
+    Replay runs (EXA_REPLAY_DIR) look up a separate "replay" namespace and
+    never write to the cache, so recorded or missing responses cannot leak
+    into live runs and live entries are never served to replays.
+    """
+    info = {} if info is None else info
+    info.update(cache_hit=False, cost_usd=0.0)
+    _setup()
+    
+    namespace = "replay" if os.getenv('EXA_REPLAY_DIR') else None
+    key = cache_key(query, include_domains, exclude_domains, category, as_of_week, season, namespace)
+    cached = search_cache.get(key)
+    if cached is not None:
+        cached = _load_articles(cached)
+    if cached is not None:
+        info["cache_hit"] = True
+        return compress_results(cached, query)
+    
+    client = _init_exa()
+    if client is None:
+        return [{"error": "EXA_API_KEY not found in environment variables"}]
+    
+    raw = _search(client, query, include_domains, exclude_domains, category)
+    replay = isinstance(client, ReplayExaClient)
+    if not replay:
+        info["cost_usd"] = SEARCH_COST_USD + TEXT_COST_USD * len(raw)
+    results = collapse_near_duplicates(raw)
+    if search_cache.enabled and not replay:
+        search_cache.put(key, _store_articles(results))
+        _collect_articles()
+    return compress_results(results, query)
+
+def _account(info: Dict):
+    """Add one search's cache hit and cost to the caller's search_info, if set."""
+    trace = search_info.get()
+    if trace is not None:
+        trace["searches"] = trace.get("searches", 0) + 1
+        trace["cache_hits"] = trace.get("cache_hits", 0) + int(info.get("cache_hit", False))
+        trace["cost_usd"] = trace.get("cost_usd", 0.0) + info.get("cost_usd", 0.0)
+
+async def _search_async(
+    query: str,
+    include_domains: Optional[List[str]] = None,
+    exclude_domains: Optional[List[str]] = None,
+    category: Optional[str] = None,
+    as_of_week: Optional[int] = None,
+    season: Optional[int] = None,
+    timeout: float = SEARCH_TIMEOUT
+) -> List[Dict]:
+    """Run a cached search on the dedicated executor with a timeout."""
+    info = {}
+    try:
+        loop = asyncio.get_running_loop()
+        
+        # Cache hits return without touching Exa
+        future = loop.run_in_executor(
+            _setup(), _cached_search, query, include_domains, exclude_domains, category, as_of_week, season, info
+        )
+        return await asyncio.wait_for(future, timeout=timeout)
+        
+    except TimeoutError:
+        return [{"error": f"Search timeout after {timeout:g} seconds"}]
+    except Exception as e:
+        return [{"error": f"Search error: {str(e)}"}]
+    finally:
+        # The executor thread cannot see this context, so account for it here
+        _account(info)
+
 async def search_web_exa(
     query: str, 
     include_domains: Optional[List[str]] = None,
     exclude_domains: Optional[List[str]] = None,
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    as_of_week: Optional[int] = None,
+    season: Optional[int] = None
 ) -> List[Dict]:
     """Search the web using Exa's search API.
     
@@ -38,68 +270,56 @@ async def search_web_exa(
         include_domains: Optional list of domains to include in search
         exclude_domains: Optional list of domains to exclude from search
         category: Optional category filter (company, research paper, news, etc.)
+        as_of_week: NFL week the search is made for (part of the cache key)
+        season: NFL season of that week (part of the cache key)
         
     Returns:
-        List of search results with title, url, and text content
+        List of search results with title, url, and the most relevant
+        passages of the text (within a token budget, see exa_compress)
     """
-    try:
-        # Initialize client
-        client = _init_exa()
-        if client is None:
-            return [{"error": "EXA_API_KEY not found in environment variables"}]
-        
-        # Run search in executor to handle async properly
-        loop = asyncio.get_event_loop()
-        
-        def _search():
-            # Use keyword search type for cost efficiency ($2.50/1k vs $5/1k for neural)
-            search_params = {
-                "query": query,
-                "type": "keyword",  # Cost-optimized choice
-                "num_results": 5,  # Hard-coded to prevent cheating
-                "text": True,  # Get full text ($1/1k)
-                "highlights": False,  # Skip highlights (save $1/1k)
-                "summary": False  # Skip summaries (save $1/1k)
-            }
-            
-            # Add optional filters
-            if include_domains:
-                search_params["include_domains"] = include_domains
-            if exclude_domains:
-                search_params["exclude_domains"] = exclude_domains
-            if category:
-                search_params["category"] = category
-            
-            # Execute search with content retrieval
-            results = client.search_and_contents(**search_params)
-            
-            # Format results for model consumption
-            formatted_results = []
-            for result in results.results:
-                formatted_results.append({
-                    "title": result.title,
-                    "url": result.url,
-                    "text": result.text if result.text else "",
-                    "published_date": result.published_date if hasattr(result, 'published_date') else None
-                })
-            
-            return formatted_results
-        
-        # Run with timeout
-        future = loop.run_in_executor(None, _search)
-        results = await asyncio.wait_for(future, timeout=10.0)
-        return results
+    return await _search_async(query, include_domains, exclude_domains, category, as_of_week, season)
+
+async def search_web_exa_batch(
+    queries: List[Union[str, Dict]],
+    max_concurrency: int = 3,
+    timeout: float = SEARCH_TIMEOUT,
+    as_of_week: Optional[int] = None,
+    season: Optional[int] = None
+) -> List[List[Dict]]:
+    """Run several searches concurrently and return their results in order.
+    
+    Args:
+        queries: Query strings, or dicts of search_web_exa keyword arguments
+            (e.g. {"query": "...", "include_domains": [...]}); a dict may
+            also set its own "timeout"
+        max_concurrency: Maximum searches in flight at once
+        timeout: Per-query timeout in seconds, for queries that do not set one
+        as_of_week: Default NFL week for queries that do not set one
+        season: Default NFL season for queries that do not set one
         
-    except TimeoutError:
-        return [{"error": "Search timeout after 10 seconds"}]
-    except Exception as e:
-        return [{"error": f"Search error: {str(e)}"}]
+    Returns:
+        One result list per query, in the same order; a failed or timed-out
+        query gets a single error entry without affecting the others
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def _run(spec):
+        kwargs = {"query": spec} if isinstance(spec, str) else dict(spec)
+        kwargs.setdefault("as_of_week", as_of_week)
+        kwargs.setdefault("season", season)
+        kwargs.setdefault("timeout", timeout)
+        async with semaphore:
+            return await _search_async(**kwargs)
+    
+    return await asyncio.gather(*(_run(spec) for spec in queries))
 
 def search_web_exa_sync(
     query: str, 
     include_domains: Optional[List[str]] = None,
     exclude_domains: Optional[List[str]] = None,
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    as_of_week: Optional[int] = None,
+    season: Optional[int] = None
 ) -> List[Dict]:
     """Synchronous version of search_web_exa for compatibility.
     
@@ -111,52 +331,21 @@ def search_web_exa_sync(
         include_domains: Optional list of domains to include in search
         exclude_domains: Optional list of domains to exclude from search
         category: Optional category filter (company, research paper, news, etc.)
+        as_of_week: NFL week the search is made for (part of the cache key)
+        season: NFL season of that week (part of the cache key)
         
     Returns:
         List of search results with title, url, and text content
     """
+    info = {}
     try:
-        # Initialize client
-        client = _init_exa()
-        if client is None:
-            return [{"error": "EXA_API_KEY not found in environment variables"}]
-        
-        # Use keyword search type for cost efficiency
-        search_params = {
-            "query": query,
-            "type": "keyword",  # Cost-optimized choice
-            "num_results": 5,  # Hard-coded to prevent cheating
-            "text": True,  # Get full text ($1/1k)
-            "highlights": False,  # Skip highlights (save $1/1k)
-            "summary": False  # Skip summaries (save $1/1k)
-        }
-        
-        # Add optional filters
-        if include_domains:
-            search_params["include_domains"] = include_domains
-        if exclude_domains:
-            search_params["exclude_domains"] = exclude_domains
-        if category:
-            search_params["category"] = category
-        
-        # Execute search with content retrieval
-        results = client.search_and_contents(**search_params)
-        
-        # Format results for model consumption
-        formatted_results = []
-        for result in results.results:
-            formatted_results.append({
-                "title": result.title,
-                "url": result.url,
-                "text": result.text if result.text else "",
-                "published_date": result.published_date if hasattr(result, 'published_date') else None
-            })
-        
-        return formatted_results
+        return _cached_search(query, include_domains, exclude_domains, category, as_of_week, season, info)
         
     except Exception as e:
         return [{"error": f"Search error: {str(e)}"}]
+    finally:
+        _account(info)
 
 # For Verifiers ToolEnv integration, export the async version by default
 # ToolEnv can handle both sync and async functions
-search_tool = search_web_exa
\ No newline at end of file
+search_tool = search_web_exa
@@ -0,0 +1,158 @@
+"""
+Prompt rendering for reset() observations, laid out for provider prefix caching.
+
+Every rollout of the same slate gets a byte-identical prefix, followed by
+a short suffix of per-episode fields (render's `volatile` argument):
+
+    system prompt
+    scratchpad snapshot (as forked at reset)
+    the slate: games sorted by kickoff then game_id, one fixed-format line each
+    ---- end of shared prefix ----
+    per-episode fields (the environment passes units available and searches
+    per game; the rollout id is returned beside the prompt, not in it)
+
+Rendered prefixes and their token counts are memoized per (season, week,
+day, scratchpad version), where the version is a digest of the scratchpad
+text. A new line pull for the same slate re-renders instead of serving a
+stale slate.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from .scratchpad_tool import get_tokenizer
+
+GAME_HEADER = "game_id | matchup | kickoff (UTC) | home spread | total | books"
+
+
+def scratchpad_version(content: str) -> str:
+    """Short digest identifying a scratchpad snapshot."""
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def _number(value: Optional[float], signed: bool = False) -> str:
+    if value is None:
+        return "n/a"
+    return f"{value:+g}" if signed else f"{value:g}"
+
+
+def canonical_games(games: Sequence) -> List:
+    """Game records in the order the prompt lists them: kickoff, then game_id."""
+    return sorted(games, key=lambda g: (g.game_time or "", g.game_id))
+
+
+def render_games(games: Sequence) -> str:
+    """One fixed-format line per Game record (already in canonical order)."""
+    lines = [GAME_HEADER]
+    for game in games:
+        lines.append(" | ".join([
+            game.game_id,
+            f"{game.away_team} @ {game.home_team}",
+            game.game_time or "n/a",
+            f"{game.home_team} {_number(game.home_spread, signed=True)}",
+            _number(game.total),
+            str(game.bookmaker_count or 0)
+        ]))
+    return "\n".join(lines)
+
+
+class RenderedPrompt:
+    """A rendered observation prompt: the shared prefix and the per-episode suffix."""
+
+    __slots__ = ('prefix', 'suffix', 'prefix_tokens', 'prefix_hash', 'cache_hit')
+
+    def __init__(self, prefix: str, suffix: str, prefix_tokens: int, prefix_hash: str, cache_hit: bool):
+        self.prefix = prefix
+        self.suffix = suffix
+        self.prefix_tokens = prefix_tokens
+        self.prefix_hash = prefix_hash
+        self.cache_hit = cache_hit
+
+    @property
+    def text(self) -> str:
+        return self.prefix + self.suffix
+
+
+class ObservationBuilder:
+    """Renders observation prompts and memoizes the shared prefix.
+
+    One builder is shared by all environments in a process, so concurrent
+    rollouts of a slate render (and tokenize) its prefix once.
+    """
+
+    def __init__(self, system_prompt: str, max_entries: int = 64):
+        self.system_prompt = system_prompt
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._prefixes: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _render_prefix(self, week: int, day: Optional[str], scratchpad: str, games_block: str, n_games: int) -> str:
+        return (
+            f"{self.system_prompt}\n\n"
+            f"## Your Scratchpad\n{scratchpad or '(empty)'}\n\n"
+            f"## Week {week} Games ({day or 'all'}, {n_games} games)\n{games_block}\n"
+        )
+
+    def prefix(self, season: int, week: int, day: Optional[str], scratchpad: str,
+               games: Sequence) -> tuple:
+        """(prefix, token count, hash, cache hit) for a slate and scratchpad snapshot."""
+        games_block = render_games(games)
+        key = (season, week, day or 'all', scratchpad_version(scratchpad))
+        with self._lock:
+            entry = self._prefixes.get(key)
+            if entry is not None and entry[0] == games_block:
+                self._prefixes.move_to_end(key)
+                self.hits += 1
+                return entry[1], entry[2], entry[3], True
+
+        # Render and tokenize outside the lock; a concurrent miss just does it twice
+        prefix = self._render_prefix(week, day, scratchpad, games_block, len(games))
+        tokens = len(get_tokenizer().encode(prefix))
+        digest = hashlib.sha256(prefix.encode()).hexdigest()[:16]
+        with self._lock:
+            self.misses += 1
+            self._prefixes[key] = (games_block, prefix, tokens, digest)
+            self._prefixes.move_to_end(key)
+            while len(self._prefixes) > self.max_entries:
+                self._prefixes.popitem(last=False)
+        return prefix, tokens, digest, False
+
+    def prime(self, season: int, week: int, day: Optional[str], version: str, games: Sequence,
+              prefix: str, tokens: int, digest: str):
+        """Seed the memo with a prefix rendered ahead of time (nfl_data.dataset rows).
+
+        It is served to rollouts whose scratchpad snapshot has this version.
+        """
+        key = (season, week, day or 'all', version)
+        games_block = render_games(games)
+        with self._lock:
+            if key not in self._prefixes:
+                self._prefixes[key] = (games_block, prefix, tokens, digest)
+                while len(self._prefixes) > self.max_entries:
+                    self._prefixes.popitem(last=False)
+
+    def render(self, season: int, week: int, day: Optional[str], scratchpad: str,
+               games: Sequence, volatile: Optional[Dict[str, Any]] = None) -> RenderedPrompt:
+        """Render the prompt for one episode.
+
+        Args:
+            scratchpad: Scratchpad text as forked for this rollout
+            games: The slate, in canonical order (canonical_games)
+            volatile: Per-episode fields, rendered after the shared prefix
+                in the order given
+        """
+        prefix, tokens, digest, hit = self.prefix(season, week, day, scratchpad, games)
+        suffix = "\n## This Episode\n" + "".join(f"- {name}: {value}\n" for name, value in (volatile or {}).items())
+        return RenderedPrompt(prefix, suffix, tokens, digest, hit)
+
+    def clear(self):
+        with self._lock:
+            self._prefixes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'entries': len(self._prefixes), 'hits': self.hits, 'misses': self.misses}
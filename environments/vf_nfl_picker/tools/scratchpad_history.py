@@ -0,0 +1,105 @@
+"""
+Append-only edit history for scratchpads with per-week checkpoints.
+
+Every committed change is one line in `<model>.log.jsonl`:
+- {"op": "append", "week": 6, "text": "..."} for text added after the separator
+- {"op": "replace", "week": 6, "text": "..."} for a full rewrite
+
+`<model>.weeks.json` maps each week to two byte offsets into the log: the
+end of that week's last edit and the start of the replace it builds on.
+Rebuilding a week reads only that span (one replace plus the appends
+after it, so never more than the document itself) and the log grows by
+the size of each edit rather than a copy per week.
+
+Weeks are expected to be written in order; the state for week N is the
+state after the last edit of the latest recorded week <= N.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+SEPARATOR = "\n\n"
+
+
+class ScratchpadHistory:
+    """Edit log and week checkpoints for one scratchpad."""
+
+    def __init__(self, path_prefix: str):
+        """
+        Args:
+            path_prefix: Scratchpad path without extension, e.g. scratchpads/2025/default
+        """
+        self.log_path = f"{path_prefix}.log.jsonl"
+        self.weeks_path = f"{path_prefix}.weeks.json"
+
+    def _load_checkpoints(self) -> Dict:
+        if not os.path.exists(self.weeks_path):
+            return {"last_replace": None, "weeks": {}}
+        with open(self.weeks_path, 'r') as f:
+            return json.load(f)
+
+    def _save_checkpoints(self, checkpoints: Dict):
+        tmp_path = f"{self.weeks_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoints, f, separators=(',', ':'))
+        os.replace(tmp_path, self.weeks_path)
+
+    def _append_record(self, f, checkpoints: Dict, op: str, week: int, text: str):
+        offset = f.tell()
+        f.write((json.dumps({"op": op, "week": week, "text": text}) + "\n").encode())
+        if op == "replace":
+            checkpoints["last_replace"] = offset
+        checkpoints["weeks"][str(week)] = [checkpoints["last_replace"], f.tell()]
+
+    def record(self, previous: str, content: str, week: int, previous_week: int = 0):
+        """Log the change from previous to content. Caller holds the scratchpad lock.
+
+        A scratchpad that predates the log gets its current content logged
+        as a replace (under previous_week) before the first edit.
+        """
+        if content == previous:
+            return
+        checkpoints = self._load_checkpoints()
+
+        with open(self.log_path, 'ab') as f:
+            if checkpoints["last_replace"] is None and previous:
+                self._append_record(f, checkpoints, "replace", previous_week, previous)
+
+            if not previous:
+                self._append_record(f, checkpoints, "replace", week, content)
+            elif content.startswith(previous + SEPARATOR):
+                self._append_record(f, checkpoints, "append", week, content[len(previous) + len(SEPARATOR):])
+            else:
+                self._append_record(f, checkpoints, "replace", week, content)
+
+        self._save_checkpoints(checkpoints)
+
+    def weeks(self) -> List[int]:
+        """Weeks that have a checkpoint, in order."""
+        return sorted(int(w) for w in self._load_checkpoints()["weeks"])
+
+    def state_as_of(self, week: int) -> Optional[Dict]:
+        """Scratchpad data as of the end of `week`, or None if nothing was written by then."""
+        checkpoints = self._load_checkpoints()["weeks"]
+        recorded = [int(w) for w in checkpoints if int(w) <= week]
+        if not recorded:
+            return None
+
+        checkpoint_week = max(recorded)
+        start, end = checkpoints[str(checkpoint_week)]
+        with open(self.log_path, 'rb') as f:
+            f.seek(start)
+            span = f.read(end - start)
+
+        content = ""
+        for line in span.splitlines():
+            entry = json.loads(line)
+            if entry["op"] == "replace":
+                content = entry["text"]
+            elif content:
+                content = content + SEPARATOR + entry["text"]
+            else:
+                content = entry["text"]
+
+        return {"content": content, "week_updated": checkpoint_week}
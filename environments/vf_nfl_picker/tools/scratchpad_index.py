@@ -0,0 +1,198 @@
+"""
+Inverted index with BM25 ranking for scratchpad search.
+
+Scratchpads are split into sections on blank lines (writes are joined with
+"\n\n", so every append adds whole sections). The index is updated
+incrementally on append, rebuilt on replace, and persisted next to the
+scratchpad JSON so a search never has to re-tokenize the whole document.
+
+Team names are aliased to one term per team, so "Eagles", "Philadelphia",
+"Philly" and "PHI" all match each other.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from nfl_data.teams import EXTRA_ABBREVIATIONS, TEAMS  # One team table, shared with grading
+
+# Canonical team term (lowercase abbreviation) -> lowercase nicknames/cities
+TEAM_ALIASES = {code.lower(): aliases for code, aliases in TEAMS.values()}
+
+# Abbreviations only count when written in capitals ("NO", "WAS", "MIN"),
+# so ordinary words are not mistaken for teams
+TEAM_ABBREVIATIONS = {abbr.upper(): abbr for abbr in TEAM_ALIASES}
+TEAM_ABBREVIATIONS.update({alt: code.lower() for alt, code in EXTRA_ABBREVIATIONS.items()})
+
+WORD_ALIASES = {}
+PHRASE_ALIASES = {}
+for _team, _aliases in TEAM_ALIASES.items():
+    for _alias in _aliases:
+        if " " in _alias:
+            PHRASE_ALIASES[tuple(_alias.split())] = _team
+        else:
+            WORD_ALIASES[_alias] = _team
+
+STOPWORDS = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+             "it", "of", "on", "or", "the", "to", "vs", "with"}
+
+SECTION_BREAK = re.compile(r"\n\s*\n")
+WORD = re.compile(r"[A-Za-z0-9]+")
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms with team names mapped to one canonical term per team."""
+    words = WORD.findall(text)
+    terms = []
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if word in TEAM_ABBREVIATIONS:
+            terms.append("team:" + TEAM_ABBREVIATIONS[word])
+            i += 1
+            continue
+
+        lower = word.lower()
+        if i + 1 < len(words):
+            phrase = PHRASE_ALIASES.get((lower, words[i + 1].lower()))
+            if phrase:
+                terms.append("team:" + phrase)
+                i += 2
+                continue
+
+        if lower in WORD_ALIASES:
+            terms.append("team:" + WORD_ALIASES[lower])
+        elif lower not in STOPWORDS:
+            terms.append(lower)
+        i += 1
+    return terms
+
+
+def split_sections(text: str, offset: int = 0) -> List[Tuple[int, int]]:
+    """(start, end) character spans of the non-empty sections of text."""
+    spans = []
+    start = 0
+    for match in list(SECTION_BREAK.finditer(text)) + [None]:
+        end = match.start() if match else len(text)
+        chunk = text[start:end]
+        if chunk.strip():
+            lead = len(chunk) - len(chunk.lstrip())
+            trail = len(chunk.rstrip())
+            spans.append((offset + start + lead, offset + start + trail))
+        if match:
+            start = match.end()
+    return spans
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class ScratchpadIndex:
+    """Incrementally maintained BM25 index over scratchpad sections."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: JSON file to persist to; None keeps the index in memory only
+        """
+        self.path = path
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.content_hash = content_hash("")
+        self.spans: List[List[int]] = []
+        self.lengths: List[int] = []
+        self.postings: Dict[str, Dict[str, int]] = {}
+
+    def _load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.content_hash = data["content_hash"]
+            self.spans = data["spans"]
+            self.lengths = data["lengths"]
+            self.postings = data["postings"]
+        except (OSError, ValueError, KeyError):
+            # A corrupt index is rebuilt on the next search
+            self._reset()
+            self.content_hash = None
+
+    def save(self):
+        """Persist the index atomically."""
+        if self.path is None:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                "content_hash": self.content_hash,
+                "spans": self.spans,
+                "lengths": self.lengths,
+                "postings": self.postings
+            }, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def _add_sections(self, content: str, spans: List[Tuple[int, int]]):
+        for start, end in spans:
+            section_id = str(len(self.spans))
+            terms = tokenize(content[start:end])
+            self.spans.append([start, end])
+            self.lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self.postings.setdefault(term, {})[section_id] = tf
+
+    def rebuild(self, content: str):
+        """Index the whole document from scratch."""
+        self._reset()
+        self._add_sections(content, split_sections(content))
+        self.content_hash = content_hash(content)
+
+    def append(self, previous: str, content: str):
+        """Index only the sections added when `content` was produced by appending to `previous`."""
+        if self.content_hash != content_hash(previous):
+            self.rebuild(content)
+            return
+        self._add_sections(content, split_sections(content[len(previous):], len(previous)))
+        self.content_hash = content_hash(content)
+
+    def ensure(self, content: str) -> bool:
+        """Rebuild if the index does not match content (e.g. edited elsewhere). Returns True if rebuilt."""
+        if self.content_hash == content_hash(content):
+            return False
+        self.rebuild(content)
+        self.save()
+        return True
+
+    def search(self, content: str, query: str, k: int = 3) -> List[Tuple[float, str]]:
+        """Top-k (score, section text) for query, best first."""
+        self.ensure(content)
+        n = len(self.spans)
+        if n == 0:
+            return []
+
+        avg_length = sum(self.lengths) / n or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for section_id, tf in postings.items():
+                norm = K1 * (1 - B + B * self.lengths[int(section_id)] / avg_length)
+                scores[section_id] = scores.get(section_id, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+
+        # Ties go to the more recent section
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -int(item[0])))[:k]
+        return [(score, content[self.spans[int(i)][0]:self.spans[int(i)][1]]) for i, score in ranked]
@@ -1,86 +1,193 @@
 """
 Simple scratchpad tool for persistent notes across weeks.
+
+Reads and writes of the shared file hold an exclusive file lock, so
+concurrent processes cannot lose each other's edits or read a half-applied
+one. Parallel rollouts should work in
+a ScratchpadSession (ScratchpadTool.fork()) and commit it at the end of
+the episode.
 """
 
 import json
 import os
-from typing import Dict, Any
-import tiktoken
+import threading
+from typing import Dict, Any, List, Optional
+
+from nfl_data.locking import file_lock  # Shared with the odds stores
+
+from .scratchpad_history import ScratchpadHistory
+from .scratchpad_index import ScratchpadIndex
+
+SEPARATOR = "\n\n"
+
+# Appends estimate the new count from the cached one; within this many tokens
+# of the limit the content is re-counted in full so the check is exact
+RECOUNT_MARGIN = 256
+
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+
+def get_tokenizer():
+    """Shared cl100k_base encoding, loaded once per process on first use."""
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                import tiktoken  # Deferred so runs that never count tokens skip it
+                _tokenizer = tiktoken.get_encoding("cl100k_base")
+    return _tokenizer
+
+def preload_tokenizer():
+    """Start loading the encoding in a background thread (no-op once loaded).
+    
+    Lets a caller that will count tokens soon overlap the load with other
+    work; get_tokenizer() blocks until it is done.
+    """
+    if _tokenizer is None:
+        threading.Thread(target=get_tokenizer, name="tokenizer-preload", daemon=True).start()
 
 class ScratchpadTool:
-    """Persistent scratchpad for models to track insights."""
+    """Persistent scratchpad for models to track insights.
     
-    def __init__(self, model_name: str, season: int = 2025, max_tokens: int = 20000):
+    With as_of_week set, the scratchpad is rebuilt from the edit history as
+    it stood at the end of that week and is read-only.
+    """
+    
+    def __init__(self, model_name: str, season: int = 2025, max_tokens: int = 20000,
+                 as_of_week: Optional[int] = None):
         self.model_name = model_name
         self.max_tokens = max_tokens
-        self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        self.as_of_week = as_of_week
+        self.read_only = as_of_week is not None
         
         # Storage path
         self.storage_dir = f"./scratchpads/{season}"
         os.makedirs(self.storage_dir, exist_ok=True)
         self.filepath = f"{self.storage_dir}/{model_name}.json"
+        self.history = ScratchpadHistory(f"{self.storage_dir}/{model_name}")
         
         # Load existing or create new
+        self._file_state = None
         self.data = self._load()
+        
+        # Search index lives next to the scratchpad and is kept in step on write
+        # (historical views index in memory)
+        self.index = ScratchpadIndex(None if self.read_only else f"{self.storage_dir}/{model_name}.index.json")
+    
+    def _stat(self):
+        """(mtime, size) of the backing file, or None if it does not exist."""
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
     
     def _load(self) -> Dict:
         """Load scratchpad from disk."""
-        if os.path.exists(self.filepath):
+        if self.read_only:
+            data = self.history.state_as_of(self.as_of_week) or {"content": "", "week_updated": 0}
+            data["token_count"] = self._count(data["content"])
+            return data
+        
+        self._file_state = self._stat()
+        if self._file_state is not None:
             with open(self.filepath, 'r') as f:
-                return json.load(f)
-        return {"content": "", "week_updated": 0}
+                data = json.load(f)
+        else:
+            data = {"content": "", "week_updated": 0}
+        
+        # Older files have no cached count; tokenize once and keep it
+        if "token_count" not in data:
+            data["token_count"] = self._count(data["content"])
+        return data
+    
+    def _refresh(self):
+        """Reload if another process or instance changed the file since we last saw it."""
+        if not self.read_only and self._stat() != self._file_state:
+            self.data = self._load()
     
     def _save(self):
-        """Save scratchpad to disk."""
-        with open(self.filepath, 'w') as f:
+        """Save scratchpad to disk atomically (write temp file, then rename)."""
+        tmp_path = f"{self.filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.filepath)
+        self._file_state = self._stat()
+    
+    def _count(self, text: str) -> int:
+        """Token count of text."""
+        return len(get_tokenizer().encode(text)) if text else 0
+    
+    def _append_count(self, token_count: int, content: str, new_content: str) -> int:
+        """Token count after appending content: incremental, exact near the limit."""
+        estimate = token_count + self._count(SEPARATOR + content)
+        if estimate > self.max_tokens - RECOUNT_MARGIN:
+            return self._count(new_content)
+        return estimate
     
     def read(self) -> str:
         """Read the scratchpad content."""
-        return self.data["content"]
+        with file_lock(self.filepath):
+            self._refresh()
+            return self.data["content"]
     
-    def search(self, query: str) -> str:
-        """Search scratchpad for a term and return surrounding context."""
-        content = self.data["content"].lower()
-        query_lower = query.lower()
+    def search(self, query: str, k: int = 3) -> str:
+        """Search scratchpad sections, ranked by BM25 relevance to the query.
         
-        if query_lower not in content:
-            return f"No mentions of '{query}' found"
+        Multi-term queries are supported and team names are aliased
+        ("Eagles", "Philadelphia" and "PHI" match each other).
         
-        # Find and return the line containing the query + surrounding lines
-        lines = self.data["content"].split('\n')
-        matches = []
-        for i, line in enumerate(lines):
-            if query_lower in line.lower():
-                # Get context: 1 line before and after
-                start = max(0, i-1)
-                end = min(len(lines), i+2)
-                context = '\n'.join(lines[start:end])
-                matches.append(context)
+        Args:
+            query: Search terms
+            k: Maximum number of sections to return
+        
+        Returns:
+            The top-k matching sections, best first
+        """
+        # Under the lock so a concurrent write cannot swap content and index mid-search
+        with file_lock(self.filepath):
+            self._refresh()
+            matches = self.index.search(self.data["content"], query, k)
         
         if not matches:
             return f"No mentions of '{query}' found"
         
-        return f"Found {len(matches)} mention(s) of '{query}':\n\n" + "\n---\n".join(matches[:3])  # Return first 3 matches
+        sections = [text for _, text in matches]
+        return f"Found {len(sections)} matching section(s) for '{query}':\n\n" + "\n---\n".join(sections)
     
     def write(self, content: str, append: bool = True, week: int = None) -> Dict[str, Any]:
         """Write to scratchpad.
         
+        Appends only tokenize the new text plus the separator and add that to
+        the cached count, which can drift by a token or two per join from a
+        full re-tokenization. Near max_tokens, on replace, and when a session
+        commits, the full content is re-counted, so the limit is exact and
+        drift does not build up.
+        
         Args:
             content: Text to write
             append: If True, append to existing. If False, replace all.
             week: Current week number
-            
+        
         Returns:
             Status with token count
         """
-        if append and self.data["content"]:
-            new_content = self.data["content"] + "\n\n" + content
-        else:
-            new_content = content
+        if self.read_only:
+            return {"success": False, "message": f"Scratchpad is read-only (as of week {self.as_of_week})"}
         
-        # Check token limit
-        token_count = len(self.tokenizer.encode(new_content))
+        with file_lock(self.filepath):
+            self._refresh()
+            if append and self.data["content"]:
+                new_content = self.data["content"] + SEPARATOR + content
+                token_count = self._append_count(self.data["token_count"], content, new_content)
+            else:
+                new_content = content
+                token_count = self._count(content)
+            
+            return self._store(new_content, token_count, week)
+    
+    def _store(self, new_content: str, token_count: int, week: Optional[int] = None) -> Dict[str, Any]:
+        """Check the token limit, save, and update the search index. Caller holds the file lock."""
         if token_count > self.max_tokens:
             return {
                 "success": False,
@@ -89,11 +196,22 @@ class ScratchpadTool:
             }
         
         # Update and save
+        previous = self.data["content"]
+        previous_week = self.data.get("week_updated", 0)
         self.data["content"] = new_content
+        self.data["token_count"] = token_count
         if week:
             self.data["week_updated"] = week
+        self.history.record(previous, new_content, self.data["week_updated"], previous_week)
         self._save()
         
+        # Appends only index the new sections
+        if not previous or new_content.startswith(previous + SEPARATOR):
+            self.index.append(previous, new_content)
+        else:
+            self.index.rebuild(new_content)
+        self.index.save()
+        
         return {
             "success": True,
             "token_count": token_count,
@@ -102,8 +220,10 @@ class ScratchpadTool:
     
     def stats(self) -> Dict[str, Any]:
         """Get scratchpad statistics."""
-        content = self.data["content"]
-        token_count = len(self.tokenizer.encode(content)) if content else 0
+        with file_lock(self.filepath):
+            self._refresh()
+            content = self.data["content"]
+            token_count = self.data["token_count"]
         
         return {
             "model": self.model_name,
@@ -112,28 +232,194 @@ class ScratchpadTool:
             "last_week_updated": self.data.get("week_updated", 0),
             "has_content": bool(content)
         }
+    
+    def fork(self, rollout_id: Optional[str] = None) -> "ScratchpadSession":
+        """Start a copy-on-write session for one rollout."""
+        return ScratchpadSession(self, rollout_id)
+
+class ScratchpadSession:
+    """Copy-on-write view of a scratchpad for one rollout.
+    
+    Reads and writes go to a private copy and nothing touches the shared
+    file until commit(). Committing merges with whatever other rollouts
+    committed since the fork:
+    - appends are replayed on top of the current shared content
+    - a replace wins, keeping sections others appended after the fork
+    - if the shared scratchpad was itself replaced since the fork, the
+      commit reports a conflict and the session is left as it was
+    """
+    
+    def __init__(self, base: ScratchpadTool, rollout_id: Optional[str] = None):
+        self.base = base
+        self.rollout_id = rollout_id
+        self.model_name = base.model_name
+        self.max_tokens = base.max_tokens
+        
+        with file_lock(base.filepath):
+            base._refresh()
+            self.fork_content = base.data["content"]
+            self.token_count = base.data["token_count"]
+        self.content = self.fork_content
+        self.week = None
+        
+        # Edits since the fork; after a replace, self.content holds everything
+        self.appends: List[str] = []
+        self.replaced = False
+        self.committed = False
+        self.index = ScratchpadIndex()
+    
+    @property
+    def dirty(self) -> bool:
+        """True if there are edits that have not been committed."""
+        return not self.committed and (self.replaced or bool(self.appends))
+    
+    def read(self) -> str:
+        """Read this session's view of the scratchpad."""
+        return self.content
+    
+    def search(self, query: str, k: int = 3) -> str:
+        """Search this session's view, ranked like ScratchpadTool.search."""
+        matches = self.index.search(self.content, query, k)
+        if not matches:
+            return f"No mentions of '{query}' found"
+        sections = [text for _, text in matches]
+        return f"Found {len(sections)} matching section(s) for '{query}':\n\n" + "\n---\n".join(sections)
+    
+    def write(self, content: str, append: bool = True, week: int = None) -> Dict[str, Any]:
+        """Write to this session only; same arguments and result as ScratchpadTool.write."""
+        if append and self.content:
+            new_content = self.content + SEPARATOR + content
+            token_count = self.base._append_count(self.token_count, content, new_content)
+        else:
+            new_content = content
+            token_count = self.base._count(content)
+        
+        if token_count > self.max_tokens:
+            return {
+                "success": False,
+                "message": f"Exceeds {self.max_tokens} token limit ({token_count} tokens)",
+                "token_count": token_count
+            }
+        
+        if append:
+            self.appends.append(content)
+        else:
+            self.replaced = True
+            self.appends = []
+        self.content = new_content
+        self.token_count = token_count
+        self.committed = False
+        if week:
+            self.week = week
+        
+        return {
+            "success": True,
+            "token_count": token_count,
+            "tokens_remaining": self.max_tokens - token_count
+        }
+    
+    def merge(self, current: str) -> Optional[str]:
+        """This session's edits applied on top of `current` shared content, or None on conflict."""
+        if current == self.fork_content:
+            return self.content
+        if not self.replaced:
+            return SEPARATOR.join(part for part in [current] + self.appends if part)
+        if current.startswith(self.fork_content):
+            theirs = current[len(self.fork_content):].strip()
+            return SEPARATOR.join(part for part in (self.content, theirs) if part)
+        return None
+    
+    def commit(self) -> Dict[str, Any]:
+        """Merge this session into the shared scratchpad under the file lock.
+        
+        Returns:
+            ScratchpadTool.write-style status, plus "merged" when other
+            rollouts had committed since the fork
+        """
+        if not self.dirty:
+            return {"success": True, "changed": False, "token_count": self.token_count}
+        
+        base = self.base
+        if base.read_only:
+            return {"success": False, "message": f"Scratchpad is read-only (as of week {base.as_of_week})"}
+        
+        with file_lock(base.filepath):
+            base._refresh()
+            current = base.data["content"]
+            merged = self.merge(current)
+            if merged is None:
+                return {
+                    "success": False,
+                    "message": "Conflict: the scratchpad was replaced by another rollout since this session started"
+                }
+            
+            # Exact count once per episode, so session estimates never reach the file
+            token_count = base._count(merged)
+            result = base._store(merged, token_count, self.week)
+        
+        if result["success"]:
+            result["changed"] = True
+            result["merged"] = merged != self.content
+            self.fork_content = self.content = merged
+            self.token_count = token_count
+            self.appends = []
+            self.replaced = False
+            self.committed = True
+        return result
+    
+    def discard(self):
+        """Drop uncommitted edits and restart from the current shared content."""
+        self.__init__(self.base, self.rollout_id)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get session statistics."""
+        return {
+            "model": self.model_name,
+            "rollout_id": self.rollout_id,
+            "token_count": self.token_count,
+            "tokens_remaining": self.max_tokens - self.token_count,
+            "has_content": bool(self.content),
+            "uncommitted": self.dirty
+        }
+
+# Process-wide registry so tool calls reuse one instance per scratchpad
+_registry: Dict[tuple, ScratchpadTool] = {}
+_registry_lock = threading.Lock()
+
+def get_scratchpad(model_name: str = "default", season: int = 2025, max_tokens: int = 20000,
+                   as_of_week: Optional[int] = None) -> ScratchpadTool:
+    """Get the shared ScratchpadTool for (model_name, season[, as_of_week]), creating it on first use."""
+    key = (model_name, season, max_tokens, as_of_week)
+    tool = _registry.get(key)
+    if tool is None:
+        with _registry_lock:
+            tool = _registry.get(key)
+            if tool is None:
+                tool = ScratchpadTool(model_name, season, max_tokens, as_of_week)
+                _registry[key] = tool
+    return tool
 
 # Simple wrapper functions for Verifiers
 def read_scratchpad(model_name: str = "default") -> str:
     """Read scratchpad content."""
-    tool = ScratchpadTool(model_name)
+    tool = get_scratchpad(model_name)
     return tool.read()
 
 def search_scratchpad(query: str, model_name: str = "default") -> str:
-    """Search scratchpad for a term and get surrounding context.
+    """Search scratchpad notes, ranked by relevance.
     
     Args:
-        query: Term to search for
+        query: Terms to search for (team names and abbreviations both work)
         model_name: Model identifier
     
     Returns:
-        Up to 3 matches with surrounding context
+        Up to 3 most relevant sections
     """
-    tool = ScratchpadTool(model_name)
+    tool = get_scratchpad(model_name)
     return tool.search(query)
 
-def write_scratchpad(content: str, 
-                    append: bool = True, 
+def write_scratchpad(content: str,
+                    append: bool = True,
                     week: int = None,
                     model_name: str = "default") -> Dict[str, Any]:
     """Write to scratchpad.
@@ -144,10 +430,10 @@ def write_scratchpad(content: str,
         week: Current week number
         model_name: Model identifier
     """
-    tool = ScratchpadTool(model_name)
+    tool = get_scratchpad(model_name)
     return tool.write(content, append, week)
 
 def scratchpad_stats(model_name: str = "default") -> Dict[str, Any]:
     """Get scratchpad statistics."""
-    tool = ScratchpadTool(model_name)
-    return tool.stats()
\ No newline at end of file
+    tool = get_scratchpad(model_name)
+    return tool.stats()
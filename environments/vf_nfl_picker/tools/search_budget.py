@@ -0,0 +1,68 @@
+"""
+Per-game search budget for one episode.
+
+A search reserves a slot before it starts and is refunded if it fails, so
+concurrent searches for the same game cannot overspend: the check and the
+increment happen together under a lock, before any await.
+"""
+
+import threading
+from typing import Dict, Iterable, Optional
+
+
+class SearchBudget:
+    """Ledger of searches used per game, with O(1) reserve/refund."""
+
+    def __init__(self, game_ids: Iterable[str], per_game: int = 3):
+        self.per_game = per_game
+        self.used: Dict[str, int] = {game_id: 0 for game_id in game_ids}
+        self.refunded = 0
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_allowed(self) -> int:
+        return self.per_game * len(self.used)
+
+    @property
+    def total_used(self) -> int:
+        return self._total
+
+    def reserve(self, game_id: str) -> Optional[str]:
+        """Take one search for game_id.
+
+        Returns:
+            None if reserved, else an error message for the model
+        """
+        with self._lock:
+            used = self.used.get(game_id)
+            if used is None:
+                return f"Unknown game_id '{game_id}'; use a game_id from this week's games"
+            if used >= self.per_game:
+                return f"Search budget exhausted for game {game_id} ({self.per_game} searches per game)"
+            self.used[game_id] = used + 1
+            self._total += 1
+            return None
+
+    def refund(self, game_id: str):
+        """Give back a reserved search that failed."""
+        with self._lock:
+            if self.used.get(game_id, 0) > 0:
+                self.used[game_id] -= 1
+                self._total -= 1
+                self.refunded += 1
+
+    def remaining(self, game_id: str) -> int:
+        return self.per_game - self.used.get(game_id, self.per_game)
+
+    def summary(self) -> Dict:
+        """Budget usage for episode info and saved predictions."""
+        with self._lock:
+            used, total = dict(self.used), self._total
+        return {
+            "per_game": self.per_game,
+            "used": used,
+            "total_used": total,
+            "total_allowed": self.per_game * len(used),
+            "refunded": self.refunded
+        }
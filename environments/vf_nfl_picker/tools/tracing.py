@@ -0,0 +1,248 @@
+"""
+Per-episode tracing of tool calls, reset and step.
+
+Each traced call becomes one record (wall time, payload tokens, search
+cache hits and estimated Exa cost, game_id when the call names one).
+Records are buffered in memory per episode and appended to
+`traces/<season>/<model>.jsonl` once per episode, under the same file lock
+the scratchpad uses, so parallel rollouts can share a file. The current
+episode is a context variable set by start_episode, so concurrent rollouts
+on one Tracer (one asyncio task or thread each) keep separate buffers.
+
+NFL_TRACE=0 disables tracing; NFL_TRACE_DIR moves the files.
+"""
+
+import functools
+import inspect
+import json
+import os
+import time
+import threading
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .exa_tool import search_info
+from .scratchpad_tool import file_lock, get_tokenizer
+
+GROUP_FIELDS = ('model', 'season', 'week', 'day', 'game_id', 'name', 'event', 'episode')
+
+# Episode id of the rollout running in this task/thread
+current_episode: ContextVar[Optional[str]] = ContextVar('current_episode', default=None)
+
+
+def count_tokens(payload: Any) -> int:
+    """cl100k tokens of a tool argument or result (non-strings as JSON)."""
+    if payload is None:
+        return 0
+    if not isinstance(payload, str):
+        payload = json.dumps(payload, default=str)
+    return len(get_tokenizer().encode(payload)) if payload else 0
+
+
+class Tracer:
+    """Collects each episode's records and appends them to the trace file."""
+
+    def __init__(self, model_name: str, season: int = 2025, trace_dir: Optional[str] = None,
+                 enabled: Optional[bool] = None):
+        self.enabled = os.getenv('NFL_TRACE', '1') != '0' if enabled is None else enabled
+        trace_dir = trace_dir or os.getenv('NFL_TRACE_DIR', 'traces')
+        self.path = os.path.join(trace_dir, str(season), f"{model_name}.jsonl")
+        self.context = {'model': model_name, 'season': season}
+        # episode id -> (context, records); None holds calls made outside any episode
+        self._episodes: Dict[Optional[str], tuple] = {}
+        self._lock = threading.Lock()
+
+    def count_tokens(self, payload: Any) -> Optional[int]:
+        """count_tokens(payload), skipped (None) when tracing is off."""
+        return count_tokens(payload) if self.enabled else None
+
+    def start_episode(self, episode: Optional[str] = None, **context) -> str:
+        """Begin an episode in the current context, tagged with context, e.g. week/day.
+
+        An unfinished episode started earlier in the same context is flushed.
+
+        Returns:
+            The episode id (`episode`, or a new one)
+        """
+        self.flush()
+        episode = episode or uuid.uuid4().hex[:12]
+        with self._lock:
+            self._episodes[episode] = ({**self.context, **context}, [])
+        current_episode.set(episode)
+        return episode
+
+    def _buffer(self, episode: Optional[str]) -> tuple:
+        with self._lock:
+            if episode not in self._episodes:
+                self._episodes[episode] = (dict(self.context), [])
+            return self._episodes[episode]
+
+    def _emit(self, event: str, name: str, start: float, wall: float, **fields):
+        if not self.enabled:
+            return
+        episode = current_episode.get()
+        context, records = self._buffer(episode)
+        record = {'episode': episode, **context, 'event': event, 'name': name,
+                  'ts': round(start, 3), 'wall_ms': round(wall * 1000, 3)}
+        record.update((k, v) for k, v in fields.items() if v is not None)
+        records.append(record)
+
+    @contextmanager
+    def span(self, event: str, name: Optional[str] = None):
+        """Time a block; the yielded dict collects extra fields (tokens_in, cost_usd, ...)."""
+        fields: Dict[str, Any] = {}
+        start, clock = time.time(), time.perf_counter()
+        try:
+            yield fields
+        except Exception as e:
+            fields['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._emit(event, name or event, start, time.perf_counter() - clock, **fields)
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        """Trace every call of a tool; keeps its signature for tool schemas.
+
+        Results that are awaitable are timed when awaited.
+        """
+        if not self.enabled:
+            return fn
+
+        def begin(kwargs):
+            info = {}
+            token = search_info.set(info)
+            fields = {'game_id': kwargs.get('game_id'), 'tokens_in': count_tokens(kwargs) if kwargs else 0}
+            return info, token, fields, time.time(), time.perf_counter()
+
+        def finish(result, info, fields, start, clock, error=None):
+            wall = time.perf_counter() - clock
+            fields['tokens_out'] = count_tokens(result)
+            if info:
+                fields.update(searches=info.get('searches'), cache_hits=info.get('cache_hits'),
+                              cost_usd=round(info.get('cost_usd', 0.0), 6))
+            self._emit('tool', name, start, wall, error=error, **fields)
+
+        async def await_result(awaitable, info, fields, start, clock):
+            # A fresh context var value so concurrent calls keep separate accounting
+            token = search_info.set(info)
+            try:
+                result = await awaitable
+            except Exception as e:
+                finish(None, info, fields, start, clock, f"{type(e).__name__}: {e}")
+                raise
+            finally:
+                search_info.reset(token)
+            finish(result, info, fields, start, clock)
+            return result
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def traced_async(*args, **kwargs):
+                info, token, fields, start, clock = begin(kwargs)
+                try:
+                    return await await_result(fn(*args, **kwargs), info, fields, start, clock)
+                finally:
+                    search_info.reset(token)
+            return traced_async
+
+        @functools.wraps(fn)
+        def traced(*args, **kwargs):
+            info, token, fields, start, clock = begin(kwargs)
+            if args:
+                fields['tokens_in'] += count_tokens(list(args))
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                finish(None, info, fields, start, clock, f"{type(e).__name__}: {e}")
+                raise
+            finally:
+                search_info.reset(token)
+            if inspect.isawaitable(result):
+                return await_result(result, info, fields, start, clock)
+            finish(result, info, fields, start, clock)
+            return result
+        return traced
+
+    def episode_totals(self, episode: Optional[str] = None) -> Dict[str, Any]:
+        """Wall time, tokens and cost of the tool calls recorded so far in an episode.
+
+        Args:
+            episode: Episode id (default: the current context's)
+        """
+        with self._lock:
+            _, records = self._episodes.get(episode or current_episode.get(), (None, []))
+            tools = [r for r in records if r['event'] == 'tool']
+        return {
+            'tool_calls': len(tools),
+            'tool_ms': round(sum(r['wall_ms'] for r in tools), 3),
+            'searches': sum(r.get('searches', 0) for r in tools),
+            'cache_hits': sum(r.get('cache_hits', 0) for r in tools),
+            'cost_usd': round(sum(r.get('cost_usd', 0.0) for r in tools), 6)
+        }
+
+    def flush(self, episode: Optional[str] = None):
+        """Append an episode's buffered records to the trace file in one write and drop them.
+
+        Args:
+            episode: Episode id (default: the current context's)
+        """
+        with self._lock:
+            _, records = self._episodes.pop(episode or current_episode.get(), (None, []))
+        if not records:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lines = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+        with file_lock(self.path):
+            with open(self.path, 'a') as f:
+                f.write(lines)
+
+
+def load_traces(paths: Iterable[str]) -> List[Dict]:
+    """Read trace records from JSONL files."""
+    records = []
+    for path in paths:
+        with open(path, 'r') as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    return records
+
+
+def summarize(records: List[Dict], by: List[str]) -> List[Dict]:
+    """p50/p95 latency, tokens, cache hits and cost per group of records.
+
+    Args:
+        records: Trace records (load_traces)
+        by: Fields to group on, from GROUP_FIELDS
+
+    Returns:
+        One row per group, sorted by group key
+    """
+    import numpy as np  # Offline reporting only; keeps the environment import light
+
+    groups = defaultdict(list)
+    for record in records:
+        groups[tuple(record.get(field) for field in by)].append(record)
+
+    rows = []
+    for key, group in sorted(groups.items(), key=lambda item: tuple(str(v) for v in item[0])):
+        wall = np.array([r['wall_ms'] for r in group])
+        searches = sum(r.get('searches', 0) for r in group)
+        cost = sum(r.get('cost_usd', 0.0) for r in group)
+        episodes = len({r['episode'] for r in group})
+        rows.append({
+            **dict(zip(by, key)),
+            'calls': len(group),
+            'episodes': episodes,
+            'errors': sum(1 for r in group if 'error' in r),
+            'p50_ms': round(float(np.percentile(wall, 50)), 3),
+            'p95_ms': round(float(np.percentile(wall, 95)), 3),
+            'tokens_in': sum(r.get('tokens_in', 0) for r in group),
+            'tokens_out': sum(r.get('tokens_out', 0) for r in group),
+            'searches': searches,
+            'cache_hit_rate': round(sum(r.get('cache_hits', 0) for r in group) / searches, 3) if searches else None,
+            'cost_usd': round(cost, 4),
+            'cost_per_episode': round(cost / episodes, 4) if episodes else None
+        })
+    return rows
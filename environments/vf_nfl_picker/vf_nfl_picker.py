@@ -1,11 +1,17 @@
 import verifiers as vf
 import os
 import json
-from glob import glob
+import uuid
+from contextvars import ContextVar
 from datetime import datetime
+from typing import Dict, List, Optional
 
+from nfl_data.snapshot_store import SnapshotStore
 from tools.exa_tool import search_web_exa
-from tools.scratchpad_tool import read_scratchpad, write_scratchpad
+from tools.observation import ObservationBuilder, canonical_games
+from tools.scratchpad_tool import get_scratchpad, preload_tokenizer
+from tools.search_budget import SearchBudget
+from tools.tracing import Tracer, current_episode
 
 
 system_prompt = """You are an expert NFL analyst tasked with predicting games against the spread.
@@ -17,7 +23,7 @@ For each NFL game, you must:
 3. Provide clear reasoning for your picks
 
 ## Resources Available
-- **Web Search**: 3 searches per game via search_web_exa(). Use strategically for:
+- **Web Search**: 3 searches per game via search_web_exa(query, game_id). Use strategically for:
   - Current injury reports and inactive lists
   - Recent team performance and trends
   - Weather forecasts for outdoor games
@@ -41,97 +47,238 @@ For each NFL game, you must:
 
 Remember: Going 9-7 (56%) against the spread is outstanding. Focus on finding edges through smart research and pattern recognition."""
 
-def fetch_spreads(week_number, day=None):
+SEARCHES_PER_GAME = 3
+
+# Shared by every environment in the process: rollouts of the same slate and
+# scratchpad snapshot reuse one rendered (and token-counted) prompt prefix
+observation_builder = ObservationBuilder(system_prompt)
+
+# Rollout id of the episode running in this task/thread, set by reset()
+current_rollout: ContextVar[Optional[str]] = ContextVar('current_rollout', default=None)
+
+def fetch_spreads(week_number, day=None, season=2025, as_of=None):
     """
-    Fetch spreads from saved JSON files instead of API.
+    Fetch spreads from the season snapshot store instead of API.
     
     Args:
         week_number: NFL week number (1-18)
-        day: Optional day filter ('thursday', 'sunday', 'monday', etc.)
+        day: Optional day filter ('thursday', 'sunday', 'monday', etc.);
+            without one, the newest pull of the week from any slate
+        season: NFL season year
+        as_of: Optional cutoff (ISO string or datetime); the latest snapshot
+            pulled at or before this time is used. Defaults to the newest.
     
     Returns:
-        List of game dictionaries with spreads
+        List of Game records with spreads (Game.to_dict() for the JSON layout)
     """
-    # Look for saved files in the week directory
-    week_dir = f"data/week_{week_number}"
-    
-    if not os.path.exists(week_dir):
-        raise FileNotFoundError(f"No data found for week {week_number}. Run pull_lines.py first!")
+    store = SnapshotStore(season)
+    snapshot = store.latest_snapshot(week_number, day, as_of=as_of)
     
-    # Build file pattern based on day filter
-    if day:
-        pattern = f"nfl_lines_week_{week_number}_{day}_*.json"
-    else:
-        pattern = f"nfl_lines_week_{week_number}_*.json"
-    
-    # Find matching files
-    files = glob(os.path.join(week_dir, pattern))
-    
-    if not files:
+    if snapshot is None:
         if day:
-            raise FileNotFoundError(f"No {day} data found for week {week_number}")
+            raise FileNotFoundError(f"No {day} data found for week {week_number}. Run pull_lines.py first!")
         else:
-            raise FileNotFoundError(f"No data found for week {week_number}")
-    
-    # Get the most recent file (based on timestamp in filename)
-    latest_file = sorted(files)[-1]
-    
-    # Load the JSON data
-    with open(latest_file, 'r') as f:
-        data = json.load(f)
+            raise FileNotFoundError(f"No data found for week {week_number}. Run pull_lines.py first!")
     
     # Return just the games array
-    games = data['games']
+    games = snapshot.games
     
-    print(f"Loaded {len(games)} games from {os.path.basename(latest_file)}")
+    print(f"Loaded {len(games)} games from snapshot pulled {snapshot.pull_timestamp}")
     
     return games
+
+class Rollout:
+    """State of one rollout: its slate, search budget and scratchpad session."""
+    
+    def __init__(self, rollout_id: str, games: List, budget: SearchBudget, scratchpad):
+        self.rollout_id = rollout_id
+        self.games = games
+        self.budget = budget
+        self.scratchpad = scratchpad
+
 class NFLPickerEnvironment(vf.ToolEnvironment):
-    def __init__(self, week_number=None, day=None, season=2025):
+    def __init__(self, week_number=None, day=None, season=2025, model_name="default", dataset_path=None):
         super().__init__()
         
+        # .env settings (NFL_TRACE, EXA_*) apply from construction on, not just from the first search
+        from dotenv import load_dotenv
+        load_dotenv()
+        
+        # Latency, tokens and search cost of every tool call, reset and step (NFL_TRACE=0 disables)
+        self.tracer = Tracer(model_name, season)
+        
         # Register tools
-        self.register_tool("search_web_exa", self.search_with_budget)  # Wrap to track usage
-        self.register_tool("read_scratchpad", read_scratchpad)
-        self.register_tool("write_scratchpad", write_scratchpad)
+        self.register_tool("search_web_exa", self.tracer.wrap("search_web_exa", self.search_with_budget))  # Wrap to track usage
+        self.register_tool("read_scratchpad", self.tracer.wrap("read_scratchpad", self.read_scratchpad))  # Per-rollout copy-on-write
+        self.register_tool("write_scratchpad", self.tracer.wrap("write_scratchpad", self.write_scratchpad))
         
         self.week_number = week_number
         self.day = day
         self.season = season
-        self.searches_used = {}  # Track per game
-        self.games = []  # Store games from reset
+        self.model_name = model_name  # Scratchpad owner; recorded with predictions for grading
+        # Rollouts in progress by id. Parallel rollouts share this instance, so the
+        # slate, search budget and scratchpad session live here, not on self;
+        # tools find theirs through current_rollout
+        self.rollouts: Dict[str, Rollout] = {}
+        
+        # Prebuilt slates and prompts (build_dataset.py), memory-mapped and shared by workers;
+        # without one, reset reads the snapshot store
+        self.dataset = None
+        if dataset_path:
+            from nfl_data.dataset import EvalDataset  # pyarrow is only needed with a dataset
+            self.dataset = EvalDataset(dataset_path)
 
-    def search_with_budget(self, query, **kwargs):
-        """Wrapper to enforce search budget."""
-        total_allowed = len(self.games) * 3
-        total_used = sum(self.searches_used.values())
+    async def search_with_budget(
+        self,
+        query: str,
+        game_id: str,
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
+        category: Optional[str] = None
+    ):
+        """Search the web for one game, counted against that game's 3 searches.
         
-        if total_used >= total_allowed:
-            return {"error": f"Search budget exhausted ({total_allowed} searches for {len(self.games)} games)"}
+        Args:
+            query: Search query string
+            game_id: The game this search is for (game_id from the games list)
+            include_domains: Optional list of domains to include in search
+            exclude_domains: Optional list of domains to exclude from search
+            category: Optional category filter (news, etc.)
+        """
+        # Reserve before awaiting so concurrent searches cannot overspend
+        budget = self._rollout().budget
+        error = budget.reserve(game_id)
+        if error:
+            return {"error": error}
         
-        # Track usage (you'd need game context here - simplified for now)
-        result = search_web_exa(query, **kwargs)
-        # Increment counter
-        return result
+        results = await search_web_exa(query, include_domains, exclude_domains, category,
+                                       as_of_week=self.week_number, season=self.season)  # Cached per season and week
+        
+        # Failed searches (timeouts, API errors) do not use up the budget
+        if len(results) == 1 and "error" in results[0]:
+            budget.refund(game_id)
+        return results
 
-    def reset(self):
-        ''' Called at the start of evaluation.'''
+    def _rollout(self, rollout_id: Optional[str] = None) -> Rollout:
+        """The rollout with this id, or the one reset() started in the current task/thread."""
+        rollout_id = rollout_id or current_rollout.get()
+        rollout = self.rollouts.get(rollout_id) if rollout_id else None
+        if rollout is None:
+            raise RuntimeError("No rollout in progress; call reset() first")
+        return rollout
+
+    def _session(self):
+        return self._rollout().scratchpad
+
+    def read_scratchpad(self) -> str:
+        """Read scratchpad content."""
+        return self._session().read()
+
+    def write_scratchpad(self, content: str, append: bool = True, week: int = None):
+        """Write to scratchpad.
+        
+        Args:
+            content: Text to write
+            append: If True, append. If False, replace all.
+            week: Current week number
+        """
+        return self._session().write(content, append, week or self.week_number)
+
+    def _dataset_slate(self):
+        """This slate's games from the dataset; its prebuilt prompt prefix seeds the builder."""
+        i = self.dataset.lookup(self.season, self.week_number, self.day)
+        if i is None:
+            raise FileNotFoundError(f"Week {self.week_number} ({self.day or 'all'}) of {self.season} "
+                                    f"is not in {self.dataset.path}. Rebuild it with build_dataset.py")
+        games = self.dataset.games(i)
+        row = self.dataset.row(i, ['day', 'scratchpad_version', 'prompt', 'prompt_tokens', 'prompt_hash'])
+        # With day=None the row may be a day slate, whose prefix names that day
+        if row['day'] == (self.day or 'all'):
+            observation_builder.prime(self.season, self.week_number, self.day, row['scratchpad_version'], games,
+                                      row['prompt'], row['prompt_tokens'], row['prompt_hash'])
+        return games
 
-        games = fetch_spreads(self.week_number, self.day)
+    def reset(self):
+        ''' Called at the start of evaluation, once per rollout.
+        
+        Starts a rollout in the current task/thread (replacing one that this
+        context left unfinished); its id is returned as observation["rollout_id"].
+        '''
 
-        return {
-            "games": games,
-            "week": self.week_number,
-            "units_available": 50,
-            "searches_per_game": 3
-        }
+        # The episode will count tokens (scratchpad writes, search compression);
+        # load the encoding alongside reset instead of on the first tool call
+        preload_tokenizer()
+        previous = current_rollout.get()
+        if previous is not None:
+            self.rollouts.pop(previous, None)
+        rollout_id = self.tracer.start_episode(uuid.uuid4().hex[:12], week=self.week_number, day=self.day)
+        with self.tracer.span("reset") as span:
+            # Each rollout edits its own copy; step() merges it back
+            scratchpad = get_scratchpad(self.model_name, self.season).fork(rollout_id)
+            if self.dataset is not None:
+                games = self._dataset_slate()
+            else:
+                games = canonical_games(fetch_spreads(self.week_number, self.day, self.season))
+            budget = SearchBudget([game.game_id for game in games], SEARCHES_PER_GAME)
+            self.rollouts[rollout_id] = Rollout(rollout_id, games, budget, scratchpad)
+            current_rollout.set(rollout_id)
+            
+            # Stable prefix (system prompt, scratchpad, slate) first so providers
+            # can cache it across rollouts; per-episode fields go last
+            prompt = observation_builder.render(
+                self.season, self.week_number, self.day, scratchpad.fork_content, games,
+                volatile={"Units available": 50, "Searches per game": SEARCHES_PER_GAME}
+            )
+            observation = {
+                "rollout_id": rollout_id,
+                "prompt": prompt.text,
+                "games": [game.to_dict() for game in games],
+                "week": self.week_number,
+                "units_available": 50,
+                "searches_per_game": SEARCHES_PER_GAME,
+                "prefix_tokens": prompt.prefix_tokens,
+                "prefix_hash": prompt.prefix_hash
+            }
+            # Everything returned, structured games included; the prompt prefix is
+            # counted once per slate by the builder, so only the rest is tokenized here
+            rest_tokens = self.tracer.count_tokens([prompt.suffix] + [value for key, value in observation.items()
+                                                                      if key != "prompt"])
+            span["tokens_out"] = None if rest_tokens is None else prompt.prefix_tokens + rest_tokens
+            span["prefix_tokens"] = prompt.prefix_tokens
+            span["prefix_cached"] = prompt.cache_hit
+        
+        return observation
     
-    def step(self, action):
-        """Validate and save predictions."""
+    def step(self, action, rollout_id: Optional[str] = None):
+        """Validate and save predictions, then write out the episode's trace.
+        
+        Args:
+            action: Dict of predictions by game_id
+            rollout_id: The rollout to finish (default: the one reset() started
+                in this task/thread); it is closed once done
+        """
+        rollout = self._rollout(rollout_id)
+        episode = current_episode.set(rollout.rollout_id)  # Trace the step under its own rollout
+        try:
+            with self.tracer.span("step") as span:
+                span["tokens_in"] = self.tracer.count_tokens(action)
+                result = self._step(rollout, action)
+                span["done"] = result[2]
+        finally:
+            current_episode.reset(episode)
+        
+        result[4]["search_budget"] = rollout.budget.summary()
+        result[4]["trace"] = self.tracer.episode_totals(rollout.rollout_id)
+        if result[2]:
+            self.tracer.flush(rollout.rollout_id)
+            self.rollouts.pop(rollout.rollout_id, None)
+        return result
+    
+    def _step(self, rollout, action):
         predictions = action  # Expecting dict of predictions
         
         # Validate all games picked
-        if len(predictions) != len(self.games):
+        if len(predictions) != len(rollout.games):
             return None, 0, False, False, {"error": "Must pick every game"}
         
         # Validate units
@@ -144,15 +291,23 @@ class NFLPickerEnvironment(vf.ToolEnvironment):
         os.makedirs(output_dir, exist_ok=True)
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{output_dir}/predictions_{self.day or 'all'}_{timestamp}.json"
+        # Model and a short unique suffix keep parallel rollouts from overwriting each other
+        filename = f"{output_dir}/predictions_{self.day or 'all'}_{self.model_name}_{timestamp}_{uuid.uuid4().hex[:8]}.json"
         
         with open(filename, 'w') as f:
             json.dump({
+                "model": self.model_name,
+                "season": self.season,
                 "week": self.week_number,
                 "day": self.day,
                 "predictions": predictions,
-                "timestamp": timestamp
+                "timestamp": timestamp,
+                "lines": {game.game_id: game.to_dict() for game in rollout.games},  # Spreads at pick time, for grading
+                "searches_used": rollout.budget.summary()["used"]  # Per game, to compare with pick accuracy
             }, f, indent=2)
         
+        # Merge this rollout's notes into the shared scratchpad
+        scratchpad_commit = rollout.scratchpad.commit()
+        
         done = True
-        return None, 0, done, False, {"predictions_saved": filename}
\ No newline at end of file
+        return None, 0, done, False, {"predictions_saved": filename, "scratchpad_commit": scratchpad_commit}
\ No newline at end of file
@@ -0,0 +1,79 @@
+import os
+import sys
+import asyncio
+import argparse
+from collections import defaultdict
+from dotenv import load_dotenv
+
+# The grading engine is shared with the environment package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'environments', 'vf_nfl_picker'))
+from nfl_data.grading import Grader
+from nfl_data.odds_client import OddsApiClient, OddsApiError
+
+load_dotenv()
+
+BASE_URL = os.getenv('ODDS_API_BASE_URL', 'https://api.the-odds-api.com/v4')
+
+def fetch_scores(days_from):
+    """Fetch completed NFL games from the Odds API scores endpoint"""
+    async def _fetch():
+        async with OddsApiClient(base_url=BASE_URL) as client:
+            return await client.get_scores(days_from=days_from)
+
+    try:
+        return asyncio.run(_fetch())
+    except OddsApiError as e:
+        print(f"Error fetching scores: {e}")
+        return []
+
+def print_summary(grades):
+    """Print record and P&L per model and week"""
+    totals = defaultdict(lambda: defaultdict(float))
+    for entry in grades:
+        row = totals[(entry['model'], entry['week'])]
+        row['files'] += 1
+        for key in ('win', 'loss', 'push', 'pending', 'units_risked', 'pnl'):
+            row[key] += entry['summary'][key]
+
+    print(f"\n{'Model':<24} {'Week':>4} {'Files':>5} {'W-L-P':>12} {'Pending':>7} {'Units':>7} {'P&L':>8} {'ROI':>7}")
+    print("-" * 82)
+    for (model, week), row in sorted(totals.items(), key=lambda item: (item[0][0], item[0][1] or 0)):
+        record = f"{int(row['win'])}-{int(row['loss'])}-{int(row['push'])}"
+        roi = f"{row['pnl'] / row['units_risked']:+.1%}" if row['units_risked'] else "-"
+        print(f"{model:<24} {week:>4} {int(row['files']):>5} {record:>12} {int(row['pending']):>7} "
+              f"{row['units_risked']:>7g} {row['pnl']:>+8.2f} {roi:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Grade saved predictions against final scores')
+    parser.add_argument('--season', type=int, default=2025,
+                       help='Season to grade (default: 2025)')
+    parser.add_argument('--data-dir', type=str, default='data',
+                       help='Directory containing season_N stores (default: data)')
+    parser.add_argument('--predictions-dir', type=str, default='predictions',
+                       help='Directory containing week_N prediction folders (default: predictions)')
+    parser.add_argument('--scores-file', type=str, action='append', default=[],
+                       help='Local JSON/CSV file of final scores to ingest (repeatable)')
+    parser.add_argument('--fetch-scores', type=int, metavar='DAYS',
+                       help='Ingest completed games from the last DAYS days (1-3) via the Odds API')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-grade every file, not just new or changed ones')
+    args = parser.parse_args()
+
+    grader = Grader(args.season, args.data_dir, args.predictions_dir)
+
+    for path in args.scores_file:
+        added = grader.results.ingest_file(path)
+        print(f"Ingested {added} result(s) from {path}")
+
+    if args.fetch_scores:
+        added = grader.results.ingest(fetch_scores(args.fetch_scores))
+        print(f"Ingested {added} result(s) from the Odds API")
+
+    counts = grader.run(force=args.force)
+    print(f"Graded {counts['graded']} file(s), {counts['skipped']} up to date, {counts['removed']} removed "
+          f"({len(grader.results)} final scores on record)")
+
+    print_summary(grader.grades())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import os
+import sys
+import argparse
+
+# The snapshot store is shared with the environment package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'environments', 'vf_nfl_picker'))
+from nfl_data.snapshot_store import import_json_snapshots
+
+def main():
+    parser = argparse.ArgumentParser(description='Import legacy data/week_N/*.json pulls into the season snapshot store')
+    parser.add_argument('--data-dir', type=str, default='data',
+                       help='Directory containing week_N folders (default: data)')
+    args = parser.parse_args()
+    
+    imported = import_json_snapshots(args.data_dir)
+    print(f"\nImported {imported} snapshot(s)")
+
+if __name__ == "__main__":
+    main()
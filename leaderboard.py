@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+# The grading engine is shared with the environment package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'environments', 'vf_nfl_picker'))
+from nfl_data.grading import Grader
+from nfl_data.leaderboard import build_leaderboard
+
+def format_interval(interval, percent=True):
+    if interval[0] is None:
+        return "-"
+    if percent:
+        return f"[{interval[0]:+.1%}, {interval[1]:+.1%}]"
+    return f"[{interval[0]:.3f}, {interval[1]:.3f}]"
+
+def print_leaderboard(board):
+    """Print models ranked by ROI, then pairwise comparisons"""
+    level = f"{board['ci']:.0%} CI"
+    print(f"\n{'Model':<24} {'W-L-P':>10} {'ATS %':>7} {level:>18} {'ROI':>8} {level:>20}")
+    print("-" * 92)
+    for row in board['models']:
+        record = f"{row['wins']}-{row['losses']}-{row['pushes']}"
+        win_rate = f"{row['win_rate']:.1%}" if row['win_rate'] is not None else "-"
+        roi = f"{row['roi']:+.1%}" if row['roi'] is not None else "-"
+        print(f"{row['model']:<24} {record:>10} {win_rate:>7} {format_interval(row['win_rate_ci'], False):>18} "
+              f"{roi:>8} {format_interval(row['roi_ci']):>20}")
+
+    if board['pairs']:
+        print(f"\n{'Model A':<20} {'Model B':<20} {'Games':>5} {'ROI diff':>9} {level:>20} {'P(A>B)':>7}")
+        print("-" * 86)
+        for row in board['pairs']:
+            diff = f"{row['roi_diff']:+.1%}" if row['roi_diff'] is not None else "-"
+            prob = f"{row['prob_a_better_roi']:.2f}" if row['prob_a_better_roi'] is not None else "-"
+            print(f"{row['model_a']:<20} {row['model_b']:<20} {row['shared_games']:>5} {diff:>9} "
+                  f"{format_interval(row['roi_diff_ci']):>20} {prob:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Leaderboard of graded predictions with bootstrap confidence intervals')
+    parser.add_argument('--season', type=int, default=2025,
+                       help='Season to rank (default: 2025)')
+    parser.add_argument('--data-dir', type=str, default='data',
+                       help='Directory containing season_N stores (default: data)')
+    parser.add_argument('--predictions-dir', type=str, default='predictions',
+                       help='Directory containing week_N prediction folders (default: predictions)')
+    parser.add_argument('--boot', type=int, default=10000,
+                       help='Bootstrap resamples (default: 10000)')
+    parser.add_argument('--ci', type=float, default=0.95,
+                       help='Confidence level (default: 0.95)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Random seed (default: 0)')
+    parser.add_argument('--json', type=str, metavar='PATH',
+                       help='Also write the leaderboard as JSON')
+    args = parser.parse_args()
+
+    # Bring grades up to date first (only new/changed files are graded)
+    grader = Grader(args.season, args.data_dir, args.predictions_dir)
+    grader.run()
+
+    start = time.perf_counter()
+    board = build_leaderboard(grader.grades(), n_boot=args.boot, ci=args.ci, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    print_leaderboard(board)
+    print(f"\n{args.boot} resamples over {board['games']} games in {elapsed:.2f}s")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(board, f, indent=2)
+        print(f"Saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,32 @@
-import requests
 import json
 import os
+import sys
+import time
+import asyncio
 import argparse
 from datetime import datetime, timedelta
 from statistics import median
 from dotenv import load_dotenv
 from zoneinfo import ZoneInfo
 
+# The snapshot store is shared with the environment package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'environments', 'vf_nfl_picker'))
+from nfl_data.snapshot_store import SnapshotStore
+from nfl_data.records import Game, LineSnapshot, as_game
+from nfl_data.helpers import to_api_time
+from nfl_data.line_history import LineHistory
+from nfl_data.odds_client import OddsApiClient, OddsApiError, QuotaScheduler
+
 load_dotenv()
 
 API_KEY = os.getenv('ODDS_API_KEY')
-BASE_URL = 'https://api.the-odds-api.com/v4'
+BASE_URL = os.getenv('ODDS_API_BASE_URL', 'https://api.the-odds-api.com/v4')
+
+# NFL weeks run Thursday to Wednesday
+WEEK_DAYS = ['thursday', 'friday', 'saturday', 'sunday', 'monday', 'tuesday', 'wednesday']
+
+# Shared across polls so request spacing follows the remaining quota
+scheduler = QuotaScheduler(reserve=int(os.getenv('ODDS_API_RESERVE', '50')))
 
 def get_current_nfl_week():
     season_start = datetime(2025, 9, 4, tzinfo=ZoneInfo('America/Los_Angeles'))  # 2025 NFL season starts Sept 4, 2025
@@ -45,46 +61,50 @@ def get_week_boundaries():
     
     return week_start, week_end
 
-def fetch_nfl_odds():
-    sport = 'americanfootball_nfl'
-    
-    odds_url = f'{BASE_URL}/sports/{sport}/odds'
-    params = {
-        'apiKey': API_KEY,
-        'regions': 'us',
-        'markets': 'spreads,totals',
-        'oddsFormat': 'american',
-    }
-    
-    response = requests.get(odds_url, params=params)
-    
-    if response.status_code != 200:
-        print(f"Error fetching data: {response.status_code}")
-        print(response.text)
+def get_day_boundaries(week_start, day):
+    """Get the start and end datetime of one day within an NFL week (Pacific midnight to 23:59:59)"""
+    offset = WEEK_DAYS.index(day.lower())
+    day_start = week_start + timedelta(days=offset)
+    day_end = day_start + timedelta(days=1) - timedelta(seconds=1)
+    return day_start, day_end
+
+def fetch_nfl_odds(commence_from=None, commence_to=None):
+    """Fetch NFL odds, optionally limited server-side to games starting in [commence_from, commence_to]"""
+    params = {}
+    if commence_from is not None:
+        params['commenceTimeFrom'] = to_api_time(commence_from)
+    if commence_to is not None:
+        params['commenceTimeTo'] = to_api_time(commence_to)
+    
+    async def _fetch():
+        async with OddsApiClient(API_KEY, BASE_URL, scheduler=scheduler) as client:
+            return await client.get_odds('americanfootball_nfl', regions='us', markets='spreads,totals', **params)
+    
+    try:
+        odds = asyncio.run(_fetch())
+    except OddsApiError as e:
+        print(f"Error fetching data: {e.status}")
+        print(e)
         return None
     
-    print(f"API Usage - Remaining: {response.headers.get('x-requests-remaining', 'N/A')}")
-    print(f"API Usage - Used: {response.headers.get('x-requests-used', 'N/A')}")
+    print(f"API Usage - Remaining: {scheduler.remaining if scheduler.remaining is not None else 'N/A'}")
+    print(f"API Usage - Used: {scheduler.used if scheduler.used is not None else 'N/A'}")
     
-    return response.json()
+    return odds
+
+def game_epoch(commence_time):
+    """Epoch seconds for an Odds API commence_time (always UTC, so no timezone conversion)"""
+    return datetime.fromisoformat(commence_time.replace('Z', '+00:00')).timestamp()
 
 def filter_current_week_games(games, week_start, week_end):
     """Filter games to only include those in the current NFL week"""
-    current_week_games = []
-    
-    for game in games:
-        # Parse the commence_time from ISO format
-        game_time = datetime.fromisoformat(game['commence_time'].replace('Z', '+00:00'))
-        # Convert to Pacific time for comparison
-        game_time_pacific = game_time.astimezone(ZoneInfo('America/Los_Angeles'))
-        
-        # Check if game is within current week boundaries
-        if week_start <= game_time_pacific <= week_end:
-            current_week_games.append(game)
+    # Compare in UTC epoch seconds; the bounds are converted once, not per game
+    start, end = week_start.timestamp(), week_end.timestamp()
     
-    return current_week_games
+    return [game for game in games if start <= game_epoch(game['commence_time']) <= end]
 
 def process_game_lines(game):
+    """Consensus (median) spread and total across bookmakers for one raw /odds game, as a Game record"""
     game_info = {
         'game_id': game['id'],
         'home_team': game['home_team'],
@@ -127,74 +147,70 @@ def process_game_lines(game):
     # Calculate median spreads and format for model consumption
     if game_info['spreads']['home']:
         home_spreads = [s['spread'] for s in game_info['spreads']['home']]
-        game_info['home_spread'] = median(home_spreads)
+        home_spread = median(home_spreads)
     else:
-        game_info['home_spread'] = None
+        home_spread = None
     
     if game_info['spreads']['away']:
         away_spreads = [s['spread'] for s in game_info['spreads']['away']]
-        game_info['away_spread'] = median(away_spreads)
+        away_spread = median(away_spreads)
     else:
-        game_info['away_spread'] = None
+        away_spread = None
     
     if game_info['totals']:
         total_lines = [t['total'] for t in game_info['totals']]
-        game_info['total'] = median(total_lines)
+        total = median(total_lines)
     else:
-        game_info['total'] = None
+        total = None
     
-    # Remove detailed spreads/totals arrays for cleaner output
-    del game_info['spreads']
-    del game_info['totals']
-    
-    return game_info
+    # Only the consensus lines are kept; the per-book arrays are dropped
+    return Game(game_info['game_id'], game_info['home_team'], game_info['away_team'], game_info['game_time'],
+                game_info['bookmaker_count'], home_spread, away_spread, total)
 
-def filter_by_day(games, day_filter):
-    """Filter games to only include those on a specific day of the week"""
+def filter_by_day(games, day_filter, week_start):
+    """Filter Game records (or game dicts) to those on a specific day of the week starting at week_start (a Thursday)"""
     if not day_filter:
         return games
     
-    day_filter = day_filter.lower()
-    filtered_games = []
-    
-    for game in games:
-        game_dt = datetime.fromisoformat(game['game_time'].replace('Z', '+00:00'))
-        game_pacific = game_dt.astimezone(ZoneInfo('America/Los_Angeles'))
-        game_day = game_pacific.strftime('%A').lower()
-        
-        if game_day == day_filter:
-            filtered_games.append(game)
+    day_start, day_end = get_day_boundaries(week_start, day_filter)
+    start, end = day_start.timestamp(), day_end.timestamp()
     
-    return filtered_games
+    return [game for game in games if start <= game_epoch(as_game(game).game_time) <= end]
 
-def main():
-    # Set up argument parser
-    parser = argparse.ArgumentParser(description='Pull NFL betting lines for the current week')
-    parser.add_argument('--day', type=str, 
-                       choices=['thursday', 'friday', 'saturday', 'sunday', 'monday', 'tuesday', 'wednesday'],
-                       help='Filter games to a specific day of the week')
-    args = parser.parse_args()
+def pull_lines(args):
+    """Fetch, process and store one snapshot of the current week's lines"""
+    current_week = get_current_nfl_week()
+    week_start, week_end = get_week_boundaries()
+    
+    # Only ask the API for the games we keep: the week, or just one day of it
+    if args.day:
+        window_start, window_end = get_day_boundaries(week_start, args.day)
+    else:
+        window_start, window_end = week_start, week_end
     
     print("Fetching NFL odds data...")
-    odds_data = fetch_nfl_odds()
+    odds_data = fetch_nfl_odds(window_start, window_end)
     
-    if not odds_data:
+    if odds_data is None:
         print("Failed to fetch odds data")
         return
     
-    current_week = get_current_nfl_week()
-    week_start, week_end = get_week_boundaries()
-    
     print(f"\nFiltering for Week {current_week} games")
     if args.day:
         print(f"Day filter: {args.day.capitalize()}")
     print(f"Week boundaries: {week_start.strftime('%Y-%m-%d %H:%M %Z')} to {week_end.strftime('%Y-%m-%d %H:%M %Z')}")
     
-    # Filter to only current week's games
-    current_week_games = filter_current_week_games(odds_data, week_start, week_end)
+    # The server already applied the window; this guards against games at the edges
+    current_week_games = filter_current_week_games(odds_data, window_start, window_end)
     
     print(f"Found {len(current_week_games)} games in Week {current_week}")
     
+    pull_timestamp = datetime.now(ZoneInfo('America/Los_Angeles')).isoformat()
+    
+    # Keep per-bookmaker line movement (only values changed since the last pull)
+    changes = LineHistory(2025).record(current_week_games, pull_timestamp)
+    print(f"Line history: {changes} changed line(s) recorded")
+    
     processed_games = []
     for game in current_week_games:
         processed_game = process_game_lines(game)
@@ -202,57 +218,85 @@ def main():
     
     # Filter by day if specified
     if args.day:
-        processed_games = filter_by_day(processed_games, args.day)
+        processed_games = filter_by_day(processed_games, args.day, week_start)
         print(f"Found {len(processed_games)} games on {args.day.capitalize()}")
     
     # Sort games by game time
-    processed_games.sort(key=lambda x: x['game_time'])
-    
-    # Create directory structure for organized storage
-    week_dir = f"data/week_{current_week}"
-    os.makedirs(week_dir, exist_ok=True)
-    
-    # Adjust filename based on day filter
-    if args.day:
-        filename = f"nfl_lines_week_{current_week}_{args.day}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    else:
-        filename = f"nfl_lines_week_{current_week}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    
-    # Full path with directory
-    filepath = os.path.join(week_dir, filename)
-    
-    output = {
-        'meta': {
-            'pull_timestamp': datetime.now(ZoneInfo('America/Los_Angeles')).isoformat(),
-            'week': current_week,
-            'season': 2025,
-            'week_start': week_start.isoformat(),
-            'week_end': week_end.isoformat(),
-            'day_filter': args.day if args.day else 'all',
-            'games_count': len(processed_games)
-        },
-        'games': processed_games
-    }
-    
-    with open(filepath, 'w') as f:
-        json.dump(output, f, indent=2)
-    
-    print(f"\nData saved to {filepath}")
+    processed_games.sort(key=lambda x: x.game_time)
+    
+    snapshot = LineSnapshot({
+        'pull_timestamp': pull_timestamp,
+        'week': current_week,
+        'season': 2025,
+        'week_start': week_start.isoformat(),
+        'week_end': week_end.isoformat(),
+        'day_filter': args.day if args.day else 'all',
+        'games_count': len(processed_games)
+    }, processed_games)
+    
+    store = SnapshotStore(snapshot.meta['season'])
+    store.append(snapshot.meta, processed_games)
+    print(f"\nSnapshot appended to {store.data_path}")
+    
+    if args.json:
+        # Create directory structure for organized storage
+        week_dir = f"data/week_{current_week}"
+        os.makedirs(week_dir, exist_ok=True)
+        
+        # Adjust filename based on day filter
+        if args.day:
+            filename = f"nfl_lines_week_{current_week}_{args.day}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        else:
+            filename = f"nfl_lines_week_{current_week}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        
+        # Full path with directory
+        filepath = os.path.join(week_dir, filename)
+        
+        with open(filepath, 'w') as f:
+            json.dump(snapshot.to_dict(), f, indent=2)
+        
+        print(f"Data saved to {filepath}")
     print(f"Week: {current_week}")
     if args.day:
         print(f"Day: {args.day.capitalize()}")
     print(f"Games found: {len(processed_games)}")
     
     for game in processed_games:
-        game_dt = datetime.fromisoformat(game['game_time'].replace('Z', '+00:00'))
+        game_dt = datetime.fromisoformat(game.game_time.replace('Z', '+00:00'))
         game_pacific = game_dt.astimezone(ZoneInfo('America/Los_Angeles'))
         
-        print(f"\n{game['away_team']} @ {game['home_team']}")
+        print(f"\n{game.away_team} @ {game.home_team}")
         print(f"  Time: {game_pacific.strftime('%a %b %d, %I:%M %p PT')}")
-        if game['home_spread'] is not None:
-            print(f"  Spread: {game['home_team']} {game['home_spread']:+.1f}")
-        if game['total'] is not None:
-            print(f"  Total: {game['total']:.1f}")
+        if game.home_spread is not None:
+            print(f"  Spread: {game.home_team} {game.home_spread:+.1f}")
+        if game.total is not None:
+            print(f"  Total: {game.total:.1f}")
+
+def main():
+    # Set up argument parser
+    parser = argparse.ArgumentParser(description='Pull NFL betting lines for the current week')
+    parser.add_argument('--day', type=str, 
+                       choices=WEEK_DAYS,
+                       help='Filter games to a specific day of the week')
+    parser.add_argument('--json', action='store_true',
+                       help='Also write a standalone data/week_N/*.json file (legacy layout)')
+    parser.add_argument('--poll', type=float, metavar='MINUTES',
+                       help='Keep pulling every MINUTES minutes to track line movement')
+    args = parser.parse_args()
+    
+    if not args.poll:
+        pull_lines(args)
+        return
+    
+    print(f"Polling every {args.poll:g} minutes (Ctrl+C to stop)")
+    try:
+        while True:
+            pull_lines(args)
+            # The quota scheduler may stretch this further on the next request
+            print(f"Quota pacing: {scheduler.interval() / 60:.1f} min between requests")
+            time.sleep(args.poll * 60)
+    except KeyboardInterrupt:
+        print("\nStopped polling")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
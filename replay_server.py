@@ -0,0 +1,62 @@
+import os
+import sys
+import asyncio
+import argparse
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# The stub server lives in the environment package
+sys.path.insert(0, os.path.join(ROOT, 'environments', 'vf_nfl_picker'))
+sys.path.insert(0, ROOT)
+from nfl_data.odds_stub import OddsStubServer
+
+async def serve(args):
+    payloads = None
+    if args.synthetic:
+        from benchmarks.synthetic import make_odds_payload
+        payloads = {'sports/americanfootball_nfl/odds': make_odds_payload(args.synthetic, seed=args.seed)}
+
+    server = OddsStubServer(args.recordings, payloads=payloads, latency_ms=args.latency_ms,
+                            jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                            quota=args.quota, seed=args.seed, port=args.port)
+    async with server:
+        responses = sum(len(recordings) for recordings in server.recordings.values())
+        print(f"Serving {responses} recorded response(s) across {len(server.recordings)} endpoint(s)")
+        print(f"export ODDS_API_BASE_URL={server.base_url}")
+        try:
+            while True:
+                await asyncio.sleep(3600)
+        finally:
+            print(f"\nServed {server.stats['served']} of {server.stats['requests']} request(s), "
+                  f"{server.stats['errors_injected']} injected error(s), {server.stats['not_found']} not found")
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve recorded Odds API responses locally for offline runs')
+    parser.add_argument('--recordings', type=str,
+                       help='Directory of responses saved with ODDS_API_RECORD_DIR')
+    parser.add_argument('--synthetic', type=int, metavar='GAMES',
+                       help='Also serve a synthetic /odds slate with this many games')
+    parser.add_argument('--port', type=int, default=8765,
+                       help='Port to listen on (default: 8765)')
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                       help='Delay added to every response (default: 0)')
+    parser.add_argument('--jitter-ms', type=float, default=0.0,
+                       help='Random extra delay up to this many ms (default: 0)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                       help='Fraction of requests answered with 429/503 (default: 0)')
+    parser.add_argument('--quota', type=int, default=20000,
+                       help='Starting x-requests-remaining (default: 20000)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Seed for jitter, errors and synthetic data (default: 0)')
+    args = parser.parse_args()
+
+    if not args.recordings and not args.synthetic:
+        parser.error('Nothing to serve: pass --recordings and/or --synthetic')
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
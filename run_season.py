@@ -0,0 +1,243 @@
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from statistics import quantiles
+
+# The environment package lives under environments/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'environments', 'vf_nfl_picker'))
+from nfl_data.helpers import parse_list
+
+# Slates within a week run in kickoff order; 'all' (no day filter) first
+SLATE_ORDER = ['all', 'thursday', 'friday', 'saturday', 'sunday', 'monday', 'tuesday', 'wednesday']
+
+def favorites_policy(env, observation, model_name):
+    """Baseline policy: take every favorite, units spread as evenly as 1-5 per game allows"""
+    games = sorted(observation['games'], key=lambda g: min(g['home_spread'] or 0, g['away_spread'] or 0))
+    units = [min(5, max(1, 50 // max(len(games), 1)))] * len(games)
+    leftover = 50 - sum(units)
+    for i in range(len(games)):
+        step = max(-(units[i] - 1), min(5 - units[i], leftover))
+        units[i] += step
+        leftover -= step
+
+    predictions = {}
+    for game, game_units in zip(games, units):
+        home_favored = (game['home_spread'] or 0) <= (game['away_spread'] or 0)
+        predictions[game['game_id']] = {
+            'pick': game['home_team'] if home_favored else game['away_team'],
+            'units': game_units,
+            'reasoning': 'Baseline: favorite'
+        }
+    return predictions
+
+POLICIES = {'favorites': favorites_policy}
+
+# Per-worker caches: one environment per (model, season, week, day) reused across rollouts
+_envs = {}
+_policies = {}
+
+def load_policy(spec):
+    """Resolve 'favorites' or 'package.module:function' to a policy callable"""
+    if spec not in _policies:
+        if spec in POLICIES:
+            _policies[spec] = POLICIES[spec]
+        else:
+            module_name, _, attr = spec.partition(':')
+            _policies[spec] = getattr(importlib.import_module(module_name), attr)
+    return _policies[spec]
+
+def init_worker():
+    """Import the environment once per worker so rollout latency excludes startup"""
+    importlib.import_module('vf_nfl_picker')
+
+def run_task(task):
+    """Run one rollout in a worker process: reset, ask the policy for picks, step"""
+    key = (task['model'], task['season'], task['week'], task['day'])
+    start = time.perf_counter()
+    result = dict(task)
+    try:
+        env = _envs.get(key)
+        if env is None:
+            from vf_nfl_picker import NFLPickerEnvironment
+            day = None if task['day'] == 'all' else task['day']
+            env = NFLPickerEnvironment(task['week'], day, task['season'], model_name=task['model'],
+                                       dataset_path=task.get('dataset'))
+            _envs[key] = env
+
+        observation = env.reset()
+        predictions = load_policy(task['policy'])(env, observation, task['model'])
+        _, _, done, _, info = env.step(predictions)
+        result['status'] = 'ok' if done else 'rejected'
+        result['info'] = info
+    except Exception as e:
+        result['status'] = 'error'
+        result['info'] = {'error': f"{type(e).__name__}: {e}"}
+    result['elapsed'] = time.perf_counter() - start
+    result['worker'] = os.getpid()
+    return result
+
+def task_key(task):
+    return (task['model'], task['season'], task['week'], task['day'], task['rollout'])
+
+def load_progress(path):
+    """Keys of rollouts that already finished successfully"""
+    done = set()
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if entry['status'] == 'ok':
+                        done.add(task_key(entry))
+    return done
+
+def run_grid(args):
+    """Schedule models x (week, slate) stages x rollouts on a process pool.
+
+    Each model's stages run in order (scratchpad notes carry forward), the
+    rollouts within a stage run in parallel, and different models are
+    independent.
+    """
+    run_dir = os.path.join(args.runs_dir, args.run_name)
+    os.makedirs(run_dir, exist_ok=True)
+    progress_path = os.path.join(run_dir, 'progress.jsonl')
+    if args.restart and os.path.exists(progress_path):
+        os.remove(progress_path)
+    done = load_progress(progress_path)
+
+    days = sorted(args.days.split(','), key=SLATE_ORDER.index)
+    stages = [(week, day) for week in parse_list(args.weeks) for day in days]
+    models = args.models.split(',')
+    queues = {model: list(stages) for model in models}
+
+    def stage_tasks(model, stage):
+        week, day = stage
+        return [{'model': model, 'season': args.season, 'week': week, 'day': day, 'rollout': r,
+                 'policy': args.policy, 'dataset': args.dataset} for r in range(args.rollouts)]
+
+    results = []
+    skipped = 0
+    outstanding = defaultdict(int)
+    futures = {}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker) as pool, open(progress_path, 'a') as progress:
+        def advance(model):
+            """Submit the model's next stage with work left, skipping finished ones"""
+            nonlocal skipped
+            while queues[model]:
+                stage = queues[model].pop(0)
+                tasks = [t for t in stage_tasks(model, stage) if task_key(t) not in done]
+                skipped += args.rollouts - len(tasks)
+                if tasks:
+                    for task in tasks:
+                        futures[pool.submit(run_task, task)] = (model, stage)
+                    outstanding[(model, stage)] = len(tasks)
+                    return
+
+        for model in models:
+            advance(model)
+
+        while futures:
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                model, stage = futures.pop(future)
+                result = future.result()
+                results.append(result)
+                progress.write(json.dumps(result, default=str) + '\n')
+                progress.flush()
+
+                print(f"[{len(results)}] {model} week {stage[0]} {stage[1]} rollout {result['rollout']}: "
+                      f"{result['status']} ({result['elapsed']:.1f}s)")
+                if result['status'] != 'ok':
+                    print(f"    {result['info'].get('error')}")
+
+                outstanding[(model, stage)] -= 1
+                if outstanding[(model, stage)] == 0:
+                    del outstanding[(model, stage)]
+                    advance(model)
+
+    report = throughput_report(results, skipped, time.perf_counter() - start, args.workers)
+    with open(os.path.join(run_dir, 'report.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    return report
+
+def throughput_report(results, skipped, wall, workers):
+    """Aggregate counts, throughput, latency percentiles and worker utilization"""
+    latencies = [r['elapsed'] for r in results]
+    by_status = defaultdict(int)
+    by_model = defaultdict(lambda: defaultdict(int))
+    for r in results:
+        by_status[r['status']] += 1
+        by_model[r['model']][r['status']] += 1
+
+    if len(latencies) >= 2:
+        cuts = quantiles(latencies, n=100)
+        p50, p95 = cuts[49], cuts[94]
+    else:
+        p50 = p95 = latencies[0] if latencies else 0.0
+
+    return {
+        'rollouts_run': len(results),
+        'rollouts_skipped': skipped,
+        'by_status': dict(by_status),
+        'by_model': {model: dict(counts) for model, counts in by_model.items()},
+        'wall_seconds': round(wall, 2),
+        'rollouts_per_minute': round(60 * len(results) / wall, 2) if wall > 0 else None,
+        'latency_p50': round(p50, 3),
+        'latency_p95': round(p95, 3),
+        'workers': workers,
+        'worker_utilization': round(sum(latencies) / (wall * workers), 3) if wall > 0 else None
+    }
+
+def print_report(report):
+    print(f"\n{'='*60}")
+    print(f"Ran {report['rollouts_run']} rollout(s), skipped {report['rollouts_skipped']} already done")
+    print(f"Status: {report['by_status']}")
+    print(f"Wall time: {report['wall_seconds']}s, {report['rollouts_per_minute']} rollouts/min "
+          f"on {report['workers']} worker(s) ({report['worker_utilization']} utilization)")
+    print(f"Rollout latency: p50 {report['latency_p50']}s, p95 {report['latency_p95']}s")
+    print(f"{'='*60}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Run models x weeks x day slates x rollouts in parallel')
+    parser.add_argument('--models', type=str, default='default',
+                       help='Comma-separated model names (default: default)')
+    parser.add_argument('--weeks', type=str, required=True,
+                       help="Weeks to run, e.g. '1-6' or '1,3,5'")
+    parser.add_argument('--days', type=str, default='all',
+                       help="Comma-separated day slates, e.g. 'thursday,sunday,monday' (default: all)")
+    parser.add_argument('--rollouts', type=int, default=1,
+                       help='Rollouts per model, week and slate (default: 1)')
+    parser.add_argument('--season', type=int, default=2025,
+                       help='NFL season (default: 2025)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                       help='Worker processes (default: CPU count)')
+    parser.add_argument('--policy', type=str, default='favorites',
+                       help="Policy producing picks: 'favorites' or 'package.module:function' "
+                            "called as policy(env, observation, model_name)")
+    parser.add_argument('--dataset', type=str,
+                       help='Prebuilt dataset from build_dataset.py; workers memory-map it instead of reading the snapshot store')
+    parser.add_argument('--run-name', type=str,
+                       help='Name of the run, used for resuming (default: season_<season>)')
+    parser.add_argument('--runs-dir', type=str, default='runs',
+                       help='Directory for run progress and reports (default: runs)')
+    parser.add_argument('--restart', action='store_true',
+                       help='Ignore saved progress and run everything again')
+    args = parser.parse_args()
+
+    for day in args.days.split(','):
+        if day not in SLATE_ORDER:
+            parser.error(f"Unknown day slate '{day}'")
+    args.run_name = args.run_name or f"season_{args.season}"
+
+    run_grid(args)
+
+if __name__ == "__main__":
+    main()
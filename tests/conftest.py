@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# The environment's packages (nfl_data, tools) live under environments/
+ENV_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'environments', 'vf_nfl_picker')
+sys.path.insert(0, ENV_DIR)
+
+
+class WordTokenizer:
+    """Whitespace tokenizer standing in for tiktoken (no encoding download in tests)."""
+
+    def encode(self, text):
+        return text.split()
+
+
+@pytest.fixture
+def word_tokenizer(monkeypatch):
+    from tools import scratchpad_tool
+    monkeypatch.setattr(scratchpad_tool, '_tokenizer', WordTokenizer())
+    return scratchpad_tool._tokenizer
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from nfl_data.dataset import EvalDataset, build_dataset
+from nfl_data.records import Game
+from nfl_data.snapshot_store import SnapshotStore
+
+
+def render(season, week, day, games):
+    return 'v0', f'{week} {day}', 2, 'hash'
+
+
+def pull(store, week, day, timestamp, spread):
+    games = [Game('g1', 'Buffalo Bills', 'Baltimore Ravens', '2025-09-07T17:00:00Z', 8, spread, -spread, 47.5)]
+    store.append({'week': week, 'day_filter': day, 'pull_timestamp': timestamp}, games)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    store = SnapshotStore(2025, str(tmp_path))
+    pull(store, 1, 'thursday', '2025-09-04T12:00:00Z', -3.0)
+    pull(store, 2, 'all', '2025-09-09T12:00:00Z', -7.0)
+    pull(store, 2, 'sunday', '2025-09-13T12:00:00Z', -6.5)
+    pull(store, 3, 'all', '2025-09-16T12:00:00Z', -1.0)
+    pull(store, 3, 'sunday', '2025-09-16T12:00:00Z', -1.5)
+    path = str(tmp_path / 'eval.arrow')
+    build_dataset(path, [2025], render, data_dir=str(tmp_path))
+    return EvalDataset(path)
+
+
+def test_lookup_day_none_matches_the_store(dataset):
+    # Only a Thursday slate exists for week 1; day=None still finds it
+    assert dataset.row(dataset.lookup(2025, 1, None), ['day'])['day'] == 'thursday'
+    assert dataset.row(dataset.lookup(2025, 2, None), ['day'])['day'] == 'sunday'
+    # Tie on pull time goes to the full-week slate
+    assert dataset.row(dataset.lookup(2025, 3, None), ['day'])['day'] == 'all'
+    assert dataset.lookup(2025, 4, None) is None
+
+
+def test_lookup_all_is_the_full_week_slate_only(dataset):
+    assert dataset.lookup(2025, 1, 'all') is None
+    assert dataset.row(dataset.lookup(2025, 2, 'all'), ['day'])['day'] == 'all'
+    assert dataset.row(dataset.lookup(2025, 2, 'Sunday'), ['day'])['day'] == 'sunday'
@@ -0,0 +1,43 @@
+import pytest
+
+from tools.exa_compress import _is_boilerplate, clean_lines
+
+
+@pytest.mark.parametrize('line', [
+    'Advertisement',
+    'Share on Facebook',
+    'Skip to main content',
+    'Subscribe now',
+    'Accept all cookies',
+    '© 2025 ESPN Enterprises',
+    '[NFL](/nfl) | [NBA](/nba) | [Scores](/scores)',
+    'https://www.espn.com/nfl/',
+    '• [Home](/) • [Teams](/teams) •',
+])
+def test_boilerplate_lines(line):
+    assert _is_boilerplate(line)
+
+
+@pytest.mark.parametrize('line', [
+    'Hurts: Questionable',
+    'Jalen Hurts | QB | Knee | Questionable',
+    'Out',
+    'The Eagles share the NFC East lead after a win in [Dallas](/nfl/dallas).',
+    'Search for a new kicker continues in Baltimore',
+])
+def test_content_lines_are_kept(line):
+    assert not _is_boilerplate(line)
+
+
+def test_clean_lines_drops_long_repeats_but_keeps_short_ones():
+    text = "\n".join([
+        "Sign up for the daily newsletter today",
+        "Status",
+        "Questionable",
+        "Questionable",
+        "Sign up for the daily newsletter today",
+    ])
+    stats = {'boilerplate_lines_removed': 0}
+    kept = list(clean_lines(text, stats))
+    assert kept == ["Sign up for the daily newsletter today", "Status", "Questionable", "Questionable"]
+    assert stats['boilerplate_lines_removed'] == 1
@@ -0,0 +1,100 @@
+import json
+import os
+
+import pytest
+
+from nfl_data.grading import Grader, resolve_side
+from nfl_data.leaderboard import load_picks
+
+GAME = {'home_team': 'New England Patriots', 'away_team': 'New York Jets'}
+
+
+@pytest.mark.parametrize('pick, side', [
+    ('home', 'home'),
+    ('AWAY', 'away'),
+    ('New England Patriots', 'home'),
+    ('patriots', 'home'),
+    ('Pats -3.5', 'home'),
+    ('NE', 'home'),
+    ('Jets +3.5', 'away'),
+    ('NYJ', 'away'),
+])
+def test_resolves_names_nicknames_and_abbreviations(pick, side):
+    assert resolve_side(pick, GAME) == side
+
+
+@pytest.mark.parametrize('pick', [
+    None,
+    '',
+    '   ',
+    'Patriots over the Jets',  # Names both teams
+    'New York',  # City shared by two teams
+    'Bills',  # Neither team
+    'ne',  # Abbreviations only count in capitals
+    'Jetsons',  # Names must be whole words
+])
+def test_ambiguous_or_unknown_picks_give_none(pick):
+    assert resolve_side(pick, GAME) is None
+
+
+def test_abbreviation_inside_a_word_does_not_match():
+    game = {'home_team': 'New Orleans Saints', 'away_team': 'Atlanta Falcons'}
+    assert resolve_side('NOT SURE', game) is None
+    assert resolve_side('NO -2', game) == 'home'
+
+
+LINES = {'g1': {'game_id': 'g1', 'home_team': 'New England Patriots', 'away_team': 'New York Jets',
+                'game_time': '2025-09-07T17:00:00Z', 'home_spread': -3.5, 'away_spread': 3.5}}
+
+
+def write_predictions(directory, name, **fields):
+    os.makedirs(directory / 'week_1', exist_ok=True)
+    data = {'model': 'm', 'week': 1, 'day': None, 'lines': LINES,
+            'predictions': {'g1': {'pick': 'Patriots', 'units': 50}}, **fields}
+    path = directory / 'week_1' / f'predictions_{name}.json'
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+@pytest.fixture
+def graders(tmp_path):
+    predictions = tmp_path / 'predictions'
+    write_predictions(predictions, '2024', season=2024)
+    write_predictions(predictions, '2025', season=2025)
+    write_predictions(predictions, 'legacy')  # Written before the season was recorded
+
+    def make(season):
+        grader = Grader(season, str(tmp_path / 'data'), str(predictions))
+        grader.results.ingest([{'game_id': 'g1', 'home_team': 'New England Patriots', 'away_team': 'New York Jets',
+                                'game_time': '2025-09-07T17:00:00Z', 'home_score': 24 if season == 2025 else 10,
+                                'away_score': 17}])
+        return grader
+    return make
+
+
+def test_grader_only_grades_its_season(graders):
+    grader_2024, grader_2025 = graders(2024), graders(2025)
+    assert grader_2024.run()['graded'] == 1
+    assert grader_2025.run()['graded'] == 2
+
+    assert [entry['season'] for entry in grader_2024.grades()] == [2024]
+    assert grader_2024.grades()[0]['summary']['loss'] == 1
+    assert sorted(entry['season'] for entry in grader_2025.grades()) == [2025, 2025]
+    assert all(entry['summary']['win'] == 1 for entry in grader_2025.grades())
+
+
+def test_manifest_is_kept_per_season(graders):
+    graders(2024).run()
+    graders(2025).run()
+
+    # Each season's grades survive the other season's run
+    assert graders(2024).run() == {'graded': 0, 'skipped': 1, 'removed': 0}
+    assert graders(2025).run() == {'graded': 0, 'skipped': 2, 'removed': 0}
+
+
+def test_leaderboard_keeps_seasons_apart(graders):
+    grader_2024, grader_2025 = graders(2024), graders(2025)
+    grader_2024.run()
+    grader_2025.run()
+    picks = load_picks(grader_2024.grades() + grader_2025.grades())
+    assert sorted(picks['games']) == [(2024, 1, 'g1'), (2025, 1, 'g1')]
@@ -0,0 +1,141 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from nfl_data.odds_client import OddsApiClient, OddsApiError, QuotaScheduler
+from nfl_data.odds_stub import OddsStubServer
+
+ODDS_PATH = 'sports/americanfootball_nfl/odds'
+GAMES = [{'id': 'g1', 'commence_time': '2025-09-07T17:00:00Z', 'home_team': 'Buffalo Bills',
+          'away_team': 'Baltimore Ravens', 'bookmakers': []}]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_retries_injected_errors_until_served():
+    async def scenario():
+        # retry_after=0 keeps the injected 429s from slowing the test down
+        async with OddsStubServer(payloads={ODDS_PATH: GAMES}, error_rate=0.5, retry_after=0, seed=1) as server:
+            async with OddsApiClient('stub', server.base_url, max_retries=20, backoff_base=0.001) as client:
+                results = [await client.get_odds() for _ in range(10)]
+            return results, server.stats
+
+    results, stats = run(scenario())
+    assert results == [GAMES] * 10
+    assert stats['errors_injected'] > 0
+    assert stats['served'] == 10
+    assert stats['requests'] == stats['served'] + stats['errors_injected']
+
+
+def test_gives_up_after_max_retries():
+    async def scenario():
+        async with OddsStubServer(payloads={ODDS_PATH: GAMES}, error_rate=1.0, retry_after=0) as server:
+            async with OddsApiClient('stub', server.base_url, max_retries=3, backoff_base=0.001) as client:
+                with pytest.raises(OddsApiError) as error:
+                    await client.get_odds()
+            return error.value, server.stats
+
+    error, stats = run(scenario())
+    assert error.status in (429, 503)
+    assert stats['requests'] == 4
+
+
+def test_non_retryable_status_raises_immediately():
+    async def scenario():
+        async with OddsStubServer(payloads={ODDS_PATH: GAMES}) as server:
+            async with OddsApiClient('stub', server.base_url, max_retries=3, backoff_base=0.001) as client:
+                with pytest.raises(OddsApiError) as error:
+                    await client.get_scores()
+            return error.value, server.stats
+
+    error, stats = run(scenario())
+    assert error.status == 404
+    assert stats['requests'] == 1
+
+
+def test_backoff_honours_retry_after():
+    client = OddsApiClient('stub', backoff_base=0.5, backoff_max=30.0)
+    assert client._backoff(0, '2') == 2.0
+    assert client._backoff(0, '120') == 30.0  # Capped at backoff_max
+    # Unparseable Retry-After falls back to exponential backoff with jitter
+    assert 2.0 <= client._backoff(3, 'soon') <= 4.0
+    assert 0.25 <= client._backoff(0, None) <= 0.5
+    assert client._backoff(10, None) <= 30.0
+
+
+def test_scheduler_tracks_stub_quota_headers():
+    async def scenario():
+        scheduler = QuotaScheduler(season_end=datetime.now(timezone.utc))
+        async with OddsStubServer(payloads={ODDS_PATH: GAMES}, quota=100) as server:
+            async with OddsApiClient('stub', server.base_url, scheduler=scheduler) as client:
+                await client.get_odds(markets='spreads,totals')
+        return scheduler
+
+    scheduler = run(scenario())
+    assert scheduler.remaining == 98
+    assert scheduler.used == 2
+    assert scheduler.last_cost == 2
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+def test_scheduler_spreads_remaining_quota_until_season_end():
+    clock = FakeClock()
+    season_end = datetime.fromtimestamp(clock.now + 1000, timezone.utc)
+    scheduler = QuotaScheduler(season_end, reserve=20, clock=clock, sleep=clock.sleep)
+    scheduler.update({'x-requests-remaining': '120', 'x-requests-used': '0', 'x-requests-last': '2'})
+
+    # (120 - 20) / 2 = 50 requests over 1000 s
+    assert scheduler.interval() == 20.0
+
+    async def three_waits():
+        await asyncio.gather(scheduler.wait(), scheduler.wait(), scheduler.wait())
+
+    run(three_waits())
+    # Concurrent callers claim consecutive slots one interval apart
+    assert clock.sleeps == [20.0, 40.0]
+
+
+def test_scheduler_min_interval_without_headers():
+    scheduler = QuotaScheduler(min_interval=1.5)
+    assert scheduler.interval() == 1.5
+
+
+def test_scheduler_raises_when_only_reserve_is_left():
+    clock = FakeClock()
+    scheduler = QuotaScheduler(datetime.fromtimestamp(clock.now + 1000, timezone.utc), reserve=10,
+                               clock=clock, sleep=clock.sleep)
+    scheduler.update({'x-requests-remaining': '10'})
+    with pytest.raises(OddsApiError) as error:
+        run(scheduler.wait())
+    assert error.value.status == 429
+
+
+def test_recorded_non_string_params_replay(tmp_path):
+    scores = [{'id': 'g1', 'completed': True, 'scores': None}]
+
+    async def record():
+        async with OddsStubServer(payloads={'sports/americanfootball_nfl/scores': scores}) as server:
+            async with OddsApiClient('stub', server.base_url, record_dir=str(tmp_path)) as client:
+                await client.get_scores(days_from=3)
+
+    async def replay():
+        async with OddsStubServer(str(tmp_path)) as server:
+            async with OddsApiClient('stub', server.base_url, max_retries=0) as client:
+                return await client.get_scores(days_from=3)
+
+    run(record())
+    assert run(replay()) == scores
@@ -0,0 +1,80 @@
+import pytest
+
+from tools.scratchpad_tool import ScratchpadTool
+
+
+@pytest.fixture
+def scratchpad(tmp_path, monkeypatch, word_tokenizer):
+    # Scratchpads are stored under ./scratchpads/<season>
+    monkeypatch.chdir(tmp_path)
+    tool = ScratchpadTool('model', season=2025, max_tokens=50)
+    tool.write("Week 1: fade public favorites", week=1)
+    return tool
+
+
+def test_session_edits_stay_private_until_commit(scratchpad):
+    session = scratchpad.fork('r1')
+    session.write("Bills OL banged up")
+
+    assert session.dirty
+    assert "Bills" in session.read()
+    assert "Bills" not in scratchpad.read()
+
+    result = session.commit()
+    assert result['success'] and result['changed'] and not result['merged']
+    assert scratchpad.read() == "Week 1: fade public favorites\n\nBills OL banged up"
+    assert not session.dirty
+
+
+def test_concurrent_appends_are_both_kept(scratchpad):
+    first, second = scratchpad.fork('r1'), scratchpad.fork('r2')
+    first.write("Eagles note")
+    second.write("Chiefs note")
+
+    assert not first.commit()['merged']
+    result = second.commit()
+    assert result['success'] and result['merged']
+    assert scratchpad.read() == "Week 1: fade public favorites\n\nEagles note\n\nChiefs note"
+    assert second.read() == scratchpad.read()
+
+
+def test_replace_keeps_sections_appended_after_the_fork(scratchpad):
+    replacer, appender = scratchpad.fork('r1'), scratchpad.fork('r2')
+    replacer.write("Rewritten notes", append=False)
+    appender.write("Chiefs note")
+    appender.commit()
+
+    result = replacer.commit()
+    assert result['success'] and result['merged']
+    assert scratchpad.read() == "Rewritten notes\n\nChiefs note"
+
+
+def test_replace_after_another_replace_conflicts(scratchpad):
+    first, second = scratchpad.fork('r1'), scratchpad.fork('r2')
+    first.write("First rewrite", append=False)
+    second.write("Second rewrite", append=False)
+    second.commit()
+
+    result = first.commit()
+    assert not result['success']
+    assert "Conflict" in result['message']
+    assert scratchpad.read() == "Second rewrite"
+    assert first.dirty
+
+
+def test_merged_commit_is_recounted_against_the_limit(scratchpad):
+    first, second = scratchpad.fork('r1'), scratchpad.fork('r2')
+    # 5 + 20 words fit on their own, but not with the other session's 30
+    first.write(" ".join(["alpha"] * 30))
+    second.write(" ".join(["beta"] * 20))
+    assert first.commit()['success']
+
+    result = second.commit()
+    assert not result['success']
+    assert result['token_count'] == 55
+    assert "beta" not in scratchpad.read()
+
+
+def test_commit_without_edits_is_a_no_op(scratchpad):
+    session = scratchpad.fork('r1')
+    assert session.commit() == {"success": True, "changed": False, "token_count": 5}
@@ -0,0 +1,49 @@
+from nfl_data.records import Game
+from nfl_data.snapshot_store import SnapshotStore
+
+
+def pull(store, week, day, timestamp, spread):
+    games = [Game('g1', 'Buffalo Bills', 'Baltimore Ravens', '2025-09-07T17:00:00Z', 8, spread, -spread, 47.5)]
+    store.append({'week': week, 'day_filter': day, 'pull_timestamp': timestamp}, games)
+
+
+def test_day_none_falls_back_to_the_newest_pull_of_any_slate(tmp_path):
+    # fetch_spreads(week, day=None) reads latest_snapshot(week, None)
+    store = SnapshotStore(2025, str(tmp_path))
+    pull(store, 1, 'all', '2025-09-02T12:00:00Z', -1.5)
+    pull(store, 1, 'sunday', '2025-09-06T12:00:00Z', -2.5)
+    pull(store, 1, 'thursday', '2025-09-04T12:00:00Z', -3.0)
+
+    latest = store.latest_snapshot(1)
+    assert latest.day == 'sunday'
+    assert latest.games[0].home_spread == -2.5
+
+
+def test_all_means_the_full_week_slate_only(tmp_path):
+    store = SnapshotStore(2025, str(tmp_path))
+    pull(store, 1, 'all', '2025-09-02T12:00:00Z', -1.5)
+    pull(store, 1, 'sunday', '2025-09-06T12:00:00Z', -2.5)
+
+    assert store.latest_snapshot(1, 'all').games[0].home_spread == -1.5
+    assert store.latest_snapshot(1, 'sunday').games[0].home_spread == -2.5
+    assert store.latest_snapshot(1, 'monday') is None
+
+
+def test_day_none_respects_as_of_and_week(tmp_path):
+    store = SnapshotStore(2025, str(tmp_path))
+    pull(store, 1, 'thursday', '2025-09-04T12:00:00Z', -3.0)
+    pull(store, 1, 'sunday', '2025-09-06T12:00:00Z', -2.5)
+    pull(store, 2, 'all', '2025-09-09T12:00:00Z', -7.0)
+
+    assert store.latest_snapshot(1, as_of='2025-09-05T00:00:00Z').day == 'thursday'
+    assert store.latest_snapshot(1, as_of='2025-09-01T00:00:00Z') is None
+    assert store.latest_snapshot(2).games[0].home_spread == -7.0
+    assert store.latest_snapshot(3) is None
+
+
+def test_tie_goes_to_the_full_week_slate(tmp_path):
+    store = SnapshotStore(2025, str(tmp_path))
+    pull(store, 1, 'sunday', '2025-09-06T12:00:00Z', -2.5)
+    pull(store, 1, 'all', '2025-09-06T12:00:00Z', -1.5)
+
+    assert store.latest_snapshot(1).day == 'all'
@@ -0,0 +1,67 @@
+import os
+import sys
+import json
+import argparse
+from glob import glob
+
+# The trace format is defined by the environment package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'environments', 'vf_nfl_picker'))
+from tools.tracing import GROUP_FIELDS, load_traces, summarize
+
+def print_summary(rows, by):
+    """Print one line per group"""
+    header = " ".join(f"{field:<16}" for field in by)
+    print(f"\n{header} {'Calls':>6} {'Eps':>5} {'Err':>4} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'Tok in':>8} {'Tok out':>8} {'Hit %':>6} {'Cost $':>8} {'$/ep':>7}")
+    print("-" * (len(header) + 82))
+    for row in rows:
+        key = " ".join(f"{str(row[field]):<16}" for field in by)
+        hit_rate = f"{row['cache_hit_rate']:.0%}" if row['cache_hit_rate'] is not None else "-"
+        print(f"{key} {row['calls']:>6} {row['episodes']:>5} {row['errors']:>4} {row['p50_ms']:>9.1f} "
+              f"{row['p95_ms']:>9.1f} {row['tokens_in']:>8} {row['tokens_out']:>8} {hit_rate:>6} "
+              f"{row['cost_usd']:>8.4f} {row['cost_per_episode']:>7.4f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize episode traces: latency percentiles, tokens and search cost')
+    parser.add_argument('--traces-dir', type=str, default=os.getenv('NFL_TRACE_DIR', 'traces'),
+                       help='Directory written by the environment (default: traces)')
+    parser.add_argument('--season', type=int, default=2025,
+                       help='Season to summarize (default: 2025)')
+    parser.add_argument('--models', type=str,
+                       help='Comma-separated models to include (default: all)')
+    parser.add_argument('--by', type=str, default='model,event,name',
+                       help=f"Comma-separated grouping, from {', '.join(GROUP_FIELDS)} (default: model,event,name)")
+    parser.add_argument('--event', type=str, choices=['tool', 'reset', 'step'],
+                       help='Only include this kind of record')
+    parser.add_argument('--json', type=str, metavar='PATH',
+                       help='Also write the summary as JSON')
+    args = parser.parse_args()
+
+    by = args.by.split(',')
+    for field in by:
+        if field not in GROUP_FIELDS:
+            parser.error(f"Unknown grouping field '{field}'")
+
+    paths = sorted(glob(os.path.join(args.traces_dir, str(args.season), '*.jsonl')))
+    if args.models:
+        wanted = set(args.models.split(','))
+        paths = [p for p in paths if os.path.splitext(os.path.basename(p))[0] in wanted]
+    records = load_traces(paths)
+    if args.event:
+        records = [r for r in records if r['event'] == args.event]
+
+    if not records:
+        print(f"No trace records found in {os.path.join(args.traces_dir, str(args.season))}")
+        return
+
+    rows = summarize(records, by)
+    print_summary(rows, by)
+    print(f"\n{len(records)} record(s) from {len(paths)} file(s)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+        print(f"Saved to {args.json}")
+
+if __name__ == "__main__":
+    main()